@@ -2,6 +2,7 @@
 PYthon Programmable Gate Array
 """
 import os
+from ._version import __version__
 from . import boards, core, modules
 from .core import interface
 
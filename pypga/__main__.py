@@ -0,0 +1,107 @@
+"""
+Command line interface of pypga.
+
+Example:
+    Build four variants of the DAQ design defined by the factory function
+    ``MyDaq`` in ``mypackage/designs.py`` with up to four concurrent builds::
+
+        pypga build mypackage.designs:MyDaq -p data_depth=1024,4096 -p axi_hp_index=0,None -j 4
+"""
+import argparse
+import ast
+import importlib
+import logging
+import sys
+
+from .core.batch import BatchBuilder
+from .core.module import DEFAULT_BOARD
+from .core.reports import load_reports, summarize
+
+
+def _parse_value(text: str):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def _parse_parameter(text: str):
+    name, _, values = text.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"Expected name=value1,value2,..., not {text!r}.")
+    return name, [_parse_value(value) for value in values.split(",")]
+
+
+def _load(target: str):
+    module_name, _, attribute = target.partition(":")
+    if not attribute:
+        raise argparse.ArgumentTypeError(f"Expected module:attribute, not {target!r}.")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def build(args) -> int:
+    batch = BatchBuilder(board=args.board, max_workers=args.jobs, force=args.force)
+    parameters = dict(args.parameter)
+    for target in args.designs:
+        design = _load(target)
+        if parameters:
+            batch.add_grid(design, **parameters)
+        else:
+            batch.add(design)
+    jobs = batch.run()
+    for job in jobs:
+        print(f"{job.status:8} {job.name} {job.result_path or ''}")
+    return int(any(job.status == "failed" for job in jobs))
+
+
+def reports(args) -> int:
+    columns = ["wns", "fmax", "lut", "ff", "bram", "dsp", "duration"]
+    print(f"{'module':30} {'hash':10} {'built':20} " + " ".join(f"{c:>8}" for c in columns))
+    for report in load_reports(board=args.board, module=args.module):
+        summary = summarize(report)
+        values = " ".join(
+            f"{'-':>8}" if summary[c] is None else f"{summary[c]:8.3g}" for c in columns
+        )
+        print(f"{report['module']:30} {report['key'][:10]:10} {report.get('built', '')[:19]:20} {values}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="pypga")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser(
+        "build", help="build designs in parallel and store them in the result cache"
+    )
+    build_parser.add_argument(
+        "designs",
+        nargs="+",
+        help="module classes, or factory functions if parameters are given, as module:name",
+    )
+    build_parser.add_argument(
+        "-p",
+        "--parameter",
+        action="append",
+        default=[],
+        type=_parse_parameter,
+        help="factory parameter values as name=value1,value2,...; all combinations are built",
+    )
+    build_parser.add_argument("-j", "--jobs", type=int, default=None, help="maximum number of concurrent builds")
+    build_parser.add_argument("-b", "--board", default=DEFAULT_BOARD)
+    build_parser.add_argument("-f", "--force", action="store_true", help="rebuild cached designs")
+    build_parser.set_defaults(function=build)
+    reports_parser = commands.add_parser(
+        "reports", help="list the timing and utilization of cached builds"
+    )
+    reports_parser.add_argument("-m", "--module", help="only list builds of this module class")
+    reports_parser.add_argument("-b", "--board", default=None)
+    reports_parser.set_defaults(function=reports)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    # designs are usually imported from the working directory
+    sys.path.insert(0, "")
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,60 @@
+import functools
 import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
 
+from migen.build.xilinx import vivado
+from pypga._version import __version__
 from pypga.core.migen_axi.platforms import redpitaya
-from misoc.integration import cpu_interface
 from pypga.boards.stemlab125_14.soc import StemlabSoc
 from pypga.core.builder import BaseBuilder
+from pypga.core.cache import hash_components, hash_file
 from pypga.core.migen import AutoMigenModule
+from pypga.core.reports import REPORT_FILE, make_report, write_report
+from pypga.core.settings import settings
 
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache()
+def get_vivado_version() -> str:
+    """Returns the version line printed by ``vivado -version``, or ``"unknown"``."""
+    if settings.vivado_version is not None:
+        return settings.vivado_version
+    try:
+        output = subprocess.run(
+            ["vivado", "-version"], capture_output=True, text=True, timeout=120
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        logger.warning("Could not determine the Vivado version for the design hash.")
+        return "unknown"
+    lines = output.strip().splitlines()
+    return lines[0] if lines else "unknown"
+
+
 class Builder(BaseBuilder):
     board = "stemlab125_14"
-    _build_results = ["bitstream.bin", "csr.csv"]
+    platform_class = redpitaya.Platform
+    _build_results = ["bitstream.bin", "csr.csv", "identifier.txt"]
+    _checkpoint = "top_route.dcp"
+    _reports = [
+        "top_timing.rpt",
+        "top_post_route_timing.rpt",
+        "top_utilization_place.rpt",
+        REPORT_FILE,
+    ]
+    _reference_checkpoint = "reference.dcp"
+    # the Vivado project of the design, written once per builder
+    _project = None
 
     def _create_platform(self):
         logger.debug("Creating platform")
-        self._platform = redpitaya.Platform()
+        self._platform = self.platform_class()
         self._platform.toolchain.bitstream_commands.extend(
             ["set_property BITSTREAM.GENERAL.COMPRESS True [current_design]"]
         )
@@ -29,44 +67,148 @@ class Builder(BaseBuilder):
 
     def _create_soc(self):
         logger.debug("Creating SoC")
-        self.soc = StemlabSoc(platform=self._platform)
+        # the fingerprint identifies the design and lets the interface check which design a board runs
+        self.soc = StemlabSoc(platform=self._platform, ident=self.fingerprint)
 
     def _export_register_addresses(self):
         with (self.build_path / "csr.csv").open("w") as f:
-            f.write(cpu_interface.get_csr_csv(self.soc.get_csr_regions()))
+            f.write(self.soc.get_csr_csv())
+        (self.build_path / "identifier.txt").write_text(self.fingerprint)
+
+    def _get_toolchain_version(self):
+        return get_vivado_version()
 
     def _get_hash(self):
-        """Returns a hash for the design, without building the actual design or requiring a build folder."""
-        self._create_platform()
-        self._create_soc()
-        self.top = AutoMigenModule(
-            self.module_class, platform=self._platform, soc=self.soc
+        """Returns a hash for the design, without running Vivado or requiring a build folder."""
+        return hash_components(self._get_hash_components())
+
+    def _write_project(self) -> Path:
+        """
+        Converts the design and writes the Vivado project into a temporary directory.
+
+        The project is written once per builder and reused for the design hash
+        and the build, and contains everything that Vivado reads: the Verilog
+        sources, the constraints derived from the platform and the Tcl scripts.
+        """
+        if self._project is None:
+            self._create_platform()
+            self._create_soc()
+            self.top = AutoMigenModule(
+                self.module_class, platform=self._platform, soc=self.soc
+            )
+            self.soc._attach_top(self.top)
+            self._project = tempfile.TemporaryDirectory(prefix="pypga-project-")
+            self.soc.build(build_dir=self._project.name, run=False)
+        return Path(self._project.name)
+
+    def _get_hash_components(self) -> dict:
+        """Returns everything that goes into a build: the Vivado project, the toolchain and pypga."""
+        project_path = self._write_project()
+        return dict(
+            board=self.board,
+            project={
+                str(path.relative_to(project_path)): hash_file(path)
+                for path in sorted(project_path.rglob("*"))
+                if path.is_file()
+            },
+            vivado_version=get_vivado_version(),
+            pypga_version=__version__,
         )
-        self.soc._attach_top(self.top)
-        # TODO: include SOC in hash, for example by running `soc.build(run=False) and hashing build path`
-        return self.top._hash()
 
     def _build(self):
         """The actual steps required for building this design."""
-        self._create_platform()
-        self._create_soc()
-        self.top = AutoMigenModule(
-            self.module_class, platform=self._platform, soc=self.soc
-        )
-        self.soc._attach_top(self.top)
+        start_time = time.time()
+        shutil.copytree(self._write_project(), self.build_path, dirs_exist_ok=True)
+        self._project.cleanup()
+        self._project = None
+        if settings.incremental_build:
+            self._use_reference_checkpoint()
         logger.debug("Running vivado build...")
-        self.soc.build(build_dir=self.build_path, run=True)
-        self._check_timing_constraints_are_met()
+        self._run_vivado()
+        timing_met = self._timing_constraints_are_met()
+        self._write_report(duration=time.time() - start_time, timing_met=timing_met)
         self._export_register_addresses()
+        # the results of a build that failed timing are stored for their reports
+        self.copy_results(
+            extra_results=self._reports
+            + ([self._checkpoint] if settings.incremental_build else []),
+            meta=dict(timing_met=timing_met),
+        )
+        if not timing_met:
+            raise RuntimeError(
+                "Timing constraints of this design could not be met. Please "
+                "check the build logs for hints on how to improve timing."
+            )
         logger.debug(f"Finished build for {self.__class__.__name__}.")
-        self.copy_results()
 
-    def _check_timing_constraints_are_met(self):
-        """Raises an exception if there are timing violations."""
+    def _write_report(self, duration, timing_met):
+        """Writes the timing, utilization and duration of the build to a JSON file."""
+        report = make_report(
+            self.build_path,
+            board=self.board,
+            module=self.module_class.__name__,
+            duration=duration,
+            vivado_version=get_vivado_version(),
+            timing_met=timing_met,
+        )
+        write_report(self.build_path / REPORT_FILE, report)
+        logger.info(
+            f"Built {self.module_class.__name__} in {duration:.0f} s with worst "
+            f"negative slack {report.get('timing', {}).get('wns')} ns."
+        )
+
+    def _run_vivado(self, build_name="top"):
+        cwd = os.getcwd()
+        os.chdir(self.build_path)
+        try:
+            vivado._run_vivado(build_name)
+        finally:
+            os.chdir(cwd)
+
+    def _find_reference_checkpoint(self):
+        """Returns the post-route checkpoint of the most recent build of the same module, or None."""
+        for meta in reversed(self.cache.entries()):
+            checkpoint = self.cache.get_path(meta["key"]) / self._checkpoint
+            if (
+                meta.get("board") == self.board
+                and meta.get("module") == self.module_class.__name__
+                and meta["key"] != self.hash
+                and meta.get("timing_met", True)
+                and checkpoint.is_file()
+            ):
+                return checkpoint
+        return None
+
+    def _use_reference_checkpoint(self, build_name="top"):
+        """
+        Makes Vivado reuse placement and routing from a previous build of the same module.
+
+        The checkpoint is read right before placement, and Vivado falls back to a
+        regular implementation if it cannot be used.
+        """
+        checkpoint = self._find_reference_checkpoint()
+        if checkpoint is None:
+            logger.debug("No checkpoint found for an incremental build.")
+            return
+        script = self.build_path / f"{build_name}_route.tcl"
+        lines = script.read_text().splitlines()
+        index = next(
+            (i for i, line in enumerate(lines) if line.startswith("opt_design")), None
+        )
+        if index is None:
+            logger.warning(f"No opt_design step in {script}, building from scratch.")
+            return
+        logger.info(f"Running incremental implementation based on {checkpoint}.")
+        shutil.copy(checkpoint, self.build_path / self._reference_checkpoint)
+        lines.insert(
+            index + 1,
+            f"if {{[catch {{read_checkpoint -incremental {self._reference_checkpoint}}} error]}} "
+            f'{{puts "Incremental implementation is not possible: $error"}}',
+        )
+        script.write_text("\n".join(lines))
+
+    def _timing_constraints_are_met(self) -> bool:
+        """Returns whether the build log reports no timing violations."""
         with open(self.build_path / "vivado.log", "r") as file:
             lines = [line.strip() for line in file.readlines()]
-            if "All user specified timing constraints are met." not in lines:
-                raise RuntimeError(
-                    "Timing constraints of this design could not be met. Please "
-                    "check the build logs for hints on how to improve timing."
-                )
+        return "All user specified timing constraints are met." in lines
@@ -4,6 +4,7 @@ import logging
 # only required for ADC clock PLL
 import migen
 from migen.fhdl.verilog import convert
+from misoc.integration import cpu_interface
 from pypga.core.migen_axi.integration.soc_core import SoCCore
 from functools import partial
 # from migen.build.generic_platform import *
@@ -14,10 +15,10 @@ logger = logging.getLogger(__name__)
 
 
 class StemlabSoc(SoCCore):
-    def __init__(self, platform):
+    def __init__(self, platform, ident="Soc"):
         logger.debug("Creating Stemlab SoC.")
 
-        super().__init__(platform=platform, csr_data_width=32, ident="Soc", create_sys_clock=partial(create_stemlabs_clocks, platform=platform))
+        super().__init__(platform=platform, csr_data_width=32, ident=ident, create_sys_clock=partial(create_stemlabs_clocks, platform=platform))
         platform.add_platform_command(
             'create_clock -name clk_fpga_0 -period 8 [get_pins "PS7/FCLKCLK[0]"]'
         )
@@ -26,6 +27,23 @@ class StemlabSoc(SoCCore):
     def _attach_top(self, top):
         self.submodules.top = top
         self.csr_devices.append("top")
+        # memory-mapped registers get their own address window on the CSR bus
+        for memory in top.get_memories():
+            if getattr(memory, "pypga_memory_mapped", False):
+                self.csr_devices.append(f"top_{memory.name_override}")
+
+    def get_csr_csv(self) -> str:
+        """Returns the contents of the ``csr.csv`` file with the addresses of all registers and memories."""
+        return cpu_interface.get_csr_csv(self.get_csr_regions()) + self.get_memory_csv()
+
+    def get_memory_csv(self) -> str:
+        """Returns csr.csv entries for the memory-mapped registers, in the same format as the CSRs."""
+        rows = []
+        for name, memory, mapaddr, mmap in self.csrbankarray.srams:
+            origin = self.mem_map["csr"] + 0x800 * mapaddr
+            mode = "ro" if getattr(memory, "bus_read_only", False) else "rw"
+            rows.append(f"{name}.{memory.name_override},0x{origin:08x},{memory.depth},{mode}\n")
+        return "".join(rows)
 
     def _hash(self):
         """
@@ -0,0 +1,172 @@
+import concurrent.futures
+import itertools
+import logging
+import multiprocessing
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .builder import get_builder
+from .module import DEFAULT_BOARD
+
+logger = logging.getLogger(__name__)
+
+
+def parameter_grid(**parameters) -> List[Dict[str, Any]]:
+    """
+    Returns all combinations of the given parameter values.
+
+    Example:
+        ``parameter_grid(data_depth=[1024, 2048], axi_hp_index=[0, None])``
+        returns four dicts such as ``{"data_depth": 1024, "axi_hp_index": 0}``.
+    """
+    names = list(parameters)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(parameters[name] for name in names))
+    ]
+
+
+@dataclass
+class BuildJob:
+    """A design to build with :class:`BatchBuilder` and, once it ran, its outcome."""
+
+    module_class: type
+    board: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    hash: Optional[str] = None
+    result_path: Any = None
+    status: str = "pending"  # one of pending, cached, built or failed
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        parameters = ", ".join(f"{k}={v!r}" for k, v in self.parameters.items())
+        return f"{self.module_class.__name__}({parameters})"
+
+
+# the jobs of the current batch, inherited by forked worker processes
+_jobs: List[BuildJob] = []
+
+
+def _set_jobs(jobs):
+    global _jobs
+    _jobs = jobs
+
+
+def _build_job(index: int):
+    """Builds the job with ``index`` and returns its hash, or raises a RuntimeError with the traceback."""
+    job = _jobs[index]
+    try:
+        builder = get_builder(board=job.board, module_class=job.module_class)
+        builder.build()
+        return builder.hash
+    except Exception:
+        # exceptions with unpicklable attributes would break the process pool
+        raise RuntimeError(traceback.format_exc()) from None
+
+
+class BatchBuilder:
+    """
+    Builds many designs in parallel.
+
+    Every build runs in a separate process with its own build directory, and
+    its results end up in the build result cache. Designs whose results are
+    already cached are not built again, and duplicate designs are built once.
+
+    Worker processes are forked, such that module classes created by factory
+    functions need not be picklable. Where forking is not available, designs
+    are built one after the other.
+
+    Args:
+        board: the board to build for.
+        max_workers: the maximum number of concurrent builds. Each Vivado build
+          uses several GB of memory, so this should be chosen with the available
+          memory in mind. Defaults to the number of CPUs.
+        force: whether to build designs even if their results are cached.
+
+    Example:
+        >>> batch = BatchBuilder(max_workers=4)
+        >>> batch.add_grid(MyDesign, data_depth=[1024, 2048], axi_hp_index=[0, 1])
+        >>> for job in batch.run():
+        ...     print(job.name, job.status, job.result_path)
+    """
+
+    def __init__(
+        self, board: str = DEFAULT_BOARD, max_workers: int = None, force: bool = False
+    ):
+        self.board = board
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.force = force
+        self.jobs: List[BuildJob] = []
+
+    def add(self, module_class, **parameters) -> BuildJob:
+        """Adds a module class to the batch. ``parameters`` are only used for reporting."""
+        job = BuildJob(module_class=module_class, board=self.board, parameters=parameters)
+        self.jobs.append(job)
+        return job
+
+    def add_grid(self, factory: Callable[..., type], **parameters) -> List[BuildJob]:
+        """Adds the module classes returned by ``factory`` for all combinations of ``parameters``."""
+        return [
+            self.add(factory(**combination), **combination)
+            for combination in parameter_grid(**parameters)
+        ]
+
+    def run(self) -> List[BuildJob]:
+        """Builds all designs that are not cached yet and returns all jobs with their outcome."""
+        pending = {}
+        for job in self.jobs:
+            builder = get_builder(board=job.board, module_class=job.module_class)
+            if not self.force and builder.result_exists:
+                builder.use_results()
+                job.hash, job.result_path, job.status = builder.hash, builder.result_path, "cached"
+                logger.info(f"{job.name} is already built.")
+            else:
+                pending.setdefault(builder.fingerprint, (builder, []))[1].append(job)
+        # identical designs are built only once
+        unique = [jobs[0] for _, jobs in pending.values()]
+        logger.info(
+            f"Building {len(unique)} designs with up to {self.max_workers} "
+            f"concurrent builds."
+        )
+        if self.max_workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            outcomes = self._run_parallel(unique)
+        else:
+            outcomes = self._run_serial(unique)
+        for (builder, jobs), (hash_, error) in zip(pending.values(), outcomes):
+            for job in jobs:
+                if error is None:
+                    job.hash, job.result_path = hash_, builder.cache.get_path(hash_)
+                    job.status = "built"
+                else:
+                    job.status, job.error = "failed", error
+                    logger.error(f"Build of {job.name} failed:\n{error}")
+        return self.jobs
+
+    def _run_serial(self, jobs):
+        _set_jobs(jobs)
+        outcomes = []
+        for index in range(len(jobs)):
+            try:
+                outcomes.append((_build_job(index), None))
+            except RuntimeError as e:
+                outcomes.append((None, str(e)))
+        return outcomes
+
+    def _run_parallel(self, jobs):
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(jobs)) or 1,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_set_jobs,
+            initargs=(jobs,),
+        ) as executor:
+            futures = [executor.submit(_build_job, index) for index in range(len(jobs))]
+            outcomes = []
+            for job, future in zip(jobs, futures):
+                try:
+                    outcomes.append((future.result(), None))
+                    logger.info(f"Finished build of {job.name}.")
+                except Exception as e:
+                    outcomes.append((None, str(e)))
+        return outcomes
@@ -1,7 +1,9 @@
+import datetime
 import logging
-import shutil
 from abc import ABC, abstractmethod
 
+from .._version import __version__
+from .cache import ResultCache, hash_components, hash_package_source, hash_source_files
 from .common import empty_path
 from .migen import AutoMigenModule
 from .settings import settings
@@ -16,6 +18,7 @@ def get_builder(board, module_class):
 
 class BaseBuilder(ABC):
     board = None
+    platform_class = None  # the migen platform of the board
 
     def __init_subclass__(cls):
         if cls.board is None:
@@ -26,29 +29,47 @@ class BaseBuilder(ABC):
         builder_registry[cls.board] = cls
 
     def _get_result_path(self):
-        return (
-            settings.result_path
-            / str(self.board)
-            / self.module_class.__name__
-            / self.hash
-        ).resolve()
+        return self.cache.get_path(self.hash)
 
     def _get_build_path(self):
+        # the hash keeps concurrent builds of different variants of a class apart
         return (
-            settings.build_path / str(self.board) / self.module_class.__name__
+            settings.build_path
+            / str(self.board)
+            / self.module_class.__name__
+            / self.hash[:16]
         ).resolve()
 
     @property
     def result_exists(self):
-        return self.result_path.is_dir()
+        """Whether usable build results are in the cache."""
+        if self.hash not in self.cache:
+            return False
+        # the results of builds that failed timing are only kept for their reports
+        return self.cache.get_meta(self.hash).get("timing_met", True)
+
+    def use_results(self):
+        """Marks the cached build results as recently used, instead of building the design again."""
+        self.cache.touch(self.hash)
 
     _build_results = []
 
-    def copy_results(self):
-        """Copy all build results to a persistent folder"""
-        empty_path(self.result_path)
-        for result in self._build_results:
-            shutil.copy(self.build_path / result, self.result_path / result)
+    def copy_results(self, extra_results=(), meta: dict = None):
+        """Copy all build results and ``extra_results`` to a persistent folder, with additional ``meta`` data."""
+        self.cache.store(
+            self.hash,
+            [
+                self.build_path / result
+                for result in [*self._build_results, *extra_results]
+            ],
+            meta=dict(
+                board=self.board,
+                module=self.module_class.__name__,
+                built=datetime.datetime.now().isoformat(),
+                fingerprints=[self.fingerprint],
+                **(meta or {}),
+            ),
+        )
         logger.debug(
             f"Copied all build artifacts for new build of "
             f"{self.module_class.__name__} for {self.board} "
@@ -57,11 +78,48 @@ class BaseBuilder(ABC):
 
     def __init__(self, module_class):
         self.module_class = module_class
-        self.hash = self._get_hash()
+        self.cache = ResultCache()
+        self.fingerprint = self._get_fingerprint()
+        self.hash = self.cache.find(self.fingerprint)
+        if self.hash is None:
+            logger.debug(
+                f"No build of {module_class.__name__} with fingerprint "
+                f"{self.fingerprint} is known, computing the full design hash."
+            )
+            self.hash = self._get_hash()
+            if self.hash in self.cache:
+                self.cache.add_fingerprint(self.hash, self.fingerprint)
         self.result_path = self._get_result_path()
         self.build_path = self._get_build_path()
 
+    def _get_fingerprint(self):
+        """
+        Returns a cheap fingerprint of the design to look up the hash of an existing build.
+
+        Unlike the design hash, the fingerprint does not require converting the
+        design to Verilog. It covers the structure of the module class, the
+        source files of the design and of pypga, and the version of the toolchain.
+        """
+        return hash_components(
+            dict(
+                board=self.board,
+                module=self.module_class._hash,
+                source_files=hash_source_files(self.module_class),
+                pypga_source=hash_package_source(),
+                pypga_version=__version__,
+                toolchain_version=self._get_toolchain_version(),
+            )
+        )
+
+    def _get_toolchain_version(self):
+        """Returns the version of the toolchain that builds the design, which is part of the fingerprint."""
+        return settings.vivado_version
+
     def build(self):
+        # the hash found via the fingerprint may be outdated, e.g. after a toolchain update
+        self.hash = self._get_hash()
+        self.result_path = self._get_result_path()
+        self.build_path = self._get_build_path()
         empty_path(self.build_path)
         self._build()
 
@@ -69,7 +127,12 @@ class BaseBuilder(ABC):
 
     @abstractmethod
     def _get_hash(self):
-        """Returns a hash for the design, without building the actual design or requiring a build folder."""
+        """
+        Returns a hash for the design, without building the actual design or requiring a build folder.
+
+        The hash is the key of the build results in the cache, so it must cover
+        everything that affects the build results.
+        """
         pass
 
     @abstractmethod
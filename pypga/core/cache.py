@@ -0,0 +1,231 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import inspect
+import shutil
+import site
+import sys
+import sysconfig
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def hash_components(components: Dict[str, object]) -> str:
+    """Returns a sha256 hex digest of a dict of JSON-serializable design components."""
+    return hashlib.sha256(
+        json.dumps(components, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+@functools.lru_cache()
+def hash_file(path: Path) -> str:
+    """Returns a sha256 hex digest of the contents of a file, memoized per path."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+@functools.lru_cache()
+def hash_package_source() -> str:
+    """Returns a sha256 hex digest of the source code of the pypga package."""
+    root = Path(__file__).resolve().parent.parent
+    return hash_components(
+        {
+            str(path.relative_to(root)): hash_file(path)
+            for path in sorted(root.rglob("*.py"))
+        }
+    )
+
+
+def _get_source_file(value) -> Optional[Path]:
+    """Returns the source file that defines a module, class or function, or None if there is none."""
+    try:
+        path = inspect.getsourcefile(value)
+    except (OSError, TypeError):
+        return None
+    if path is None or not Path(path).is_file():
+        return None
+    return Path(path).resolve()
+
+
+@functools.lru_cache()
+def _library_paths() -> List[Path]:
+    """Returns the directories of the standard library and of installed packages."""
+    paths = sysconfig.get_paths()
+    names = ["stdlib", "platstdlib", "purelib", "platlib"]
+    return [Path(paths[name]).resolve() for name in names if name in paths] + [
+        Path(site.getusersitepackages()).resolve()
+    ]
+
+
+def _is_project_file(path: Path) -> bool:
+    """Whether a source file belongs to pypga or to the project of the user, rather than to a library."""
+    if Path(__file__).resolve().parent.parent in path.parents:
+        return True
+    return not any(library in path.parents for library in _library_paths())
+
+
+def hash_source_files(module_class) -> List[str]:
+    """
+    Returns the hashes of the project source files that a module class and its submodules depend on.
+
+    These are the files that define the classes and their base classes, and the
+    files of the modules, classes and functions that they import. Files of the
+    standard library and of installed packages are left out, such that
+    updating them does not invalidate all builds.
+    """
+    files = set()
+    module_classes = [module_class]
+    while module_classes:
+        current = module_classes.pop()
+        module_classes.extend(getattr(current, "_pypga_submodules", {}).values())
+        for cls in current.__mro__:
+            path = _get_source_file(cls)
+            python_module = sys.modules.get(cls.__module__)
+            if path is None or python_module is None or not _is_project_file(path):
+                continue
+            files.add(path)
+            for value in vars(python_module).values():
+                if inspect.ismodule(value) or inspect.isclass(value) or inspect.isfunction(value):
+                    dependency = _get_source_file(value)
+                    if dependency is not None and _is_project_file(dependency):
+                        files.add(dependency)
+    # only the contents count, such that moving a project does not change the hash
+    return sorted(hash_file(path) for path in files)
+
+
+class ResultCache:
+    """
+    A content-addressed store for build results.
+
+    Each entry is a directory named after the hash of the complete design,
+    containing the build results and a ``meta.json`` file with the board,
+    module name, size and the time of creation and last use. Least recently
+    used entries are removed when the store exceeds ``max_size`` bytes or
+    ``max_entries`` entries.
+
+    Args:
+        path: the directory of the store. Defaults to ``settings.result_path / "store"``.
+        max_size: the maximum total size of all entries in bytes, or None for no limit.
+        max_entries: the maximum number of entries, or None for no limit.
+    """
+
+    _meta_file = "meta.json"
+
+    def __init__(
+        self,
+        path: Path = None,
+        max_size: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.path = Path(path or settings.result_path / "store").resolve()
+        self.max_size = max_size if max_size is not None else settings.cache_max_size
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.cache_max_entries
+        )
+
+    def get_path(self, key: str) -> Path:
+        """Returns the directory of the entry with ``key``, whether it exists or not."""
+        return self.path / key
+
+    def __contains__(self, key: str) -> bool:
+        return (self.get_path(key) / self._meta_file).is_file()
+
+    def touch(self, key: str):
+        """Marks the entry with ``key`` as recently used."""
+        meta = self.get_meta(key)
+        meta["last_used"] = time.time()
+        self._write_meta(key, meta)
+
+    def get_meta(self, key: str) -> dict:
+        with (self.get_path(key) / self._meta_file).open() as f:
+            return json.load(f)
+
+    def _write_meta(self, key: str, meta: dict):
+        filename = self.get_path(key) / self._meta_file
+        temporary = filename.with_name(f".{self._meta_file}.{uuid.uuid4().hex}")
+        with temporary.open("w") as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+        os.replace(temporary, filename)
+
+    def store(self, key: str, files: Iterable[Path], meta: dict = None) -> Path:
+        """
+        Copies ``files`` into the entry with ``key`` and returns its directory.
+
+        The entry only appears once all files have been copied, such that an
+        interrupted build never leaves an incomplete entry behind.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        temporary = self.path / f".tmp-{key}-{uuid.uuid4().hex}"
+        temporary.mkdir()
+        size = 0
+        for file in files:
+            shutil.copy(file, temporary / Path(file).name)
+            size += (temporary / Path(file).name).stat().st_size
+        now = time.time()
+        meta = dict(meta or {}, key=key, size=size, created=now, last_used=now)
+        with (temporary / self._meta_file).open("w") as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+        destination = self.get_path(key)
+        if destination.exists():
+            shutil.rmtree(destination)
+        os.replace(temporary, destination)
+        logger.debug(f"Stored build results with key {key} in {destination}.")
+        self.evict(keep=key)
+        return destination
+
+    def find(self, fingerprint: str) -> Optional[str]:
+        """Returns the key of the most recently used entry built from a design with ``fingerprint``."""
+        for meta in reversed(self.entries()):
+            if fingerprint in meta.get("fingerprints", []):
+                return meta["key"]
+        return None
+
+    def add_fingerprint(self, key: str, fingerprint: str):
+        """Records that a design with ``fingerprint`` has the hash ``key``."""
+        meta = self.get_meta(key)
+        fingerprints = meta.setdefault("fingerprints", [])
+        if fingerprint not in fingerprints:
+            fingerprints.append(fingerprint)
+            self._write_meta(key, meta)
+
+    def entries(self) -> List[dict]:
+        """Returns the metadata of all entries, least recently used first."""
+        entries = []
+        if self.path.is_dir():
+            for path in self.path.iterdir():
+                if not path.name.startswith(".") and path.name in self:
+                    try:
+                        entries.append(self.get_meta(path.name))
+                    except (OSError, ValueError):
+                        logger.warning(f"Ignoring cache entry {path} with unreadable metadata.")
+        return sorted(entries, key=lambda meta: meta["last_used"])
+
+    def remove(self, key: str):
+        shutil.rmtree(self.get_path(key), ignore_errors=True)
+
+    def evict(self, keep: str = None):
+        """Removes least recently used entries until the size limits are met."""
+        entries = self.entries()
+        total_size = sum(meta["size"] for meta in entries)
+        count = len(entries)
+        for meta in entries:
+            too_large = self.max_size is not None and total_size > self.max_size
+            too_many = self.max_entries is not None and count > self.max_entries
+            if not (too_large or too_many):
+                break
+            if meta["key"] == keep:
+                continue
+            logger.info(
+                f"Evicting build result {meta['key']} of {meta.get('module')} "
+                f"for {meta.get('board')} from the cache."
+            )
+            self.remove(meta["key"])
+            total_size -= meta["size"]
+            count -= 1
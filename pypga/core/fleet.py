@@ -0,0 +1,181 @@
+"""
+Runs the same design on several boards and accesses them concurrently.
+
+Example:
+    >>> fleet = BoardFleet.run(MyDesign, hosts=["rp-1", "rp-2", "rp-3"])
+    >>> fleet.write("pulsegen.period", 100)  # the same value on all boards
+    >>> fleet.write_each("pulsegen.period", [100, 200, 300])  # one value per board
+    >>> fleet.read("daq.data")  # array of shape (3, data_depth)
+    >>> fleet.call("daq.get_data", stop=100)
+    >>> fleet.stop()
+"""
+import concurrent.futures
+import logging
+from typing import Any, Callable, Dict, Iterable, List
+
+import numpy as np
+
+from .interface import RemoteInterface
+from .module import DEFAULT_BOARD
+
+logger = logging.getLogger(__name__)
+
+
+class FleetError(RuntimeError):
+    """An operation failed on some boards of a :class:`BoardFleet`."""
+
+    def __init__(self, errors: Dict[str, BaseException]):
+        self.errors = errors
+        super().__init__(
+            "; ".join(f"{host}: {error!r}" for host, error in errors.items())
+        )
+
+
+def _resolve(design, path: str):
+    """Returns the object and attribute name that the dotted ``path`` refers to in ``design``."""
+    *parents, name = path.split(".")
+    for parent in parents:
+        design = getattr(design, parent)
+    return design, name
+
+
+class BoardFleet:
+    """
+    Instances of the same design on several boards.
+
+    Every operation runs on all boards at the same time, in a thread per
+    board, and returns the results in the order of :attr:`hosts`.
+
+    Args:
+        designs: maps the host of each board to the design instance running on it.
+        max_workers: the maximum number of boards accessed at the same time,
+          by default all of them.
+    """
+
+    def __init__(self, designs: Dict[str, Any], max_workers: int = None):
+        self.designs = dict(designs)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or max(len(self.designs), 1),
+            thread_name_prefix="pypga-fleet",
+        )
+
+    @classmethod
+    def run(
+        cls,
+        module_class,
+        hosts: Iterable[str],
+        board: str = DEFAULT_BOARD,
+        autobuild: bool = True,
+        forcebuild: bool = False,
+        max_workers: int = None,
+        **kwargs,
+    ) -> "BoardFleet":
+        """
+        Builds ``module_class`` once and runs it on the boards at ``hosts``, like :meth:`TopModule.run`.
+
+        The boards are connected to and flashed in parallel.
+        """
+        hosts = list(hosts)
+        if not hosts:
+            raise ValueError("A fleet requires at least one host.")
+        builder = module_class._get_built_builder(board, autobuild, forcebuild)
+
+        def connect(host):
+            interface = RemoteInterface(host=host, result_path=builder.result_path)
+            return module_class(interface=interface, **kwargs)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers or len(hosts)) as executor:
+            futures = {host: executor.submit(connect, host) for host in hosts}
+        designs, errors = {}, {}
+        for host, future in futures.items():
+            try:
+                designs[host] = future.result()
+            except Exception as e:
+                errors[host] = e
+        if errors:
+            for design in designs.values():
+                design.stop()
+            raise FleetError(errors)
+        return cls(designs, max_workers=max_workers)
+
+    @property
+    def hosts(self) -> List[str]:
+        return list(self.designs)
+
+    def __len__(self) -> int:
+        return len(self.designs)
+
+    def __iter__(self):
+        return iter(self.designs.values())
+
+    def __getitem__(self, host: str):
+        return self.designs[host]
+
+    def map(self, function: Callable, *args_per_board) -> List:
+        """
+        Returns ``[function(design, *args) for each board]``, evaluated concurrently.
+
+        Each argument in ``args_per_board`` must contain one value per board.
+        Raises a :class:`FleetError` with the exceptions of all boards on which ``function`` failed.
+        """
+        for args in args_per_board:
+            if len(args) != len(self):
+                raise ValueError(f"Expected {len(self)} values, one per board, not {len(args)}.")
+        futures = {
+            host: self._executor.submit(
+                function, design, *(args[index] for args in args_per_board)
+            )
+            for index, (host, design) in enumerate(self.designs.items())
+        }
+        results, errors = [], {}
+        for host, future in futures.items():
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors[host] = e
+        if errors:
+            raise FleetError(errors)
+        return results
+
+    def read(self, path: str) -> np.ndarray:
+        """
+        Reads the register at the dotted ``path``, e.g. ``"daq.data"``, from all boards.
+
+        Returns an array whose first axis is the board.
+        """
+
+        def read(design):
+            parent, name = _resolve(design, path)
+            return getattr(parent, name)
+
+        return np.asarray(self.map(read))
+
+    def write(self, path: str, value):
+        """Writes the same ``value`` to the register at the dotted ``path`` on all boards."""
+        self.write_each(path, [value] * len(self))
+
+    def write_each(self, path: str, values):
+        """Writes ``values[i]`` to the register at the dotted ``path`` on the i-th board."""
+
+        def write(design, value):
+            parent, name = _resolve(design, path)
+            setattr(parent, name, value)
+
+        self.map(write, values)
+
+    def call(self, path: str, *args, **kwargs) -> List:
+        """Calls the method at the dotted ``path`` with the same arguments on all boards and returns the results."""
+
+        def call(design):
+            parent, name = _resolve(design, path)
+            return getattr(parent, name)(*args, **kwargs)
+
+        return self.map(call)
+
+    def stop(self):
+        self._executor.shutdown(wait=True)
+        for host, design in self.designs.items():
+            try:
+                design.stop()
+            except Exception:
+                logger.warning(f"Error upon stopping the design on {host}.", exc_info=True)
@@ -0,0 +1,109 @@
+"""
+Optional counters and latency histograms of register accesses.
+
+Instrumentation is disabled by default and then adds no overhead to register
+accesses. It is enabled with ``PYPGA_INSTRUMENTATION=1`` or
+:meth:`Instrumentation.enable`, and applies to the register accesses of all
+modules that are created afterwards with a :class:`~.interface.BaseInterface`.
+"""
+import inspect
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from .settings import settings
+
+# upper edges in seconds of the latency histogram bins, the last bin is unbounded
+LATENCY_BINS = np.array([1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, np.inf])
+
+
+class AccessStats:
+    """The number of accesses of one register and a histogram of their latencies."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = np.zeros(len(LATENCY_BINS), dtype=np.int64)
+
+    def record(self, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.histogram[np.searchsorted(LATENCY_BINS, duration)] += 1
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+class Instrumentation:
+    """Collects :class:`AccessStats` per register and operation."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stats: Dict[Tuple[str, str], AccessStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def _record(self, key: Tuple[str, str], duration: float):
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = AccessStats()
+            stats.record(duration)
+
+    def timed(self, name: str, operation: str, function: Callable) -> Callable:
+        """
+        Returns ``function`` wrapped such that its calls are recorded under ``(name, operation)``.
+
+        For functions that return an awaitable, the latency includes the time until the awaitable is done.
+        """
+        key = (name, operation)
+
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return self._timed_awaitable(key, start, result)
+            self._record(key, time.perf_counter() - start)
+            return result
+
+        return timed_function
+
+    async def _timed_awaitable(self, key, start, awaitable):
+        try:
+            return await awaitable
+        finally:
+            self._record(key, time.perf_counter() - start)
+
+    def summary(self) -> List[Dict]:
+        """Returns one dict per register and operation, with the most frequently accessed first."""
+        with self._lock:
+            items = list(self.stats.items())
+        rows = [
+            dict(
+                register=name,
+                operation=operation,
+                count=stats.count,
+                mean_time=stats.mean_time,
+                max_time=stats.max_time,
+                histogram=dict(zip(LATENCY_BINS.tolist(), stats.histogram.tolist())),
+            )
+            for (name, operation), stats in items
+        ]
+        return sorted(rows, key=lambda row: row["count"], reverse=True)
+
+
+instrumentation = Instrumentation(enabled=settings.instrumentation)
@@ -1,2 +1,3 @@
+from .interface import BaseInterface
 from .local import LocalInterface
-from .remote import RemoteInterface
+from .remote import AsyncRemoteInterface, RemoteInterface
@@ -1,19 +1,34 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, List, Union
 
+from ..settings import settings
 from .csrmap import CsrMap
+from .shadow import ShadowCache
 
 
 class BaseInterface(ABC):
-    def __init__(self, result_path):
-        """Interface to the registers of a given FPGA board."""
+    def __init__(self, result_path, shadow: bool = None):
+        """
+        Interface to the registers of a given FPGA board.
+
+        If ``shadow`` is True, register reads are served from a :class:`ShadowCache`
+        where possible. Defaults to ``settings.shadow_registers``.
+        """
         self.build_result_path = Path(result_path).resolve()
         self.csrmap = CsrMap(self.build_result_path / "csr.csv")
+        if shadow is None:
+            shadow = settings.shadow_registers
+        self.shadow = ShadowCache(max_age=settings.shadow_max_age) if shadow else None
 
     def stop(self):
         """Stops the interface"""
 
+    def invalidate_shadow(self, address: int = None):
+        """Forgets the cached value of the register at ``address``, or of all registers if None."""
+        if self.shadow is not None:
+            self.shadow.invalidate(address)
+
     def name_to_address(self, name):
         return self.csrmap.address[name]
 
@@ -27,11 +42,74 @@ class BaseInterface(ABC):
 
     def write(self, name: str, value: int):
         """Writes ``value`` to the register ``name``."""
-        self.write_to_address(self.name_to_address(name), value)
+        address = self.name_to_address(name)
+        self.invalidate_shadow(address)
+        self.write_to_address(address, value)
 
     def write_array(self, name: str, value: List[int]):
         """Writes each element in the array ``value`` to the register ``name``."""
-        self.write_to_address(self.name_to_address(name), value)
+        address = self.name_to_address(name)
+        self.invalidate_shadow(address)
+        self.write_to_address(address, value)
+
+    # number of values of a memory-mapped register that appear in its address window at once
+    memory_page_length = 512
+
+    def read_memory(self, name: str, length: int) -> List[int]:
+        """Reads the first ``length`` values of the memory-mapped register ``name``."""
+        return self.read_memory_from_address(
+            self.name_to_address(name), length, self._page_address(name)
+        )
+
+    def write_memory(self, name: str, values: List[int]):
+        """Writes ``values`` to the memory-mapped register ``name``, starting at index 0."""
+        address = self.name_to_address(name)
+        self.invalidate_shadow(address)
+        self.write_memory_to_address(address, values, self._page_address(name))
+
+    def _page_address(self, name: str) -> Union[int, None]:
+        """Returns the address of the page register of memory ``name``, or None if it has no pages."""
+        return self.csrmap.address.get(f"{name}_page")
+
+    def read_memory_from_address(
+        self, address: int, length: int, page_address: int = None
+    ) -> List[int]:
+        """Reads ``length`` values from the memory mapped at ``address``."""
+        values = []
+        for index in range(length):
+            page, offset = divmod(index, self.memory_page_length)
+            if page_address is not None and offset == 0:
+                self.write_to_address(page_address, page)
+            values.append(self.read_from_address(address + 4 * offset))
+        return values
+
+    def write_memory_to_address(self, address: int, values: List[int], page_address: int = None):
+        """Writes ``values`` to the memory mapped at ``address``."""
+        for index, value in enumerate(values):
+            page, offset = divmod(index, self.memory_page_length)
+            if page_address is not None and offset == 0:
+                self.write_to_address(page_address, page)
+            self.write_to_address(address + 4 * offset, value)
+
+    def read_many(self, names: List[str]) -> List[int]:
+        """Reads the registers with ``names`` and returns the results in the same order."""
+        return self.read_many_from_addresses([self.name_to_address(name) for name in names])
+
+    def write_many(self, values: Dict[str, int]):
+        """Writes each value in the dict ``values`` to the register named by its key."""
+        values = {self.name_to_address(name): value for name, value in values.items()}
+        for address in values:
+            self.invalidate_shadow(address)
+        self.write_many_to_addresses(values)
+
+    def read_many_from_addresses(self, addresses: List[int]) -> List[int]:
+        """Reads the registers at ``addresses`` and returns the results in the same order."""
+        return [self.read_from_address(address) for address in addresses]
+
+    def write_many_to_addresses(self, values: Dict[int, int]):
+        """Writes each value in the dict ``values`` to the register at its key address."""
+        for address, value in values.items():
+            self.write_to_address(address, value)
 
     @abstractmethod
     def read_from_address(self, address: int, length: int = 1) -> Union[int, List[int]]:
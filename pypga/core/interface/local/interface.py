@@ -1,6 +1,168 @@
+import logging
+import shutil
+import tempfile
+from typing import Dict, List, Union
+
+import numpy as np
+
+from ...builder import builder_registry
 from ..interface import BaseInterface
+from .simulation import SimulatedSoc, Simulation
+
+logger = logging.getLogger(__name__)
 
 
 class LocalInterface(BaseInterface):
-    def __init__(self):
-        raise NotImplementedError("A local interface is not implemented yet")
+    """
+    Runs a design in the migen simulator instead of on a board.
+
+    The design is simulated together with the CSR bus of the SoC, and register
+    accesses are executed as transactions on that bus, such that neither a
+    build nor a board is required. The logic of the design sees the pins of
+    the board's platform and a :class:`~.simulation.SimulatedPS7` in place
+    of the processing system, whose AXI HP ports write into a simulated RAM
+    that :meth:`read_from_ram` reads from.
+
+    Args:
+        module_class: the top module class to simulate.
+        board: the board whose platform provides the pins requested by the design.
+        free_running: if True, simulated time advances while no register is accessed,
+          which keeps a CPU core busy. By default, it only advances during register
+          accesses and :meth:`step`.
+        vcd_name: the filename of a VCD file to record all signals to.
+        clock_period: the period of the ``sys`` clock in ns, used for the VCD file.
+        backend: ``"migen"`` for the migen simulator, or ``"verilator"`` to compile
+          the design with Verilator first, which simulates much faster but
+          does not support VCD files.
+    """
+
+    # clock cycles for an array register to provide the value at a new index
+    _array_access_delay = 8
+    # clock cycles that pass after register writes, such that logic that depends on
+    # the written registers has settled like on a board, where accesses take microseconds
+    _write_delay = 8
+
+    def __init__(
+        self,
+        module_class,
+        board: str,
+        free_running: bool = False,
+        vcd_name: str = None,
+        clock_period: int = 8,
+        backend: str = "migen",
+    ):
+        platform = builder_registry[board].platform_class()
+        self.soc = SimulatedSoc(module_class, platform=platform)
+        self._csr_path = tempfile.mkdtemp(prefix="pypga-simulation-")
+        with open(f"{self._csr_path}/csr.csv", "w") as f:
+            f.write(self.soc.get_csr_csv())
+        super().__init__(self._csr_path)
+        self.simulation = Simulation(
+            self.soc,
+            clock_period=clock_period,
+            free_running=free_running,
+            vcd_name=vcd_name,
+            backend=backend,
+            ios=[self.soc.csr.adr, self.soc.csr.we, self.soc.csr.dat_w, self.soc.csr.dat_r]
+            + self.soc.ps7.ios,
+            processes=self.soc.ps7.processes(),
+        )
+
+    def stop(self):
+        self.simulation.stop()
+        shutil.rmtree(self._csr_path, ignore_errors=True)
+
+    def step(self, cycles: int = 1):
+        """Advances the simulation by ``cycles`` clock cycles."""
+
+        def wait():
+            for _ in range(cycles):
+                yield
+
+        self.simulation.execute(wait())
+
+    def _read(self, address: int):
+        return (yield from self.soc.csr.read(self.soc.to_bus_address(address)))
+
+    def _write(self, address: int, value: int):
+        yield from self.soc.csr.write(self.soc.to_bus_address(address), int(value))
+
+    def _settle(self):
+        for _ in range(self._write_delay):
+            yield
+
+    def _read_array(self, address: int, length: int):
+        values = []
+        for index in range(length):
+            yield from self._write(address, (index << 1) | 1)
+            for _ in range(self._array_access_delay):
+                yield
+            values.append((yield from self._read(address)))
+        return values
+
+    def _write_array(self, address: int, values: List[int]):
+        for index, value in enumerate(values):
+            yield from self._write(address, (index << 1) | 1)
+            yield from self._write(address, int(value) << 1)
+
+    def read_from_address(self, address: int, length: int = 1) -> Union[int, List[int]]:
+        if length > 1:
+            return self.simulation.execute(self._read_array(address, length))
+        return self.simulation.execute(self._read(address))
+
+    def write_to_address(self, address: int, value: Union[int, List[int]]):
+        values = np.atleast_1d(value)
+
+        def write():
+            if len(values) > 1:
+                yield from self._write_array(address, values)
+            else:
+                yield from self._write(address, values[0])
+            yield from self._settle()
+
+        self.simulation.execute(write())
+
+    def read_many_from_addresses(self, addresses: List[int]) -> List[int]:
+        def read_many():
+            values = []
+            for address in addresses:
+                values.append((yield from self._read(address)))
+            return values
+
+        return self.simulation.execute(read_many())
+
+    def write_many_to_addresses(self, values: Dict[int, int]):
+        def write_many():
+            for address, value in values.items():
+                yield from self._write(address, value)
+            yield from self._settle()
+
+        self.simulation.execute(write_many())
+
+    def read_memory_from_address(
+        self, address: int, length: int, page_address: int = None
+    ) -> List[int]:
+        def read_memory():
+            values = []
+            for index in range(length):
+                page, offset = divmod(index, self.memory_page_length)
+                if page_address is not None and offset == 0:
+                    yield from self._write(page_address, page)
+                values.append((yield from self._read(address + 4 * offset)))
+            return values
+
+        return self.simulation.execute(read_memory())
+
+    def write_memory_to_address(self, address: int, values: List[int], page_address: int = None):
+        def write_memory():
+            for index, value in enumerate(values):
+                page, offset = divmod(index, self.memory_page_length)
+                if page_address is not None and offset == 0:
+                    yield from self._write(page_address, page)
+                yield from self._write(address + 4 * offset, value)
+            yield from self._settle()
+
+        self.simulation.execute(write_memory())
+
+    def read_from_ram(self, offset: int = 0, length: int = 1, out: np.ndarray = None) -> np.ndarray:
+        return self.soc.ps7.read_from_ram(offset, length, out=out)
@@ -0,0 +1,266 @@
+import collections
+import concurrent.futures
+import logging
+import queue
+import threading
+from typing import Dict, List
+
+import numpy as np
+from misoc.integration import cpu_interface
+from misoc.interconnect import csr_bus
+
+from migen import Module as MigenModule
+from migen.sim import passive, run_simulation
+
+from ...migen import AutoMigenModule
+from .verilator import run_verilator_simulation
+
+logger = logging.getLogger(__name__)
+
+# the RAM area for fast data, as in the register server
+RAM_START = 0xA000000
+RAM_SIZE = 0x2000000
+
+
+class SimulatedPS7:
+    """
+    Stands in for the processing system of the SoC, with RAM behind its AXI HP ports.
+
+    Only the write channels of the ports ``s_axi_hp0`` to ``s_axi_hp3`` are
+    simulated. They accept every burst and store its data in :attr:`words`,
+    from where :meth:`read_from_ram` reads it like the register server.
+    """
+
+    def __init__(self):
+        # 64-bit word address -> value of all words written so far
+        self.words: Dict[int, int] = {}
+        self._ports = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in [f"s_axi_hp{index}" for index in range(4)]:
+            raise AttributeError(f"The simulated processing system has no {name}.")
+        if name not in self._ports:
+            from migen_axi.interconnect import Interface
+
+            self._ports[name] = Interface(data_width=64, addr_width=32, id_width=6)
+        return self._ports[name]
+
+    @property
+    def ios(self) -> List:
+        """The signals of the AXI ports that are accessed by the simulation."""
+        return [
+            signal
+            for port in self._ports.values()
+            for signal in [
+                port.aw.valid, port.aw.ready, port.aw.addr,
+                port.w.valid, port.w.ready, port.w.data, port.w.last,
+                port.b.valid, port.b.ready,
+            ]
+        ]
+
+    def processes(self) -> List:
+        """Returns the passive simulation processes of the AXI ports used by the design."""
+        return [self._serve(port) for port in self._ports.values()]
+
+    @passive
+    def _serve(self, port):
+        yield port.aw.ready.eq(1)
+        yield port.w.ready.eq(1)
+        # next word address of each burst whose data has not fully arrived
+        bursts = collections.deque()
+        responses = 0
+        while True:
+            if (yield port.b.valid) and (yield port.b.ready):
+                responses -= 1
+            if (yield port.aw.valid):
+                bursts.append((yield port.aw.addr) >> 3)
+            if (yield port.w.valid):
+                if not bursts:
+                    raise RuntimeError("AXI write data arrived before its address.")
+                self.words[bursts[0]] = (yield port.w.data)
+                bursts[0] += 1
+                if (yield port.w.last):
+                    bursts.popleft()
+                    responses += 1
+            yield port.b.valid.eq(responses > 0)
+            yield
+
+    def read_from_ram(self, offset: int = 0, length: int = 1, out: np.ndarray = None) -> np.ndarray:
+        """Reads ``length`` uint32 values starting ``offset`` bytes after the start of the RAM area."""
+        start = RAM_START + (offset & (RAM_SIZE - 1))
+        first, stop = start // 8, (start + 4 * length + 7) // 8
+        words = np.array([self.words.get(address, 0) for address in range(first, stop)], dtype=np.uint64)
+        values = words.view(np.uint32)[(start % 8) // 4 :][:length]
+        if out is None:
+            return values.copy()
+        out[:] = values
+        return out
+
+
+class SimulatedSoc(MigenModule):
+    """
+    A top module with the same CSR bus as the SoC of a board, and a simulated processing system.
+
+    Registers and memory-mapped registers appear at the same kind of addresses
+    as in the SoC, and the bus master ``csr`` takes the place of the processing system.
+    The design sees a :class:`SimulatedPS7` as ``soc.ps7``.
+    """
+
+    mem_map = dict(csr=0x80000000)
+
+    def __init__(self, module_class, platform, csr_data_width=32, csr_address_width=14):
+        self.csr_data_width = csr_data_width
+        self.ps7 = SimulatedPS7()
+        self.submodules.top = top = AutoMigenModule(module_class, platform=platform, soc=self)
+        self.csr_devices = ["top"]
+        for memory in top.get_memories():
+            if getattr(memory, "pypga_memory_mapped", False):
+                self.csr_devices.append(f"top_{memory.name_override}")
+        self.submodules.csrbankarray = csr_bus.CSRBankArray(
+            self,
+            self.get_csr_dev_address,
+            data_width=csr_data_width,
+            address_width=csr_address_width,
+        )
+        self.csr = csr_bus.Interface(csr_data_width, csr_address_width)
+        self.submodules.csrcon = csr_bus.Interconnect(
+            self.csr, self.csrbankarray.get_buses()
+        )
+
+    def get_csr_dev_address(self, name, memory):
+        if memory is not None:
+            name = "_".join([name, memory.name_override])
+        try:
+            return self.csr_devices.index(name)
+        except ValueError:
+            return None
+
+    def get_csr_regions(self):
+        return [
+            (name, self.mem_map["csr"] + 0x800 * mapaddr, self.csr_data_width, csrs)
+            for name, csrs, mapaddr, rmap in self.csrbankarray.banks
+        ]
+
+    def get_csr_csv(self) -> str:
+        """Returns the contents of the ``csr.csv`` file that a build of the design would produce."""
+        rows = [cpu_interface.get_csr_csv(self.get_csr_regions())]
+        for name, memory, mapaddr, mmap in self.csrbankarray.srams:
+            origin = self.mem_map["csr"] + 0x800 * mapaddr
+            mode = "ro" if getattr(memory, "bus_read_only", False) else "rw"
+            rows.append(f"{name}.{memory.name_override},0x{origin:08x},{memory.depth},{mode}\n")
+        return "".join(rows)
+
+    def to_bus_address(self, address: int) -> int:
+        """Converts a byte address from ``csr.csv`` to a word address on the CSR bus."""
+        return (address - self.mem_map["csr"]) // 4
+
+
+class Simulation:
+    """
+    Runs the simulation of a design in a background thread.
+
+    Other threads pass generators of simulator commands to :meth:`execute`,
+    which runs them in the simulation one after the other.
+
+    Args:
+        module: the migen module to simulate.
+        clock_period: the period of the ``sys`` clock in the units of the VCD file.
+        free_running: if True, the clock keeps running while no commands are
+          executed. Otherwise, simulated time only advances during commands.
+        vcd_name: the filename of a VCD file to record all signals to.
+        backend: ``"migen"`` for the migen simulator, or ``"verilator"`` for
+          the much faster compiled simulation of
+          :func:`~.verilator.run_verilator_simulation`.
+        ios: the signals accessed by the commands and processes, required by
+          the ``"verilator"`` backend.
+        processes: passive generators that run alongside the commands, e.g.
+          those of :meth:`SimulatedPS7.processes`.
+    """
+
+    def __init__(
+        self,
+        module,
+        clock_period=8,
+        free_running=False,
+        vcd_name=None,
+        backend="migen",
+        ios=None,
+        processes=(),
+    ):
+        if backend not in ("migen", "verilator"):
+            raise ValueError(f"Unknown simulation backend {backend!r}.")
+        self.free_running = free_running
+        self._requests = queue.Queue()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(module, clock_period, vcd_name, backend, ios, list(processes)),
+            name="pypga-simulation",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, module, clock_period, vcd_name, backend, ios, processes):
+        generators = [self._process()] + processes
+        try:
+            if backend == "verilator":
+                run_verilator_simulation(
+                    module,
+                    generators,
+                    ios=ios,
+                    clocks={"sys": clock_period},
+                    vcd_name=vcd_name,
+                )
+            else:
+                run_simulation(
+                    module, generators, clocks={"sys": clock_period}, vcd_name=vcd_name
+                )
+        except Exception as e:
+            logger.exception("The simulation failed.")
+            self._error = e
+        finally:
+            # fail all commands that were not executed
+            while True:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is not None:
+                    request[1].set_exception(RuntimeError("The simulation has stopped."))
+
+    def _process(self):
+        while True:
+            try:
+                request = self._requests.get(block=not self.free_running)
+            except queue.Empty:
+                yield
+                continue
+            if request is None:
+                return
+            generator, future = request
+            try:
+                future.set_result((yield from generator))
+            except Exception as e:
+                future.set_exception(e)
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def execute(self, generator):
+        """Runs a generator of simulator commands in the simulation and returns its return value."""
+        if not self.running:
+            raise RuntimeError("The simulation has stopped.") from self._error
+        future = concurrent.futures.Future()
+        self._requests.put((generator, future))
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except concurrent.futures.TimeoutError:
+                if not self.running:
+                    raise RuntimeError("The simulation has stopped.") from self._error
+
+    def stop(self):
+        if self.running:
+            self._requests.put(None)
+            self._thread.join()
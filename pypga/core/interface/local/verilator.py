@@ -0,0 +1,315 @@
+"""
+A compiled simulation backend that runs designs with Verilator.
+
+The design is converted to Verilog, compiled into a native executable and
+driven over a pipe, which is orders of magnitude faster than the migen
+simulator for long simulations. :func:`run_verilator_simulation` accepts the
+same generator testbenches as :func:`migen.run_simulation`, with the
+restriction that generators can only access the signals passed as ``ios``.
+Verilator must be installed and on the ``PATH``.
+"""
+import logging
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from migen import ClockSignal, Constant, ResetSignal, Signal
+from migen.fhdl import verilog
+from migen.fhdl.structure import _Assign, _Slice
+
+from ...cache import hash_components
+from ...settings import settings
+
+logger = logging.getLogger(__name__)
+
+_COMMAND = struct.Struct("<cIQ")  # operation, port index, value
+
+_MAIN = """\
+#include <cstdint>
+#include <cstdio>
+#include "V{top}.h"
+#include "verilated.h"
+
+static void set(V{top}* top, uint32_t index, uint64_t value) {{
+    switch (index) {{
+{set_cases}
+    }}
+}}
+
+static uint64_t get(V{top}* top, uint32_t index) {{
+    switch (index) {{
+{get_cases}
+    }}
+    return 0;
+}}
+
+static void tick(V{top}* top, uint64_t cycles) {{
+    for (uint64_t i = 0; i < cycles; i++) {{
+        top->eval();
+        top->{clk} = 1;
+        top->eval();
+        top->{clk} = 0;
+        top->eval();
+    }}
+}}
+
+int main(int argc, char** argv) {{
+    Verilated::commandArgs(argc, argv);
+    V{top}* top = new V{top};
+    top->{clk} = 0;
+    {reset}
+    top->eval();
+#pragma pack(push, 1)
+    struct {{ char operation; uint32_t index; uint64_t value; }} command;
+#pragma pack(pop)
+    while (fread(&command, sizeof(command), 1, stdin) == 1) {{
+        if (command.operation == 's') set(top, command.index, command.value);
+        else if (command.operation == 't') tick(top, command.value);
+        else if (command.operation == 'p') {{ top->{clk} = 1; top->eval(); }}
+        else if (command.operation == 'n') {{ top->{clk} = 0; top->eval(); }}
+        else if (command.operation == 'g') {{
+            uint64_t value = get(top, command.index);
+            fwrite(&value, sizeof(value), 1, stdout);
+            fflush(stdout);
+        }}
+        else break;
+    }}
+    top->final();
+    delete top;
+    return 0;
+}}
+"""
+
+
+def verilator_available() -> bool:
+    """Returns whether the ``verilator`` executable is on the ``PATH``."""
+    return shutil.which("verilator") is not None
+
+
+class VerilatorSimulator:
+    """
+    A design compiled with Verilator, whose I/O signals can be set and read.
+
+    Compiled models are cached in ``settings.build_path / "verilator"`` by the
+    hash of their Verilog, such that an unchanged design is compiled only once.
+
+    Args:
+        module: the migen module to simulate, with a single ``sys`` clock domain.
+        ios: the signals to set or read from the simulation. Signals that are
+          driven by the design can be read, all others can be set and read.
+    """
+
+    def __init__(self, module, ios: Iterable[Signal], top="top"):
+        if not verilator_available():
+            raise RuntimeError(
+                "Verilator is required for compiled simulation, but the "
+                "verilator executable was not found."
+            )
+        ios = set(ios)
+        for signal in ios:
+            if len(signal) > 64:
+                raise ValueError(f"Signal {signal} is wider than 64 bits.")
+        output = verilog.convert(module, ios=ios, name=top)
+        self._index = {}
+        self._signals = []
+        self._inputs = set()
+        set_cases, get_cases = [], []
+        for index, signal in enumerate(sorted(ios, key=lambda signal: signal.duid)):
+            name = output.ns.get_name(signal)
+            self._index[signal] = index
+            self._signals.append(signal)
+            get_cases.append(f"        case {index}: return top->{name};")
+            if _port_line(output.main_source, name).startswith("input"):
+                self._inputs.add(signal)
+                set_cases.append(f"        case {index}: top->{name} = value; break;")
+        try:
+            reset = f"top->{output.ns.get_name(ResetSignal('sys'))} = 0;"
+        except (KeyError, ValueError, AttributeError):
+            reset = ""
+        source = dict(
+            main=_MAIN.format(
+                top=top,
+                clk=output.ns.get_name(ClockSignal("sys")),
+                reset=reset,
+                set_cases="\n".join(set_cases),
+                get_cases="\n".join(get_cases),
+            ),
+            verilog=output.main_source,
+            data_files=output.data_files,
+        )
+        self.path = self._compile(source, top)
+        self._process = subprocess.Popen(
+            [str(self.path / "obj" / f"V{top}")],
+            cwd=self.path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._pending = []
+        for signal in self._inputs:
+            self._send(b"s", signal, signal.reset.value & ((1 << len(signal)) - 1))
+        # values written since the last clock cycle, applied after the next clock edge
+        self._writes = {}
+
+    @staticmethod
+    def _compile(source: Dict, top: str) -> Path:
+        path = (settings.build_path / "verilator" / hash_components(source)[:16]).resolve()
+        executable = path / "obj" / f"V{top}"
+        if executable.is_file():
+            logger.debug(f"Using the compiled simulation in {path}.")
+            return path
+        path.mkdir(parents=True, exist_ok=True)
+        (path / f"{top}.v").write_text(source["verilog"])
+        (path / "main.cpp").write_text(source["main"])
+        for filename, content in source["data_files"].items():
+            (path / filename).write_text(content)
+        logger.info(f"Compiling the simulation with Verilator in {path}.")
+        subprocess.run(
+            [
+                "verilator",
+                "--cc",
+                "--exe",
+                "--build",
+                "-O3",
+                "--x-assign", "fast",
+                "--x-initial", "fast",
+                "-Wno-fatal",
+                "--top-module", top,
+                "--Mdir", "obj",
+                f"{top}.v",
+                "main.cpp",
+            ],
+            cwd=path,
+            check=True,
+            stdout=subprocess.DEVNULL if not logger.isEnabledFor(logging.DEBUG) else None,
+        )
+        return path
+
+    def _send(self, operation: bytes, signal: Signal = None, value: int = 0):
+        index = 0 if signal is None else self._index[signal]
+        self._pending.append(_COMMAND.pack(operation, index, value))
+        if len(self._pending) >= 4096:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._process.stdin.write(b"".join(self._pending))
+            self._process.stdin.flush()
+            self._pending = []
+
+    def _check(self, signal):
+        if signal not in self._index:
+            raise ValueError(
+                f"Signal {signal} is not accessible in the compiled simulation. "
+                f"Pass it in ``ios``."
+            )
+
+    def write(self, signal: Signal, value: int):
+        """Sets ``signal`` to ``value`` after the next clock edge."""
+        self._check(signal)
+        if signal not in self._inputs:
+            raise ValueError(f"Signal {signal} is driven by the design and cannot be set.")
+        self._writes[signal] = int(value)
+
+    def read(self, signal: Signal) -> int:
+        """Returns the current value of ``signal``."""
+        self._check(signal)
+        self._send(b"g", signal)
+        self._flush()
+        value = struct.unpack("<Q", self._process.stdout.read(8))[0]
+        value &= (1 << len(signal)) - 1
+        if signal.signed and value >> (len(signal) - 1):
+            value -= 1 << len(signal)
+        return value
+
+    def tick(self, cycles: int = 1):
+        """
+        Advances the simulation by ``cycles`` clock cycles.
+
+        Like in the migen simulator, pending writes are applied after the
+        first clock edge, such that synchronous logic sees them one cycle later.
+        """
+        if self._writes:
+            self._send(b"p")
+            for signal, value in self._writes.items():
+                self._send(b"s", signal, value & ((1 << len(signal)) - 1))
+            self._writes = {}
+            self._send(b"n")
+            cycles -= 1
+        if cycles > 0:
+            self._send(b"t", value=cycles)
+
+    def close(self):
+        if self._process.poll() is None:
+            self._send(b"q")
+            self._flush()
+            self._process.stdin.close()
+            self._process.wait()
+
+
+def _port_line(source: str, name: str) -> str:
+    """Returns the port declaration of the Verilog port ``name``."""
+    for line in source.splitlines():
+        line = line.strip().rstrip(",")
+        if line.startswith(("input", "output")) and line.split()[-1] == name:
+            return line
+    return ""
+
+
+def _execute(simulator: VerilatorSimulator, statement):
+    """Executes a statement yielded by a testbench and returns the value to send back."""
+    if isinstance(statement, Signal):
+        return simulator.read(statement)
+    if isinstance(statement, _Slice):
+        value = simulator.read(statement.value)
+        return (value >> statement.start) & ((1 << (statement.stop - statement.start)) - 1)
+    if isinstance(statement, _Assign) and isinstance(statement.l, Signal):
+        value = statement.r.value if isinstance(statement.r, Constant) else statement.r
+        simulator.write(statement.l, int(value))
+        return None
+    raise NotImplementedError(f"Unsupported testbench statement in compiled simulation: {statement}")
+
+
+def run_verilator_simulation(
+    module, generators, ios: Iterable[Signal], clocks={"sys": 10}, vcd_name=None
+):
+    """
+    Compiled version of :func:`migen.run_simulation`.
+
+    Runs the testbench ``generators`` on ``module`` until all non-passive
+    generators are exhausted. Generators can only access the signals in ``ios``,
+    and only a single ``sys`` clock domain is supported.
+    """
+    if set(clocks) != {"sys"}:
+        raise ValueError("Compiled simulation only supports a single sys clock.")
+    if vcd_name is not None:
+        raise ValueError("Compiled simulation does not support VCD files.")
+    if isinstance(generators, dict):
+        generators = generators["sys"]
+    if not isinstance(generators, (list, tuple)):
+        generators = [generators]
+    simulator = VerilatorSimulator(module, ios)
+    # each entry is [generator, value to send, passive]
+    running: List[list] = [[generator, None, False] for generator in generators]
+    try:
+        while any(not passive for _, _, passive in running):
+            for entry in list(running):
+                generator, value, _ = entry
+                while True:
+                    try:
+                        statement = generator.send(value)
+                    except StopIteration:
+                        running.remove(entry)
+                        break
+                    if statement is None:
+                        entry[1] = None
+                        break
+                    if isinstance(statement, str) and statement == "passive":
+                        entry[2] = True
+                        value = None
+                        continue
+                    value = _execute(simulator, statement)
+            simulator.tick()
+    finally:
+        simulator.close()
@@ -1 +1 @@
-from .interface import RemoteInterface
+from .interface import AsyncRemoteInterface, RemoteInterface
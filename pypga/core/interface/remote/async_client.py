@@ -0,0 +1,252 @@
+import asyncio
+import collections
+import logging
+
+import numpy as np
+
+from .client import Client, get_chunks, make_header
+
+
+class AsyncClient:
+    """An asyncio client for the register server that pipelines requests.
+
+    All request methods send their request immediately and return an
+    ``asyncio.Future`` for the response, such that many requests can be
+    outstanding on the same socket. The server answers requests in order.
+    Each request carries an 8-bit request ID in its header, which the
+    server echoes back, so that a response that does not belong to the
+    oldest outstanding request is detected. If the oldest outstanding
+    request has not been answered within ``timeout`` seconds after it was
+    sent or after the previous response, whichever is later, all outstanding
+    requests fail with ``asyncio.TimeoutError``. Once the connection has
+    failed, all further requests raise its error.
+    """
+
+    max_batch_length = Client.max_batch_length
+
+    def __init__(self, token, host="127.0.0.1", port=2222, timeout=1.0):
+        if len(token) != 32:
+            raise ValueError(f"token must have 32 characters, not {len(token)}.")
+        self._token = token
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._receive_task = None
+        self._watchdog_task = None
+        # (header, response length, parse function, future, time sent) of each request
+        self._pending = collections.deque()
+        self._last_response = 0.0
+        self._request_id = 0
+        # the exception that ended the connection, raised by all further requests
+        self._error = None
+
+    async def start(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port), self._timeout
+        )
+        self._writer.write(str(self._token).encode("ascii"))
+        data = await asyncio.wait_for(self._reader.readexactly(32), self._timeout)
+        data = data.decode("ascii")
+        if data != "1" * 32:
+            raise RuntimeError(
+                f"Wrong authentication token: {self._token} != {data}. This may mean "
+                f"that another client has connected to your redpitaya. Try restarting."
+            )
+        else:
+            logging.debug(f"Correct authentication token: {self._token} / {data}")
+        self._receive_task = asyncio.ensure_future(self._receive())
+        self._watchdog_task = asyncio.ensure_future(self._watchdog())
+
+    def stop(self):
+        if self._writer is None:
+            return
+        try:
+            self._writer.write(b"c" + b"\x00" * 7)
+            self._writer.close()
+        except (ConnectionError, RuntimeError):
+            logging.debug("Error upon closing socket: ", exc_info=True)
+        for task in (self._receive_task, self._watchdog_task):
+            if task is not None:
+                task.cancel()
+        self._fail_pending(ConnectionError("The client was stopped."))
+        self._writer = None
+
+    @property
+    def outstanding(self) -> int:
+        """The number of requests that have not been answered yet."""
+        return len(self._pending)
+
+    async def drain(self):
+        """Waits until all outstanding requests have been answered or have failed."""
+        if self._writer is not None and self._error is None:
+            await self._writer.drain()
+        futures = [future for _, _, _, future, _ in self._pending]
+        await asyncio.gather(*futures, return_exceptions=True)
+
+    def reads(self, addr, length, start: int = 0) -> asyncio.Future:
+        """Pipelined version of :meth:`Client.reads`."""
+        if length <= Client.max_length and start == 0:
+            return self._request(
+                make_header(b"r", length, addr, request_id=self._next_request_id()),
+                response_length=length * 4,
+                parse=self._to_array,
+            )
+        futures = [
+            self._request(
+                make_header(b"R", chunk_length, addr, request_id=self._next_request_id()),
+                body=Client._index_to_bytes(start + offset),
+                response_length=chunk_length * 4,
+                parse=self._to_array,
+            )
+            for offset, chunk_length in get_chunks(length, Client.max_length)
+        ]
+        return asyncio.ensure_future(self._concatenate(futures))
+
+    def read_from_ram(self, offset: int, length: int) -> asyncio.Future:
+        maxlen = 2**23
+        if length >= maxlen:
+            raise ValueError(f"Maximum read-length is {maxlen} uint32 values.")
+        header = b"d" + (length & 0xFFFFFF).to_bytes(3, "little")
+        header += (offset & 0xFFFFFFFF).to_bytes(4, "little")
+        return self._request(header, response_length=length * 4, parse=self._to_array)
+
+    def writes(self, addr, values, start: int = 0) -> asyncio.Future:
+        """Pipelined version of :meth:`Client.writes`."""
+        values = np.ascontiguousarray(values, dtype=np.uint32)
+        if len(values) <= Client.max_write_length and start == 0:
+            return self._request(
+                make_header(b"w", len(values), addr, request_id=self._next_request_id()),
+                body=values.tobytes(),
+            )
+        futures = [
+            self._request(
+                make_header(b"W", chunk_length, addr, request_id=self._next_request_id()),
+                body=Client._index_to_bytes(start + offset)
+                + values[offset : offset + chunk_length].tobytes(),
+            )
+            for offset, chunk_length in get_chunks(len(values), Client.max_length)
+        ]
+        return asyncio.ensure_future(asyncio.gather(*futures))
+
+    def read_block(
+        self, addr, length, page_address: int = None, page_length: int = 512
+    ) -> asyncio.Future:
+        """Pipelined version of :meth:`Client.read_block`."""
+        futures = []
+        page_writes = []
+        for header, body, offset, chunk_length in Client._block_requests(
+            b"b", addr, length, page_address, page_length, self._next_request_id
+        ):
+            if offset is None:
+                page_writes.append(self._request(header, body=body))
+            else:
+                futures.append(
+                    self._request(
+                        header, response_length=chunk_length * 4, parse=self._to_array
+                    )
+                )
+        return asyncio.ensure_future(self._concatenate(futures, page_writes))
+
+    def write_block(
+        self, addr, values, page_address: int = None, page_length: int = 512
+    ) -> asyncio.Future:
+        """Pipelined version of :meth:`Client.write_block`."""
+        values = np.ascontiguousarray(values, dtype=np.uint32)
+        futures = []
+        for header, body, offset, chunk_length in Client._block_requests(
+            b"B", addr, len(values), page_address, page_length, self._next_request_id
+        ):
+            if offset is not None:
+                body = values[offset : offset + chunk_length].tobytes()
+            futures.append(self._request(header, body=body))
+        return asyncio.ensure_future(asyncio.gather(*futures))
+
+    def batch(self, entries) -> asyncio.Future:
+        """Pipelined version of :meth:`Client.batch`."""
+        futures = [
+            self._request(
+                make_header(b"m", len(chunk), 0, request_id=self._next_request_id()),
+                body=Client._batch_body(chunk).tobytes(),
+                response_length=len(chunk) * 4,
+                parse=self._to_array,
+            )
+            for chunk in (
+                entries[start : start + self.max_batch_length]
+                for start in range(0, len(entries), self.max_batch_length)
+            )
+        ]
+        return asyncio.ensure_future(self._concatenate(futures))
+
+    @staticmethod
+    async def _concatenate(futures, writes=()):
+        # the writes must succeed for the results to be valid
+        results = (await asyncio.gather(*futures, *writes))[: len(futures)]
+        if len(results) == 1:
+            return results[0]
+        if not results:
+            return np.zeros(0, dtype=np.uint32)
+        return np.concatenate(results)
+
+    @staticmethod
+    def _to_array(data):
+        return np.frombuffer(data, dtype=np.uint32)
+
+    def _next_request_id(self):
+        self._request_id = (self._request_id + 1) & 0xFF
+        return self._request_id
+
+    def _request(self, header, body=b"", response_length=0, parse=None):
+        if self._error is not None:
+            raise self._error
+        if self._writer is None:
+            raise ConnectionError("The client is not connected. Call start() first.")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((header, response_length, parse, future, loop.time()))
+        self._writer.write(header + body)
+        return future
+
+    async def _receive(self):
+        try:
+            while True:
+                ack = await self._reader.readexactly(8)
+                if not self._pending:
+                    raise RuntimeError(f"Error: unexpected control sequence from server: {ack}")
+                header, response_length, parse, future, _ = self._pending.popleft()
+                data = await self._reader.readexactly(response_length)
+                if ack != header:
+                    raise RuntimeError(f"Error: wrong control sequence from server: {ack}")
+                self._last_response = asyncio.get_running_loop().time()
+                if not future.done():
+                    future.set_result(None if parse is None else parse(data))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.debug("Error while receiving from server: ", exc_info=True)
+            self._error = e
+            self._fail_pending(e)
+
+    async def _watchdog(self):
+        """Fails all outstanding requests once the oldest one has waited longer than the timeout."""
+        loop = asyncio.get_running_loop()
+        while self._error is None:
+            await asyncio.sleep(self._timeout / 4)
+            if not self._pending:
+                continue
+            # the server answers in order, so the oldest request waits at most since the last response
+            waiting_since = max(self._pending[0][4], self._last_response)
+            if loop.time() - waiting_since > self._timeout:
+                self._error = asyncio.TimeoutError(
+                    f"No response from the server within {self._timeout} s."
+                )
+                # the remaining responses can no longer be told apart
+                self._receive_task.cancel()
+                self._fail_pending(self._error)
+
+    def _fail_pending(self, exception):
+        while self._pending:
+            *_, future, _ = self._pending.popleft()
+            if not future.done():
+                future.set_exception(exception)
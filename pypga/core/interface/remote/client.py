@@ -7,6 +7,38 @@ from time import time
 import numpy as np
 
 
+def make_header(command: bytes, length: int, addr: int, request_id: int = 0) -> bytes:
+    """Returns the 8-byte request header for the register server.
+
+    Args:
+        command: the single-character command, e.g. ``b"r"``.
+        length: the number of 4-byte units to transfer.
+        addr: the address to read from or write to.
+        request_id: an 8-bit identifier that the server echoes back.
+    """
+    return command + bytes(
+        bytearray(
+            [
+                request_id & 0xFF,
+                length & 0xFF,
+                (length >> 8) & 0xFF,
+                addr & 0xFF,
+                (addr >> 8) & 0xFF,
+                (addr >> 16) & 0xFF,
+                (addr >> 24) & 0xFF,
+            ]
+        )
+    )
+
+
+def get_chunks(length: int, chunk_length: int):
+    """Returns a list of ``(offset, length)`` tuples splitting ``length`` into chunks."""
+    return [
+        (offset, min(chunk_length, length - offset))
+        for offset in range(0, length, chunk_length)
+    ]
+
+
 class Client:
     def __init__(self, token, host="127.0.0.1", port=2222, timeout=1.0):
         if len(token) != 32:
@@ -17,6 +49,9 @@ class Client:
         self._timeout = timeout
         # add a lock for read/write access to the socket to make it threadsafe
         self._socket_lock = threading.Lock()
+        # reusable receive buffer for acknowledgement headers
+        self._ack_buffer = bytearray(8)
+        self._ack_view = memoryview(self._ack_buffer)
         # start setting up interface
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._socket.settimeout(self._timeout)
@@ -48,46 +83,54 @@ class Client:
         except socket.error:
             logging.debug("Error upon closing socket: ", exc_info=True)
 
-    def reads(self, addr, length):
-        if length > 65535:
-            length = 65535
-            logging.warning("Maximum read-length is %d", length)
-        header = b"r" + bytes(
-            bytearray(
-                [
-                    0,
-                    length & 0xFF,
-                    (length >> 8) & 0xFF,
-                    addr & 0xFF,
-                    (addr >> 8) & 0xFF,
-                    (addr >> 16) & 0xFF,
-                    (addr >> 24) & 0xFF,
-                ]
-            )
-        )
+    max_length = 65535
+    max_write_length = 65535 - 2
+
+    def reads(self, addr, length, out: np.ndarray = None, start: int = 0) -> np.ndarray:
+        """Reads ``length`` values from the register at ``addr``.
+
+        Args:
+            addr: the register address.
+            length: the number of values to read. Values beyond the maximum
+              request length are transferred in pipelined chunks.
+            out: an optional contiguous uint32 array of size ``length`` to receive
+              the data into. By default, a new array is allocated.
+            start: for array registers, the index of the first element to read.
+
+        Returns:
+            numpy array with type uint32.
+        """
+        out = self._get_output_array(length, out)
+        if length <= self.max_length and start == 0:
+            header = make_header(b"r", length, addr)
+            with self._socket_lock:
+                self._socket.sendall(header)
+                self._receive_response(header, out)
+            return out
+        requests = [
+            (make_header(b"R", chunk_length, addr), offset, chunk_length)
+            for offset, chunk_length in get_chunks(length, self.max_length)
+        ]
         with self._socket_lock:
-            self._socket.sendall(header)
-            timeout_time = time() + self._timeout
-            data = self._socket.recv(length * 4 + 8)
-            while len(data) < length * 4 + 8:
-                result = self._socket.recv(length * 4 - len(data) + 8)
-                data += result
-                if len(result) == 0 and time() > timeout_time:
-                    try:
-                        self._clear_socket()
-                    finally:
-                        raise TimeoutError(
-                            f"Read timeout - incomplete data transmission: {data}"
-                        )
-            self._check_acknowledgement(header, ack=data[:8])
-        return np.frombuffer(data[8:], dtype=np.uint32)
-
-    def read_from_ram(self, offset: int, length: int) -> np.ndarray:
+            # send all requests before receiving the first response to avoid round trips
+            self._socket.sendall(
+                b"".join(
+                    header + self._index_to_bytes(start + offset)
+                    for header, offset, _ in requests
+                )
+            )
+            for header, offset, chunk_length in requests:
+                self._receive_response(header, out[offset : offset + chunk_length])
+        return out
+
+    def read_from_ram(self, offset: int, length: int, out: np.ndarray = None) -> np.ndarray:
         """Reads data from from the dedicated RAM area.
 
         Args:
             offset: the offset from the start address, in bytes.
             length: the amount of uint32 data points to read, i.e. in units of 4-byte chunks.
+            out: an optional contiguous uint32 array of size ``length`` to receive
+              the data into. By default, a new array is allocated.
 
         Returns:
             numpy array with type uint32.
@@ -108,47 +151,200 @@ class Client:
                 ]
             )
         )
+        out = self._get_output_array(length, out)
         with self._socket_lock:
             self._socket.sendall(header)
-            timeout_time = time() + self._timeout
-            data = self._socket.recv(length * 4 + 8)
-            while len(data) < length * 4 + 8:
-                result = self._socket.recv(length * 4 - len(data) + 8)
-                data += result
-                if len(result) == 0 and time() > timeout_time:
-                    try:
-                        self._clear_socket()
-                    finally:
-                        raise TimeoutError(
-                            f"Read timeout - incomplete data transmission: {data}"
-                        )
-            self._check_acknowledgement(header, ack=data[:8])
-        return np.frombuffer(data[8:], dtype=np.uint32)
-
-    def writes(self, addr, values):
-        values = values[: 65535 - 2]
+            self._receive_response(header, out)
+        return out
+
+    def writes(self, addr, values, start: int = 0):
+        """Writes ``values`` to the register at ``addr``.
+
+        Args:
+            addr: the register address.
+            values: the values to write. Values beyond the maximum request
+              length are transferred in pipelined chunks.
+            start: for array registers, the index of the first element to write.
+        """
+        values = np.ascontiguousarray(values, dtype=np.uint32)
         length = len(values)
-        header = b"w" + bytes(
-            bytearray(
-                [
-                    0,
-                    length & 0xFF,
-                    (length >> 8) & 0xFF,
-                    addr & 0xFF,
-                    (addr >> 8) & 0xFF,
-                    (addr >> 16) & 0xFF,
-                    (addr >> 24) & 0xFF,
-                ]
+        if length <= self.max_write_length and start == 0:
+            header = make_header(b"w", length, addr)
+            with self._socket_lock:
+                # send header+body
+                self._socket.sendall(header + values.tobytes())
+                self._check_acknowledgement(header)
+            return
+        requests = [
+            (make_header(b"W", chunk_length, addr), offset, chunk_length)
+            for offset, chunk_length in get_chunks(length, self.max_length)
+        ]
+        with self._socket_lock:
+            for header, offset, chunk_length in requests:
+                self._socket.sendall(
+                    header
+                    + self._index_to_bytes(start + offset)
+                    + values[offset : offset + chunk_length].tobytes()
+                )
+            # acknowledgements are only collected after all chunks were sent
+            for header, _, _ in requests:
+                self._check_acknowledgement(header)
+
+    def read_block(
+        self,
+        addr,
+        length,
+        out: np.ndarray = None,
+        page_address: int = None,
+        page_length: int = 512,
+    ) -> np.ndarray:
+        """Reads ``length`` values from consecutive addresses starting at ``addr``.
+
+        Args:
+            addr: the address of the first value.
+            length: the number of values to read.
+            out: an optional contiguous uint32 array of size ``length`` to receive
+              the data into. By default, a new array is allocated.
+            page_address: for memories that are larger than their address window,
+              the address of the register selecting the page of ``page_length``
+              values that appears at ``addr``.
+
+        Returns:
+            numpy array with type uint32.
+        """
+        out = self._get_output_array(length, out)
+        requests = self._block_requests(b"b", addr, length, page_address, page_length)
+        with self._socket_lock:
+            # send all requests before receiving the first response to avoid round trips
+            self._socket.sendall(b"".join(header + body for header, body, _, _ in requests))
+            for header, _, offset, chunk_length in requests:
+                if offset is None:
+                    self._check_acknowledgement(header)
+                else:
+                    self._receive_response(header, out[offset : offset + chunk_length])
+        return out
+
+    def write_block(self, addr, values, page_address: int = None, page_length: int = 512):
+        """Writes ``values`` to consecutive addresses starting at ``addr``.
+
+        See :meth:`read_block` for the arguments.
+        """
+        values = np.ascontiguousarray(values, dtype=np.uint32)
+        requests = self._block_requests(b"B", addr, len(values), page_address, page_length)
+        with self._socket_lock:
+            self._socket.sendall(
+                b"".join(
+                    header
+                    + (body if offset is None else values[offset : offset + chunk_length].tobytes())
+                    for header, body, offset, chunk_length in requests
+                )
             )
-        )
+            for header, _, _, _ in requests:
+                self._check_acknowledgement(header)
+
+    @classmethod
+    def _block_requests(
+        cls, command, addr, length, page_address, page_length, next_request_id=lambda: 0
+    ):
+        """Returns a list of ``(header, body, offset, length)`` for a block transfer.
+
+        Page selection requests have an offset of ``None``.
+        """
+        if page_address is None:
+            page_length = cls.max_length
+        requests = []
+        for offset, chunk_length in get_chunks(length, page_length):
+            if page_address is None:
+                chunk_address = addr + 4 * offset
+            else:
+                page = np.array([offset // page_length], dtype=np.uint32)
+                header = make_header(b"w", 1, page_address, request_id=next_request_id())
+                requests.append((header, page.tobytes(), None, 1))
+                chunk_address = addr
+            header = make_header(command, chunk_length, chunk_address, request_id=next_request_id())
+            requests.append((header, b"", offset, chunk_length))
+        return requests
+
+    @staticmethod
+    def _index_to_bytes(index: int) -> bytes:
+        return (index & 0xFFFFFFFF).to_bytes(4, "little")
+
+    max_batch_length = 65535 // 3
+
+    def batch(self, entries) -> np.ndarray:
+        """Executes a list of single-register operations with one request per batch.
+
+        Args:
+            entries: a sequence of ``(address, operation, value)`` tuples, where
+              ``operation`` is ``"r"`` for reading or ``"w"`` for writing. The value
+              is ignored for reads.
+
+        Returns:
+            numpy array with type uint32 containing one entry per operation: the
+            read value for reads and the written value for writes.
+        """
+        results = []
+        for start in range(0, len(entries), self.max_batch_length):
+            results.append(self._batch(entries[start : start + self.max_batch_length]))
+        if not results:
+            return np.zeros(0, dtype=np.uint32)
+        return np.concatenate(results)
+
+    def _batch(self, entries) -> np.ndarray:
+        length = len(entries)
+        body = self._batch_body(entries)
+        header = make_header(b"m", length, 0)
+        out = self._get_output_array(length)
         with self._socket_lock:
-            # send header+body
-            self._socket.sendall(header + np.array(values, dtype=np.uint32).tobytes())
-            self._check_acknowledgement(header)
+            self._socket.sendall(header + body.tobytes())
+            self._receive_response(header, out)
+        return out
+
+    @staticmethod
+    def _batch_body(entries) -> np.ndarray:
+        body = np.empty((len(entries), 3), dtype=np.uint32)
+        for i, (addr, operation, value) in enumerate(entries):
+            if operation not in ("r", "w"):
+                raise ValueError(f"Unknown batch operation {operation!r}.")
+            body[i] = (ord(operation), addr, value if operation == "w" else 0)
+        return body
+
+    @staticmethod
+    def _get_output_array(length: int, out: np.ndarray = None) -> np.ndarray:
+        if out is None:
+            return np.empty(length, dtype=np.uint32)
+        if out.dtype != np.uint32 or out.shape != (length,) or not out.flags.c_contiguous:
+            raise ValueError(
+                f"out must be a contiguous uint32 array of shape ({length},), not "
+                f"{out.dtype} with shape {out.shape}."
+            )
+        return out
+
+    def _receive_response(self, header, out: np.ndarray):
+        """Receives the acknowledgement of ``header`` and then the data directly into ``out``."""
+        self._check_acknowledgement(header)
+        if len(out):
+            self._recv_into(memoryview(out).cast("B"))
+
+    def _recv_into(self, view: memoryview):
+        timeout_time = time() + self._timeout
+        received = 0
+        while received < len(view):
+            new = self._socket.recv_into(view[received:])
+            received += new
+            if new == 0 and time() > timeout_time:
+                try:
+                    self._clear_socket()
+                finally:
+                    raise TimeoutError(
+                        f"Read timeout - incomplete data transmission: received "
+                        f"{received} of {len(view)} bytes."
+                    )
 
     def _check_acknowledgement(self, header, ack=None):
         if ack is None:
-            ack = self._socket.recv(8)
+            self._recv_into(self._ack_view)
+            ack = bytes(self._ack_buffer)
         if ack != header:  # check for transmission acknowledgement
             try:
                 self._clear_socket()
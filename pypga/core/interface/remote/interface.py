@@ -1,59 +1,232 @@
-import time
-from typing import List, Union
+import asyncio
+import logging
+from typing import Awaitable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
+from ...settings import settings
 from ..interface import BaseInterface
+from .async_client import AsyncClient
 from .client import Client
 from .server import Server
-from .sshshell import SshShell
+from .session import Session, sessions
+from .sshshell import CommandResult
+
+logger = logging.getLogger(__name__)
 
 
 class RemoteInterface(BaseInterface):
-    def __init__(self, result_path: str = None, host: str = "127.0.0.1"):
+    """
+    Accesses the registers of a design running on a board.
+
+    Args:
+        result_path: the build result directory of the design.
+        host: the hostname or IP address of the board.
+        reuse_session: if True, the SSH connection and register server of the
+          board are shared with other interfaces in this process, and kept
+          alive when the interface is stopped. Defaults to ``settings.reuse_sessions``.
+
+    After connecting, the interface reads the identifier that the builder
+    compiled into the design, and flashes the bitstream again if the board
+    runs a different design than the recorded bitstream hash suggests.
+    """
+
+    # written by the builder, the identifier compiled into the design
+    _identifier_file = "identifier.txt"
+
+    def __init__(
+        self, result_path: str = None, host: str = "127.0.0.1", reuse_session: bool = None
+    ):
         super().__init__(result_path)
         self.host = host
-        self.server = Server(
-            host=host,
-            bitstreamfile=self.build_result_path / Server._bitstreamname,
+        if reuse_session is None:
+            reuse_session = settings.reuse_sessions
+        self._reuse_session = reuse_session
+        self.session = sessions.get(host) if reuse_session else Session(host)
+        self.server = self.session.server
+        # flashing resets all registers
+        self.session.flash_callbacks.append(self.invalidate_shadow)
+        self._bitstreamfile = self.build_result_path / Server._bitstreamname
+        self.session.load(self._bitstreamfile)
+        self.client = self._create_client()
+        self._check_identifier()
+
+    def _create_client(self):
+        return Client(host=self.host, token=self.server.token)
+
+    def _expected_identifier(self) -> Optional[Tuple[int, bytes]]:
+        """Returns the address of the identifier memory and the identifier of the build, or None for older builds."""
+        address = self.csrmap.address.get("identifier.mem")
+        path = self.build_result_path / self._identifier_file
+        if address is None or not path.is_file():
+            return None
+        return address, path.read_text().strip().encode("ascii")
+
+    @staticmethod
+    def _identifier_matches(values, identifier: bytes) -> bool:
+        # the identifier memory holds the length of the identifier, followed by its characters
+        values = [int(value) & 0xFF for value in values]
+        return values[0] == len(identifier) and bytes(values[1:]) == identifier
+
+    def _reflash(self):
+        """Flashes the bitstream although the session considers it loaded, and reconnects."""
+        logger.warning(
+            f"{self.host} does not run the design of {self.build_result_path}, flashing it again."
         )
-        self.client = Client(host=host, token=self.server.token)
-        self._extra_shell = None  # lazy instantiation
+        self.client.stop()
+        self.session.load(self._bitstreamfile, force=True)
+        self.server = self.session.server
+        self.client = self._create_client()
 
-    def read_from_address(self, address: int, length: int = 1) -> Union[int, List[int]]:
-        read_value = [int(v) for v in self.client.reads(address, length)]
+    def _check_identifier(self):
+        expected = self._expected_identifier()
+        if expected is None:
+            return
+        address, identifier = expected
+        if not self._identifier_matches(self.client.read_block(address, len(identifier) + 1), identifier):
+            self._reflash()
+
+    @staticmethod
+    def _to_int_or_list(values) -> Union[int, List[int]]:
+        read_value = values.tolist()
         if len(read_value) == 1:
             return read_value[0]
         else:
             return read_value
 
+    @staticmethod
+    def _to_write_value(value: Union[int, List[int]]) -> np.ndarray:
+        return np.atleast_1d(np.asarray(value, dtype=np.int64))
+
+    def read_from_address(self, address: int, length: int = 1) -> Union[int, List[int]]:
+        return self._to_int_or_list(self.client.reads(address, length))
+
     def write_to_address(self, address: int, value: Union[int, List[int]]):
-        try:
-            write_value = [int(v) for v in value]
-        except TypeError:
-            write_value = [int(value)]
-        self.client.writes(address, write_value)
-
-    def read_from_ram(self, offset: int = 0, length: int = 1) -> np.ndarray:
-        return self.client.read_from_ram(offset, length)
-
-    @property
-    def extra_shell(self):
-        if self._extra_shell is None:
-            self._extra_shell = SshShell(
-                hostname=self.host,
-                sshport=22,
-                user="root",
-                password="root",
-                delay=0.1,
-                )
-            time.sleep(0.2)
-            self._extra_shell.read()  # purge any output
-        return self._extra_shell
+        self.client.writes(address, self._to_write_value(value))
+
+    def read_many_from_addresses(self, addresses: List[int]) -> List[int]:
+        entries = [(address, "r", 0) for address in addresses]
+        return [int(v) for v in self.client.batch(entries)]
+
+    def write_many_to_addresses(self, values: Dict[int, int]):
+        entries = [(address, "w", int(value)) for address, value in values.items()]
+        self.client.batch(entries)
+
+    def read_memory_from_address(
+        self, address: int, length: int, page_address: int = None
+    ) -> np.ndarray:
+        return self.client.read_block(
+            address, length, page_address=page_address, page_length=self.memory_page_length
+        )
+
+    def write_memory_to_address(self, address: int, values: List[int], page_address: int = None):
+        self.client.write_block(
+            address,
+            self._to_write_value(values),
+            page_address=page_address,
+            page_length=self.memory_page_length,
+        )
+
+    def read_from_ram(
+        self, offset: int = 0, length: int = 1, out: np.ndarray = None
+    ) -> np.ndarray:
+        return self.client.read_from_ram(offset, length, out=out)
+
+    def execute(self, command: str, timeout: float = None, check: bool = False) -> CommandResult:
+        """Executes a shell command on the board, over the SSH connection of the session."""
+        return self.server.run(command, timeout=timeout, check=check)
 
     def stop(self):
         self.client.stop()
-        self.server.stop()
-        if self._extra_shell is not None:
-            self._extra_shell.stop()
-            self._extra_shell = None
+        if self.invalidate_shadow in self.session.flash_callbacks:
+            self.session.flash_callbacks.remove(self.invalidate_shadow)
+        if not self._reuse_session:
+            self.session.close()
+
+
+class AsyncRemoteInterface(RemoteInterface):
+    """A remote interface whose reads and writes return awaitables.
+
+    Requests are sent immediately and pipelined on a single connection,
+    such that many of them can be outstanding at the same time. The
+    connection must be opened with ``await interface.start()`` from within
+    a running event loop before the first request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # reads return awaitables, which cannot be served from a cache
+        self.shadow = None
+
+    def _create_client(self):
+        return AsyncClient(host=self.host, token=self.server.token)
+
+    def _check_identifier(self):
+        # requires a connected client, done in start()
+        pass
+
+    async def start(self):
+        await self.client.start()
+        expected = self._expected_identifier()
+        if expected is None:
+            return
+        address, identifier = expected
+        if not self._identifier_matches(await self.client.read_block(address, len(identifier) + 1), identifier):
+            await asyncio.get_running_loop().run_in_executor(None, self._reflash)
+            await self.client.start()
+
+    async def drain(self):
+        """Waits until all outstanding requests have been answered."""
+        await self.client.drain()
+
+    def read_from_address(self, address: int, length: int = 1) -> Awaitable:
+        return self._await_and_convert(
+            self.client.reads(address, length), self._to_int_or_list
+        )
+
+    def write_to_address(self, address: int, value: Union[int, List[int]]) -> Awaitable:
+        return self.client.writes(address, self._to_write_value(value))
+
+    def read_many_from_addresses(self, addresses: List[int]) -> Awaitable:
+        entries = [(address, "r", 0) for address in addresses]
+        return self._await_and_convert(
+            self.client.batch(entries), lambda values: [int(v) for v in values]
+        )
+
+    def write_many_to_addresses(self, values: Dict[int, int]) -> Awaitable:
+        entries = [(address, "w", int(value)) for address, value in values.items()]
+        return self.client.batch(entries)
+
+    def read_memory_from_address(
+        self, address: int, length: int, page_address: int = None
+    ) -> Awaitable:
+        return self.client.read_block(
+            address, length, page_address=page_address, page_length=self.memory_page_length
+        )
+
+    def write_memory_to_address(
+        self, address: int, values: List[int], page_address: int = None
+    ) -> Awaitable:
+        return self.client.write_block(
+            address,
+            self._to_write_value(values),
+            page_address=page_address,
+            page_length=self.memory_page_length,
+        )
+
+    def read_from_ram(
+        self, offset: int = 0, length: int = 1, out: np.ndarray = None
+    ) -> Awaitable:
+        future = self.client.read_from_ram(offset, length)
+        if out is None:
+            return future
+
+        def fill(values):
+            out[:] = values
+            return out
+
+        return self._await_and_convert(future, fill)
+
+    @staticmethod
+    async def _await_and_convert(future, function):
+        return function(await future)
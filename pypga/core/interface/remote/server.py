@@ -1,12 +1,15 @@
 import logging
+import re
+import socket
+import time
 import uuid
 from pathlib import Path, PurePosixPath
-from time import sleep
+from typing import Optional
 
 from paramiko import SSHException
 from scp import SCPException
 
-from .sshshell import SshShell
+from .sshshell import CommandResult, SshShell
 import pypga
 
 
@@ -17,26 +20,32 @@ class Server:
         (Path(__file__).parent.resolve() / "server").glob(f"{_servername}_*.*")
     )
     _destpath = PurePosixPath("/root/pypga")
+    # records the hash of the flashed bitstream, in a tmpfs that is cleared when the board reboots
+    _hashfile = PurePosixPath("/tmp/pypga_bitstream.sha256")
 
-    def run(self, command=""):
-        return self.shell.ask(command)
+    def run(self, command: str, timeout: float = None, check: bool = False) -> CommandResult:
+        return self.shell.execute(command, timeout=timeout, check=check)
 
     def put(self, src, dst):
         self.shell.scp.put(src, dst)
 
-    def __init__(self, host, port=2222, delay=0.05, bitstreamfile=None, start=True):
+    def __init__(
+        self, host, port=2222, delay=0.05, bitstreamfile=None, start=True, startup_timeout=5.0
+    ):
         self._delay = delay
+        self.host = host
         self.port = port
+        self.startup_timeout = startup_timeout
         self.shell = SshShell(
             hostname=host,
             sshport=22,
             user=pypga.config.user,
             password=pypga.config.password,
             delay=delay,
+            shell=False,
         )
         self.stop()
-        self.run(f"mkdir {self._destpath}")
-        self.run(f"cd {self._destpath}")
+        self.run(f"mkdir -p {self._destpath}", check=True)
         if bitstreamfile is not None:
             self.flash_bitstream(bitstreamfile)
         if start:
@@ -44,65 +53,86 @@ class Server:
 
     def stop(self):
         self.token = None
-        self.run("\x03")  # exit running server application
-        self.run("killall server")  # make sure no other server blocks the port
+        # make sure no other server blocks the port, fails harmlessly if none is running
+        self.run(f"killall {self._servername}")
 
     @property
-    def bitstream_flashed_recently(self) -> bool:
-        destpath = self._destpath / self._bitstreamname
-        self.run("")  # flush output
-        result = self.run(f'echo $(($(date +%s) - $(date +%s -r "{destpath}")))')
-        for line in result.split("\n"):
-            try:
-                age = int(line.strip())
-            except ValueError:
-                pass
-            else:
-                break
-        else:
-            logging.debug(f"Could not retrieve bitstream file age from: {result}")
-            return False
-        if age > 10:
-            logging.debug(f"Found expired bitstream file with an age of {age} seconds.")
-            return False
-        else:
-            logging.debug(
-                f"Found a recent bitstream file with an age of {age} seconds."
-            )
-            return True
+    def loaded_bitstream_hash(self) -> Optional[str]:
+        """The hash of the bitstream that was last flashed with :meth:`flash_bitstream`, or None if unknown."""
+        result = self.run(f"cat {self._hashfile}")
+        bitstream_hash = result.stdout.strip()
+        if result.ok and re.fullmatch(r"[0-9a-f]{64}", bitstream_hash):
+            return bitstream_hash
+        return None
+
+    def flash_bitstream(self, filename: str, bitstream_hash: str = None, force: bool = False) -> bool:
+        """
+        Flashes the bitstream ``filename`` and returns whether it was flashed.
 
-    def flash_bitstream(self, filename: str):
+        If ``bitstream_hash`` is given, it is recorded on the board, and unless
+        ``force`` is True, the bitstream is neither uploaded nor flashed if the
+        recorded hash shows that the board already runs it. The recorded hash
+        is only a hint, since other tools can flash the FPGA without updating it.
+        """
+        if not force and bitstream_hash is not None and bitstream_hash == self.loaded_bitstream_hash:
+            logging.info("The board already runs the requested bitstream.")
+            return False
         destpath = str(self._destpath / self._bitstreamname)
         self.put(filename, destpath)
         self.stop()
-        #self.run("killall nginx")
-        #self.run("systemctl stop redpitaya_nginx")
-        self.run(f"cat {destpath} > //dev//xdevcfg")
-        self.shell.ask(f"rm -f {destpath}")  # clean up the bitstream
+        # the recorded hash is invalid during flashing
+        self.run(f"rm -f {self._hashfile}", check=True)
+        try:
+            # returns when the configuration of the FPGA is complete
+            self.run(f"cat {destpath} > /dev/xdevcfg", timeout=60.0, check=True)
+        finally:
+            self.run(f"rm -f {destpath}")  # clean up the bitstream
+        if bitstream_hash is not None:
+            self.run(f"echo {bitstream_hash} > {self._hashfile}", check=True)
+        return True
 
     def generate_new_token(self) -> str:
         self.token = str(uuid.uuid4().hex)
         return self.token
 
+    def _runs_on_board(self, destpath) -> bool:
+        """Returns whether the server binary at ``destpath`` can be executed on the board."""
+        # without arguments, the server exits with status 1 and an error message, while
+        # the shell returns 126 or 127 for a binary of the wrong architecture or C library
+        result = self.run(str(destpath))
+        return result.exit_status == 1 and "ERROR" in result.stderr
+
+    def _wait_for_port(self) -> bool:
+        """Returns whether the server accepts connections within ``startup_timeout`` seconds."""
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=1.0):
+                    return True
+            except OSError:
+                if time.monotonic() > deadline:
+                    return False
+                time.sleep(0.01)
+
     def start(self) -> str:
-        destpath = str(self._destpath / "server")
-        if self.bitstream_flashed_recently:
-            logging.info("FPGA is being flashed. Waiting for 2 seconds.")
-            sleep(2.0)
+        destpath = self._destpath / self._servername
         for serverfile in self._srcfiles:
             try:
-                self.shell.scp.put(serverfile, destpath)
+                self.put(serverfile, str(destpath))
             except (SCPException, SSHException):
                 logging.warning("Upload error.", exc_info=True)
-            self.run(f"chmod 755 {destpath}")
-            result = self.run(f"{destpath} {self.port} {self.generate_new_token()}")
-            sleep(self._delay)
-            result += self.run()
-            if not "sh" in result:
+                continue
+            self.run(f"chmod 755 {destpath}", check=True)
+            if not self._runs_on_board(destpath):
+                # we tried the wrong binary version, try again with the next file
+                logging.debug(f"Server binary {serverfile.name} does not run on the board.")
+                continue
+            token = self.generate_new_token()
+            self.run(f"nohup {destpath} {self.port} {token} > /dev/null 2>&1 &", check=True)
+            if self._wait_for_port():
                 logging.debug(f"Server application started on port {self.port}")
                 break
-            else:  # we tried the wrong binary version. make sure server is not running and try again with next file
-                self.stop()
+            self.stop()
         else:
             raise RuntimeError(
                 f"Server application could not be started with any of {[f for f in self._srcfiles]}."
@@ -19,16 +19,33 @@ closes the connection. If the right token was sent, the following protocol is
 executed indefinitely.
 
 The client sends 8 bytes of data:
-- Byte 1 is interpreted as a character: 'r' for read and 'w' for write, and 'c' for close.
-  All other messages are ignored.
+- Byte 1 is interpreted as a character: 'r' for read, 'w' for write, 'R' and 'W' for
+  reading and writing array registers from a given start index, 'b' and 'B' for reading
+  and writing blocks of consecutive addresses, 'd' for reading from the dedicated RAM
+  area, 'm' for a batch of single-register operations, and 'c' for close. All other
+  messages terminate the connection.
 - Byte 2 is reserved.
 - Bytes 3+4 are interpreted as unsigned int. This number n is the amount of 4-byte-units
   to be read or written. The maximum is 2^16 blocks of 4 bytes each.
-- Bytes 5-8 are the start address to be written to or read from.
+- Bytes 5-8 are the start address to be written to or read from. Valid addresses lie
+  within 0x40000000 to 0x40800000 (AXI GP0) or 0x80000000 to 0x80800000 (CSR bus).
+  Both windows are memory-mapped once per client connection.
 
 - If the command is read, the server will then send the requested 4*n bytes to the client.
 - If the command is write, the server will wait for 4*n bytes of data from the server and
   write them to the designated FPGA address space.
+- If the command is 'R' or 'W', the header is followed by a 4-byte start index i0. The
+  n elements of the array register with indices i0 to i0+n-1 are then read or written
+  as for 'r' and 'w', which always start at index 0. This allows to transfer arrays
+  with more than 2^16 elements in chunks.
+- If the command is 'b' or 'B', the n 4-byte-units are read from or written to the n
+  consecutive addresses starting at the given address, e.g. a memory-mapped array register.
+- If the command is batch, bytes 3+4 are the number n of operations and bytes 5-8 are
+  ignored. The server then waits for n entries of three 4-byte-units each: the operation
+  ('r' or 'w'), the register address and the value to write (ignored for reads). All
+  operations are executed in the given order and the server sends back the 8-byte header
+  followed by one 4-byte-unit per operation: the read value, or the written value.
+  The maximum is MAX_BATCH_LENGTH operations per command.
 - If the command is close, or if the connection is broken, the server program will terminate.
 
 After this, the server will wait for the next command. 
@@ -58,13 +75,8 @@ void error(const char *msg);
 #define FATAL do { fprintf(stderr,"Error at line %d, file %s (%d) [%s]\n", __LINE__, __FILE__, errno, strerror(errno)); \
 									error("FATAL ERROR"); exit(1); } while(0)
  
-//#define MAP_SIZE 4096UL
-//#define MAP_SIZE 65536UL
-#define MAP_SIZE 131072UL
-//allowed address space: 0x40000000 to 0x40800000 has size 0x800000 = 128*65536 = 8388608
-//#define MAP_SIZE 8388608UL
-#define MAP_MASK (MAP_SIZE - 1)
 #define MAX_LENGTH 65535
+#define MAX_BATCH_LENGTH (MAX_LENGTH / 3)
 
 #define DEBUG_MONITOR 0
 
@@ -75,12 +87,27 @@ void error(const char *msg);
 
 unsigned long read_value(unsigned long a_addr);
 unsigned long* read_values(unsigned long a_addr, unsigned long* a_values_buffer, unsigned long a_len);
+unsigned long* read_array_values(unsigned long a_addr, unsigned long a_start, unsigned long* a_values_buffer, unsigned long a_len);
 void write_value(unsigned long a_addr, unsigned long a_value);
 void write_values(unsigned long a_addr, unsigned long* a_values, unsigned long a_len);
-
-//FPGA memory handlers
-void* map_base = (void*)(-1);
-int fd = -1;
+void write_array_values(unsigned long a_addr, unsigned long a_start, unsigned long* a_values, unsigned long a_len);
+void batch_values(unsigned long* a_entries, unsigned long a_len);
+unsigned long* read_block_values(unsigned long a_addr, unsigned long* a_values_buffer, unsigned long a_len);
+void write_block_values(unsigned long a_addr, unsigned long* a_values, unsigned long a_len);
+
+//FPGA memory handlers: the CSR address windows are mapped once per client connection
+typedef struct {
+    unsigned long start;
+    unsigned long size;
+    void* base;
+} map_window_t;
+
+#define MAP_WINDOWS 2
+map_window_t map_windows[MAP_WINDOWS] = {
+    {0x40000000UL, 0x800000UL, (void*)(-1)},  // m_axi_gp0: 0x40000000 to 0x40800000
+    {0x80000000UL, 0x800000UL, (void*)(-1)},  // m_axi_gp1: CSR bus starting at 0x80000000
+};
+int map_fd = -1;
 
 //sockets are globally defined for error handling
 int sockfd;
@@ -88,32 +115,113 @@ int newsockfd;
 
 //open and close memory mapping to FPGA registers
 void open_map_base() {
-    int addr = 0x40000000;
-    if((fd = open("/dev/mem", O_RDWR | O_SYNC)) == -1) FATAL;
-    map_base = mmap(0, MAP_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED, fd, addr & ~MAP_MASK);
-	if(map_base == (void *) -1) FATAL;
+    int i;
+    if((map_fd = open("/dev/mem", O_RDWR | O_SYNC)) == -1) FATAL;
+    for (i = 0; i < MAP_WINDOWS; i++) {
+        map_windows[i].base = mmap(0, map_windows[i].size, PROT_READ | PROT_WRITE, MAP_SHARED, map_fd, map_windows[i].start);
+        if(map_windows[i].base == (void *) -1) FATAL;
+    }
+}
+
+void close_map_base() {
+    int i;
+    for (i = 0; i < MAP_WINDOWS; i++) {
+        if (map_windows[i].base != (void*)(-1)) {
+            if(munmap(map_windows[i].base, map_windows[i].size) == -1) FATAL;
+            map_windows[i].base = (void*)(-1);
+        }
+    }
+    if (map_fd != -1) {
+        close(map_fd);
+        map_fd = -1;
+    }
+}
+
+//translate a physical FPGA address into the persistent mapping
+volatile unsigned long* virtual_address(unsigned long a_addr) {
+    int i;
+    for (i = 0; i < MAP_WINDOWS; i++) {
+        if (a_addr >= map_windows[i].start && a_addr - map_windows[i].start < map_windows[i].size)
+            return (volatile unsigned long*)(map_windows[i].base + (a_addr - map_windows[i].start));
+    }
+    error("ERROR address outside of the mapped FPGA address space");
+    return NULL;
 }
 
-/*
 //basic read and write operations
 unsigned long* read_values(unsigned long a_addr, unsigned long* a_values_buffer, unsigned long a_len) {
-	unsigned long* virt_addr = map_base + (a_addr & MAP_MASK);
-	unsigned long i;
-	printf("address to read %d",(int)a_addr);
-	for (i = 0; i < a_len; i++) {;
-		a_values_buffer[i] = virt_addr[i];
-	}
-	return a_values_buffer;
+    volatile unsigned long* virt_addr = virtual_address(a_addr);
+    unsigned long i;
+    if (a_len > 1) for (i = 0; i < a_len; i++) {
+        virt_addr[0] = (i << 1) | 1;
+        a_values_buffer[i] = virt_addr[0];
+    }
+    else a_values_buffer[0] = virt_addr[0];
+    return a_values_buffer;
 }
 
 void write_values(unsigned long a_addr, unsigned long* a_values, unsigned long a_len) {
-	void* virt_addr = map_base + (a_addr & MAP_MASK);
-	unsigned long i;
-	for (i = 0; i < a_len; i++) {
-		((unsigned long *) virt_addr)[i] = a_values[i];
-	}
+    volatile unsigned long* virt_addr = virtual_address(a_addr);
+    unsigned long i;
+    if (a_len > 1) for (i = 0; i < a_len; i++) {
+        virt_addr[0] = (i << 1) | 1;
+        virt_addr[0] = a_values[i] << 1;
+    }
+    else virt_addr[0] = a_values[0];
+}
+
+//array register access: write (index << 1) | 1 to select an element, then read or write (value << 1)
+unsigned long* read_array_values(unsigned long a_addr, unsigned long a_start, unsigned long* a_values_buffer, unsigned long a_len) {
+    volatile unsigned long* virt_addr = virtual_address(a_addr);
+    unsigned long i;
+    for (i = 0; i < a_len; i++) {
+        virt_addr[0] = ((a_start + i) << 1) | 1;
+        a_values_buffer[i] = virt_addr[0];
+    }
+    return a_values_buffer;
+}
+
+void write_array_values(unsigned long a_addr, unsigned long a_start, unsigned long* a_values, unsigned long a_len) {
+    volatile unsigned long* virt_addr = virtual_address(a_addr);
+    unsigned long i;
+    for (i = 0; i < a_len; i++) {
+        virt_addr[0] = ((a_start + i) << 1) | 1;
+        virt_addr[0] = a_values[i] << 1;
+    }
+}
+
+//block access to consecutive addresses, e.g. memories mapped onto the CSR bus
+unsigned long* read_block_values(unsigned long a_addr, unsigned long* a_values_buffer, unsigned long a_len) {
+    volatile unsigned long* virt_addr = virtual_address(a_addr);
+    unsigned long i;
+    if (a_len > 1) virtual_address(a_addr + 4 * (a_len - 1));  // check that the whole block is mapped
+    for (i = 0; i < a_len; i++) a_values_buffer[i] = virt_addr[i];
+    return a_values_buffer;
+}
+
+void write_block_values(unsigned long a_addr, unsigned long* a_values, unsigned long a_len) {
+    volatile unsigned long* virt_addr = virtual_address(a_addr);
+    unsigned long i;
+    if (a_len > 1) virtual_address(a_addr + 4 * (a_len - 1));  // check that the whole block is mapped
+    for (i = 0; i < a_len; i++) virt_addr[i] = a_values[i];
+}
+
+//execute a list of (operation, address, value) entries in place, leaving one result per entry
+void batch_values(unsigned long* a_entries, unsigned long a_len) {
+    unsigned long i, operation, address, value;
+    volatile unsigned long* virt_addr;
+    for (i = 0; i < a_len; i++) {
+        operation = a_entries[3 * i];
+        address = a_entries[3 * i + 1];
+        value = a_entries[3 * i + 2];
+        virt_addr = virtual_address(address);
+        if (operation == 'r') value = virt_addr[0];
+        else if (operation == 'w') virt_addr[0] = value;
+        else error("ERROR unknown batch operation - server and client out of sync");
+        // entry i occupies words 3*i to 3*i+2, so the result can safely overwrite word i
+        a_entries[i] = value;
+    }
 }
-*/
 
 /* server process and error handling */
 
@@ -131,6 +239,7 @@ int main(int argc, char *argv[])
      int pid;  // forked child process id
 	 unsigned int data_length;
 	 unsigned long address;
+	 unsigned long start_index;
      socklen_t clilen;
 
      char data_buffer[8+sizeof(unsigned long)*MAX_LENGTH];
@@ -223,6 +332,8 @@ int main(int argc, char *argv[])
              n = send(newsockfd,(void*)("11111111111111111111111111111111"),32,0);
              if (n < 0) error("ERROR writing to socket");
              if (n != 32) error("ERROR wrote incorrect number of bytes to socket");
+             //map the FPGA address space once for the lifetime of this connection
+             open_map_base();
 
              for(;;)
              {   //service loop
@@ -275,19 +386,64 @@ int main(int argc, char *argv[])
                     n=send(newsockfd,buffer,8,0);
                     if (n != 8) error("ERROR control sequence mirror incorrectly transmitted");
                  }
+                 else if (buffer[0] == 'R' || buffer[0] == 'W') { //array register access from a start index
+                    n = recv(newsockfd,(void*)&start_index,sizeof(unsigned long),MSG_WAITALL);
+                    if (n != sizeof(unsigned long)) error("ERROR reading start index from socket");
+                    if (buffer[0] == 'R') {
+                        read_array_values(address, start_index, rw_buffer, data_length);
+                        n = send(newsockfd,(void*)data_buffer,data_length*sizeof(unsigned long)+8,0);
+                        if (n < 0) error("ERROR writing to socket");
+                        if (n != data_length*sizeof(unsigned long)+8) error("ERROR wrote incorrect number of bytes to socket");
+                    }
+                    else {
+                        n = recv(newsockfd,(void*)rw_buffer,data_length*sizeof(unsigned long),MSG_WAITALL);
+                        if (n < 0) error("ERROR reading from socket");
+                        if (n != data_length*sizeof(unsigned long)) error("ERROR read incorrect number of bytes to socket");
+                        write_array_values(address, start_index, rw_buffer, data_length);
+                        n=send(newsockfd,buffer,8,0);
+                        if (n != 8) error("ERROR control sequence mirror incorrectly transmitted");
+                    }
+                 }
+                 else if (buffer[0] == 'b') { //read a block of consecutive addresses
+                    read_block_values(address, rw_buffer, data_length);
+                    n = send(newsockfd,(void*)data_buffer,data_length*sizeof(unsigned long)+8,0);
+                    if (n < 0) error("ERROR writing to socket");
+                    if (n != data_length*sizeof(unsigned long)+8) error("ERROR wrote incorrect number of bytes to socket");
+                 }
+                 else if (buffer[0] == 'B') { //write a block of consecutive addresses
+                    n = recv(newsockfd,(void*)rw_buffer,data_length*sizeof(unsigned long),MSG_WAITALL);
+                    if (n < 0) error("ERROR reading from socket");
+                    if (n != data_length*sizeof(unsigned long)) error("ERROR read incorrect number of bytes to socket");
+                    write_block_values(address, rw_buffer, data_length);
+                    n=send(newsockfd,buffer,8,0);
+                    if (n != 8) error("ERROR control sequence mirror incorrectly transmitted");
+                 }
+                 else if (buffer[0] == 'm') { //batch of single-register operations
+                    if (data_length > MAX_BATCH_LENGTH) error("ERROR batch length exceeds the maximum");
+                    n = recv(newsockfd,(void*)rw_buffer,3*data_length*sizeof(unsigned long),MSG_WAITALL);
+                    if (n < 0) error("ERROR reading from socket");
+                    if (n != 3*data_length*sizeof(unsigned long)) error("ERROR read incorrect number of bytes from socket");
+                    batch_values(rw_buffer, data_length);
+                    n = send(newsockfd,(void*)data_buffer,data_length*sizeof(unsigned long)+8,0);
+                    if (n < 0) error("ERROR writing to socket");
+                    if (n != data_length*sizeof(unsigned long)+8) error("ERROR wrote incorrect number of bytes to socket");
+                 }
                  else if (buffer[0] == 'c') break; //close program
                  else error("ERROR unknown control character - server and client out of sync"); //if an unknown control sequence is received, terminate for security reasons
              }
              //close the socket
              close(newsockfd);
              close(sockfd);
+
+             // de-initialize FPGA register access
+             close_map_base();
              
              // de-initialize RAM access
              if (ram_base != (void*)(-1)) {
                  if(munmap(ram_base, RAM_SIZE) == -1) FATAL;
                  ram_base = (void*)(-1);
              }
-             if (ram_fd != -1) close(fd);
+             if (ram_fd != -1) close(ram_fd);
              // end de-initialize RAM access
              
              return 0;
@@ -295,52 +451,3 @@ int main(int argc, char *argv[])
      }
 }
 
-
-// old version with steady reinstantiation of mmap (slow)
-unsigned long* read_values(unsigned long a_addr, unsigned long* a_values_buffer, unsigned long a_len) {
-    int fd = -1;
-    if((fd = open("/dev/mem", O_RDWR | O_SYNC)) == -1) FATAL;
-    map_base = mmap(0, MAP_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED, fd, a_addr & ~MAP_MASK);
-	if(map_base == (void *) -1) FATAL;
-	
-	void* virt_addr = map_base + (a_addr & MAP_MASK);
-	unsigned long i;
-    if (a_len > 1) for (i = 0; i < a_len; i++) {
-        ((unsigned long *) virt_addr)[0] = (i << 1) | 1;
-        a_values_buffer[i] = ((unsigned long*) virt_addr)[0];
-    }
-    else a_values_buffer[0] = ((unsigned long*) virt_addr)[0];
-    
-	if (map_base != (void*)(-1)) {
-		if(munmap(map_base, MAP_SIZE) == -1) FATAL;
-		map_base = (void*)(-1);
-	}
-	if (fd != -1) {
-		close(fd);
-	}
-	return a_values_buffer;
-}
-
-void write_values(unsigned long a_addr, unsigned long* a_values, unsigned long a_len) {
-    int fd = -1;
-    if((fd = open("/dev/mem", O_RDWR | O_SYNC)) == -1) FATAL;
-    map_base = mmap(0, MAP_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED, fd, a_addr & ~MAP_MASK);
-	if(map_base == (void *) -1) FATAL;
-	
-	void* virt_addr = map_base + (a_addr & MAP_MASK);
-	unsigned long i;
-
-	if (a_len > 1) for (i = 0; i < a_len; i++) {
-        ((unsigned long *) virt_addr)[0] = (i << 1) | 1;
-        ((unsigned long *) virt_addr)[0] = a_values[i] << 1;
-    }
-	else ((unsigned long *) virt_addr)[0] = a_values[0];
-	
-	if (map_base != (void*)(-1)) {
-		if(munmap(map_base, MAP_SIZE) == -1) FATAL;
-		map_base = (void*)(-1);
-	}
-	if (fd != -1) {
-		close(fd);
-	}
-}
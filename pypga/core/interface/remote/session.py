@@ -0,0 +1,99 @@
+import atexit
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .server import Server
+
+logger = logging.getLogger(__name__)
+
+
+class Session:
+    """
+    The SSH connection and register server of one board.
+
+    A session is shared by all designs that run on the board within one
+    process. It only flashes a bitstream that differs from the one the board
+    runs, and only restarts the register server when flashing stopped it.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.server = Server(host=host, start=False)
+        self.bitstream_hash = None
+        # called without arguments after a bitstream was flashed
+        self.flash_callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        transport = self.server.shell.ssh.get_transport()
+        return transport is not None and transport.is_active()
+
+    def load(self, bitstreamfile: Path, force: bool = False) -> str:
+        """
+        Makes sure the board runs ``bitstreamfile`` and the register server, and returns the server token.
+
+        With ``force``, the bitstream is flashed even if the board is known to run it.
+        """
+        with self._lock:
+            bitstream_hash = hashlib.sha256(Path(bitstreamfile).read_bytes()).hexdigest()
+            if force or bitstream_hash != self.bitstream_hash:
+                if self.server.flash_bitstream(
+                    bitstreamfile, bitstream_hash=bitstream_hash, force=force
+                ):
+                    for callback in list(self.flash_callbacks):
+                        callback()
+                self.bitstream_hash = bitstream_hash
+            else:
+                logger.debug("Bitstream already flashed on %s.", self.host)
+            if self.server.token is None:
+                self.server.start()
+            return self.server.token
+
+    def close(self):
+        """Stops the register server and closes the SSH connection."""
+        with self._lock:
+            self.bitstream_hash = None
+            try:
+                self.server.stop()
+            finally:
+                self.server.shell.ssh.close()
+
+
+class SessionPool:
+    """Keeps one open :class:`Session` per host."""
+
+    def __init__(self):
+        self._sessions: Dict[str, Session] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> Session:
+        """Returns the session of ``host``, and opens a new one if there is none or it was disconnected."""
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        # sessions with different hosts can be opened in parallel
+        with host_lock:
+            session = self._sessions.get(host)
+            if session is None or not session.alive:
+                logger.debug("Opening a new session with %s.", host)
+                session = self._sessions[host] = Session(host)
+            return session
+
+    def close(self, host: str = None):
+        """Closes the session of ``host``, or all sessions if ``host`` is None."""
+        with self._lock:
+            hosts = list(self._sessions) if host is None else [host]
+            sessions = [self._sessions.pop(h) for h in hosts if h in self._sessions]
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                logger.warning(f"Error upon closing the session with {session.host}.", exc_info=True)
+
+
+sessions = SessionPool()
+atexit.register(sessions.close)
@@ -19,11 +19,38 @@
 
 import logging
 from time import sleep
+from typing import NamedTuple
 
 import paramiko
 from scp import SCPClient
 
 
+class CommandError(RuntimeError):
+    """A command executed with :meth:`SshShell.execute` failed."""
+
+
+class CommandResult(NamedTuple):
+    """The outcome of a command executed with :meth:`SshShell.execute`."""
+
+    command: str
+    exit_status: int
+    stdout: str
+    stderr: str
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_status == 0
+
+    def check(self) -> "CommandResult":
+        """Returns the result, or raises a :class:`CommandError` if the command failed."""
+        if not self.ok:
+            raise CommandError(
+                f"Command {self.command!r} failed with exit status {self.exit_status}: "
+                f"{self.stderr.strip()}"
+            )
+        return self
+
+
 class SshShell(object):
     """This is a wrapper around paramiko.SSHClient and scp.SCPClient
     I provides a ssh connection with the ability to transfer files over it"""
@@ -64,6 +91,31 @@ class SshShell(object):
     def startscp(self):
         self.scp = SCPClient(self.ssh.get_transport())
 
+    def execute(self, command: str, timeout: float = None, check: bool = False) -> CommandResult:
+        """
+        Executes ``command`` in a new channel and waits for it to finish.
+
+        Unlike :meth:`ask`, this does not depend on the interactive shell,
+        and returns the exit status and the complete output of the command.
+
+        Args:
+            command: the shell command to execute.
+            timeout: the maximum time in seconds to wait for output, by default ``self.timeout``.
+            check: if True, raise a :class:`CommandError` if the exit status is not zero.
+        """
+        stdin, stdout, stderr = self.ssh.exec_command(
+            command, timeout=self.timeout if timeout is None else timeout
+        )
+        stdin.close()
+        # read the output before waiting for the exit status, such that a full buffer cannot block the command
+        out = stdout.read().decode("utf-8", errors="replace")
+        err = stderr.read().decode("utf-8", errors="replace")
+        result = CommandResult(command, stdout.channel.recv_exit_status(), out, err)
+        self._logger.debug("%s", result)
+        if check:
+            result.check()
+        return result
+
     def write(self, text):
         if self.channel.send_ready() and not text == "":
             return self.channel.send(text)
@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+class ShadowCache:
+    """
+    Local copies of the register values of one interface.
+
+    Writes always go to the board and update the copy. Reads of writable
+    registers are served from the copy once the value is known, since only
+    Python can change them. Read-only registers are changed by the design,
+    so their copies are used for at most ``max_age`` seconds.
+
+    Args:
+        max_age: how long in seconds the value of a read-only register may be
+          served from its copy. With the default of 0, read-only registers
+          are always read from the board.
+    """
+
+    def __init__(self, max_age: float = 0.0):
+        self.max_age = max_age
+        # key -> (value, time of the read, or None for values that do not expire)
+        self._values: Dict[Hashable, Tuple[object, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        return key in self._values
+
+    def invalidate(self, key: Hashable = None):
+        """Forgets the copy of the register ``key``, or of all registers if ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    def wrap(
+        self,
+        key: Hashable,
+        read: Callable,
+        write: Optional[Callable],
+        readonly: bool,
+        depth: int = 1,
+    ) -> Tuple[Callable, Optional[Callable]]:
+        """
+        Returns versions of the ``read`` and ``write`` functions of register ``key`` that use the cache.
+
+        Only writes of all ``depth`` values of an array register are cached,
+        since a partial write leaves the other values unknown.
+        """
+        if readonly and not self.max_age:
+            return read, write
+
+        def cached_read():
+            entry = self._values.get(key)
+            if entry is not None:
+                value, timestamp = entry
+                if timestamp is None or time.monotonic() - timestamp <= self.max_age:
+                    return value
+            value = read()
+            with self._lock:
+                self._values[key] = (value, time.monotonic() if readonly else None)
+            return value
+
+        if write is None:
+            return cached_read, None
+
+        def write_through(value):
+            result = write(value)
+            with self._lock:
+                if np.size(value) == depth:
+                    self._values[key] = (value, None)
+                else:
+                    self._values.pop(key, None)
+            return result
+
+        return cached_read, write_through
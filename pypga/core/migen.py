@@ -24,7 +24,7 @@ class AutoMigenModule(MigenModule, AutoCSR):
     """
 
     def __init__(self, module_class, platform: GenericPlatform, soc: typing.Any):
-        logger.debug(f"Creating migen module for module class {module_class.__name__}.")
+        logger.debug("Creating migen module for module class %s.", module_class.__name__)
         registers = module_class._pypga_registers
         logic_functions = module_class._pypga_logic
         submodules = module_class._pypga_submodules
@@ -43,10 +43,10 @@ class AutoMigenModule(MigenModule, AutoCSR):
         # finally add all the custom logic
         for name, logic_function in logic_functions.items():
             self._add_logic_function(logic_function, name, platform=platform, soc=soc)
-        logger.debug(f"Finished migen module for module class {module_class.__name__}.")
+        logger.debug("Finished migen module for module class %s.", module_class.__name__)
 
     def _add_submodule(self, submodule, name, platform, soc):
-        logger.debug(f"Creating submodule {name} of type {submodule.__name__}.")
+        logger.debug("Creating submodule %s of type %s.", name, submodule.__name__)
         migen_submodule = AutoMigenModule(submodule, platform, soc)
         setattr(self.submodules, name, migen_submodule)
         # TODO: remove the next line, it seems to be redundant as migen automatically does this
@@ -59,11 +59,11 @@ class AutoMigenModule(MigenModule, AutoCSR):
             register = (
                 register()
             )  # create a register instance to retrieve attributes in case a class was passed
-        logger.debug(f"Creating register {name} of type {register.__class__.__name__}.")
+        logger.debug("Creating register %s of type %s.", name, type(register).__name__)
         register._add_migen_commands(name=name, module=self)
 
     def _add_logic_function(self, logic_function, name, platform, soc):
-        logger.debug(f"Implementing logic from function {name}.")
+        logger.debug("Implementing logic from function %s.", name)
         try:
             return_value = logic_function(self, platform=platform, soc=soc)
         except TypeError:
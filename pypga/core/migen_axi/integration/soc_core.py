@@ -45,6 +45,8 @@ class SoCCore(Module):
 
         self.csr_devices = [
             "identifier",
+            # the memory of the identifier, read by the interface to check the design
+            "identifier_mem",
         ]
         self._memory_groups = []  # list of (group_name, (group_member0, group_member1, ...))
         self._csr_groups = []  # list of (group_name, (group_member0, group_member1, ...))
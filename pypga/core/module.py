@@ -1,10 +1,16 @@
+import asyncio
 import functools
+import hashlib
+import inspect
 import logging
 import typing
 from typing import Callable
 
+import numpy as np
+
 from .builder import get_builder
-from .interface import LocalInterface, RemoteInterface
+from .cache import hash_components
+from .interface import AsyncRemoteInterface, BaseInterface, LocalInterface, RemoteInterface
 from .logic_function import is_logic
 from .register import _Register
 
@@ -43,7 +49,7 @@ def scan_module_class(module_class) -> typing.Tuple[dict, dict, dict, dict]:
                     f"module definition."
                 )
             else:
-                logger.debug(f"Ignoring annotated type {name}: {value}.")
+                logger.debug("Ignoring annotated type %s: %s.", name, value)
     for name in dir(module_class):
         value = getattr(module_class, name)
         if is_logic(value):
@@ -60,14 +66,94 @@ def scan_module_class(module_class) -> typing.Tuple[dict, dict, dict, dict]:
     return registers, logic, submodules, other
 
 
+def _get_source(function) -> str:
+    """Returns the source code of a function, or its bytecode if the source is unavailable."""
+    try:
+        return inspect.getsource(function)
+    except (OSError, TypeError):
+        code = function.__code__
+        return code.co_code.hex() + repr(code.co_consts)
+
+
+def _fingerprint_value(value) -> typing.Any:
+    """Returns a JSON-serializable representation of a value that a design depends on."""
+    if isinstance(value, type) and issubclass(value, Module):
+        # a class that is still being defined has no hash yet
+        return vars(value).get("_hash", value.__qualname__)
+    if isinstance(value, np.ndarray):
+        return [str(value.dtype), value.shape, hashlib.sha256(value.tobytes()).hexdigest()]
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _fingerprint_value(v) for k, v in value.items()}
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if callable(value) and hasattr(value, "__code__"):
+        return _fingerprint_function(value)
+    return repr(value)
+
+
+def _fingerprint_function(function) -> dict:
+    """Returns the source code and the closure variables of a function."""
+    closure = function.__closure__ or ()
+    return dict(
+        source=_get_source(function),
+        closure={
+            name: _fingerprint_value(cell.cell_contents)
+            for name, cell in zip(function.__code__.co_freevars, closure)
+            # the cell of a function that refers to itself would recurse forever
+            if cell.cell_contents is not function
+        },
+    )
+
+
+def _fingerprint_register(register: _Register) -> dict:
+    """Returns the class name and all non-callable attributes of a register."""
+    attributes = {}
+    for cls in reversed(type(register).__mro__):
+        for name, value in vars(cls).items():
+            if not name.startswith("__") and not callable(value) and not isinstance(
+                value, (property, classmethod, staticmethod)
+            ):
+                attributes[name] = _fingerprint_value(value)
+    attributes.update(
+        {name: _fingerprint_value(value) for name, value in vars(register).items()}
+    )
+    return dict(type=type(register).__name__, attributes=attributes)
+
+
 def hash_module(module_class) -> str:
-    return "latest"
+    """
+    Returns a structural fingerprint of a module class.
+
+    The fingerprint covers the registers and their attributes, the source code
+    and closure variables of the logic functions, and the fingerprints of the
+    submodules. It is cheap to compute compared to converting the design to
+    Verilog, and is used to look up the full design hash of an existing build.
+    """
+    return hash_components(
+        dict(
+            name=module_class.__name__,
+            registers={
+                name: _fingerprint_register(inspect.getattr_static(module_class, name))
+                for name in module_class._pypga_registers
+            },
+            logic={
+                name: _fingerprint_function(function)
+                for name, function in module_class._pypga_logic.items()
+            },
+            submodules={
+                name: submodule._hash
+                for name, submodule in module_class._pypga_submodules.items()
+            },
+        )
+    )
 
 
 class Module:
     @classmethod
     def __init_subclass__(cls):
-        logger.debug(f"Running {cls}.__init_subclass__.")
+        logger.debug("Running %s.__init_subclass__.", cls)
         # 1. extract which registers and submodules are defined
         (
             cls._pypga_registers,
@@ -102,14 +188,21 @@ class Module:
     def _init_module(self, name, parent, interface):
         """Initializes the pypga module hierarchy before the actual constructor is called."""
         if hasattr(self, "_parent") and hasattr(self, "_interface"):
-            logger.debug(f"Skipping {self}._init_module because it has already run.")
+            logger.debug("Skipping %s._init_module because it has already run.", self)
             return
         logger.debug(
-            f"Running {self}._init_module(self={self}, parent={parent}, interface={interface})."
+            "Running %s._init_module(parent=%s, interface=%s).", self, parent, interface
         )
         self._name = name
         self._parent = parent
         self._interface = interface
+        if isinstance(interface, BaseInterface):
+            # resolve register addresses once instead of on every access
+            self._pypga_access = {}
+            for name in self._pypga_registers:
+                plan = getattr(type(self), name)._make_access_plan(self)
+                if plan is not None:
+                    self._pypga_access[name] = plan
         for name, submodule_cls in self._pypga_submodules.items():
             setattr(
                 self, name, submodule_cls(name=name, parent=self, interface=interface)
@@ -168,7 +261,48 @@ class TopModule(Module):
         forcebuild=False,
         **kwargs,
     ):
-        """Runs the design on a board and returns an interfaced instance."""
+        """
+        Runs the design on a board and returns an interfaced instance.
+
+        If ``host`` is None, the design is simulated instead, which requires
+        neither a build nor a board.
+        """
+        if host is None:
+            interface = LocalInterface(cls, board=board)
+        else:
+            builder = cls._get_built_builder(board, autobuild, forcebuild)
+            interface = RemoteInterface(host=host, result_path=builder.result_path)
+        return cls(*args, interface=interface, **kwargs)
+
+    @classmethod
+    async def run_async(
+        cls,
+        *args,
+        host,
+        board=DEFAULT_BOARD,
+        autobuild=True,
+        forcebuild=False,
+        **kwargs,
+    ):
+        """
+        Runs the design on a board and returns an asynchronously interfaced instance.
+
+        Reading a register of the returned instance yields an awaitable, and
+        register writes are sent without waiting for their acknowledgement.
+        Use ``await instance._interface.drain()`` to wait for all pending requests.
+        """
+        builder = cls._get_built_builder(board, autobuild, forcebuild)
+        interface = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                AsyncRemoteInterface, host=host, result_path=builder.result_path
+            ),
+        )
+        await interface.start()
+        return cls(*args, interface=interface, **kwargs)
+
+    @classmethod
+    def _get_built_builder(cls, board, autobuild, forcebuild):
         builder = get_builder(board=board, module_class=cls)
         if forcebuild or not builder.result_exists:
             if autobuild or forcebuild:
@@ -178,11 +312,9 @@ class TopModule(Module):
                     "The design you are trying to instantiate must be built first. Try "
                     "running this function call with the argument ``autobuild=True``."
                 )
-        if host is None:
-            interface = LocalInterface(result_path=builder.result_path)
         else:
-            interface = RemoteInterface(host=host, result_path=builder.result_path)
-        return cls(*args, interface=interface, **kwargs)
+            builder.use_results()
+        return builder
 
     def stop(self):
         self._interface.stop()
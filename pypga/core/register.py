@@ -1,5 +1,7 @@
 import functools
+import inspect
 import logging
+from typing import Callable, NamedTuple, Optional
 
 import numpy as np
 from misoc.interconnect.csr import CSRStatus, CSRStorage
@@ -7,9 +9,66 @@ from misoc.interconnect.csr import CSRStatus, CSRStorage
 from migen import If, Memory, Signal
 
 from .common import CustomizableMixin
+from .instrumentation import instrumentation
 
 logger = logging.getLogger(__name__)
 
+
+def _convert(value, function):
+    """Returns ``function(value)``, or an awaitable thereof if ``value`` is awaitable."""
+    if inspect.isawaitable(value):
+        return _await_and_convert(value, function)
+    return function(value)
+
+
+async def _await_and_convert(value, function):
+    return function(await value)
+
+
+def unpack_ram_words(words, samples_per_word: int = 1) -> np.ndarray:
+    """
+    Returns the samples stored in an array of uint32 words read from RAM.
+
+    Each 64-bit word in RAM, i.e. each pair of uint32 words, holds
+    ``samples_per_word`` samples in lanes of ``64 // samples_per_word``
+    bits, starting with the least significant lane. For a single sample
+    per word, only its 32 least significant bits are returned.
+
+    The result is a view of ``words`` with unsigned lane values where possible.
+    """
+    words = np.ascontiguousarray(words, dtype="<u4")
+    if samples_per_word == 1:
+        return words[::2]
+    elif samples_per_word == 2:
+        return words
+    elif samples_per_word == 4:
+        return words.view("<u2")
+    raise ValueError(f"samples_per_word must be one of [1, 2, 4], not {samples_per_word}.")
+
+
+def _saturate(value: np.ndarray, min, max, name: str) -> np.ndarray:
+    """Clips ``value`` to ``[min, max]`` and logs a warning if any element was saturated."""
+    if max is not None and np.any(value > max):
+        value = np.minimum(value, max)
+        logger.warning(f"Positive saturation for {name}")
+    if min is not None and np.any(value < min):
+        value = np.maximum(value, min)
+        logger.warning(f"Negative saturation for {name}")
+    return value
+
+
+class _AccessPlan(NamedTuple):
+    """The interface calls for one register of one module instance, with its address resolved in advance."""
+
+    read: Callable
+    to_python: Callable
+    write: Optional[Callable]
+    from_python: Optional[Callable]
+
+
+_NO_ACCESS_PLANS = {}
+
+
 class _Register(CustomizableMixin):
     def _add_migen_commands(self, name, module):
         name_csr = f"{name}_csr"
@@ -40,39 +99,27 @@ class _Register(CustomizableMixin):
             if self.default is None:
                 initial_data = [0] * self.depth
             else:
-                initial_data = [
-                    self.from_python(self.before_from_python(v)) for v in self.default
-                ]
-            if self.reverse:
-                initial_data = reversed(initial_data)
-            memory = Memory(width=self.width, depth=self.depth, init=initial_data)
+                initial_data = [int(v) for v in self._array_from_python(self.default)]
+            if self.memory_mapped:
+                if self.width > 32:
+                    raise ValueError(
+                        f"Memory-mapped register {name} must not be wider than the 32-bit CSR bus."
+                    )
+                memory = Memory(
+                    width=self.width, depth=self.depth, init=initial_data, name=f"{name}_memory"
+                )
+                # the SoC maps the memory onto the CSR bus with its own port, such that the
+                # PS can access consecutive values with consecutive addresses
+                memory.pypga_memory_mapped = True
+                memory.bus_read_only = self.readonly
+            else:
+                memory = Memory(width=self.width, depth=self.depth, init=initial_data)
             setattr(module.specials, f"{name}_memory", memory)
-            ps_port = memory.get_port(
-                write_capable=not self.readonly, we_granularity=False
-            )
-            setattr(module.specials, f"{name}_memory_ps_port", ps_port)
+            if not self.memory_mapped:
+                self._add_memory_csr(name, module, memory)
             # add a port for the PL to write to the memory, otherwise having a this memory would be pointless
             pl_port = memory.get_port(write_capable=self.readonly, we_granularity=False)
             setattr(module.specials, f"{name}_memory_pl_port", pl_port)
-            # one extra bit of width for controlling the index of the memory (LSB high = modify index)
-            csr_instance = CSRStorage(
-                size=self.width + 1, reset=0, name=name_csr, write_from_dev=True
-            )
-            setattr(module, name_csr, csr_instance)
-            # PS writing the value ``(index << 1) + 1`` to the register triggers updates the index of the memory
-            update_index = Signal()
-            module.comb += update_index.eq(csr_instance.re & csr_instance.storage[0])
-            # update index as requested by the PS (LSB is control bit, so ignored for the address)
-            module.sync += If(
-                update_index == 1, ps_port.adr.eq(csr_instance.storage[1:])
-            )
-            # PL writes the data at the new index to the register so it can be read by the PS, with ``delay`` cycles delay
-            delay = 2
-            we_pipeline = Signal(delay)
-            module.sync += we_pipeline[0].eq(update_index)
-            module.sync += we_pipeline[1:].eq(we_pipeline[:-1])
-            module.sync += csr_instance.we.eq(we_pipeline[-1])
-            module.comb += csr_instance.dat_w.eq(ps_port.dat_r)
             if self.readonly:
                 # add signals to the migen module to write to the memory from the PL
                 setattr(module, name, pl_port.dat_w)
@@ -80,18 +127,46 @@ class _Register(CustomizableMixin):
                 setattr(module, f"{name}_index", pl_port.adr)
                 setattr(module, f"{name}_we", pl_port.we)
             else:
-                # write to the memory when new values are sent by the PS, indicated by LSB being low
-                update_value = Signal()
-                module.comb += update_value.eq(
-                    csr_instance.re & ~csr_instance.storage[0]
-                )
-                # the index has already been set by the PS at this point, so we only have to update the memory
-                module.sync += ps_port.dat_w.eq(csr_instance.storage[1:])
-                module.sync += ps_port.we.eq(update_value)
                 # add signals to the migen module to read from the memory from the PL
                 module.comb += value_signal.eq(pl_port.dat_r)
                 setattr(module, f"{name}_index", pl_port.adr)
 
+    def _add_memory_csr(self, name, module, memory):
+        """Gives the PS access to ``memory`` by writing an index to a CSR and then accessing its value."""
+        name_csr = f"{name}_csr"
+        ps_port = memory.get_port(
+            write_capable=not self.readonly, we_granularity=False
+        )
+        setattr(module.specials, f"{name}_memory_ps_port", ps_port)
+        # one extra bit of width for controlling the index of the memory (LSB high = modify index)
+        csr_instance = CSRStorage(
+            size=self.width + 1, reset=0, name=name_csr, write_from_dev=True
+        )
+        setattr(module, name_csr, csr_instance)
+        # PS writing the value ``(index << 1) + 1`` to the register triggers updates the index of the memory
+        update_index = Signal()
+        module.comb += update_index.eq(csr_instance.re & csr_instance.storage[0])
+        # update index as requested by the PS (LSB is control bit, so ignored for the address)
+        module.sync += If(
+            update_index == 1, ps_port.adr.eq(csr_instance.storage[1:])
+        )
+        # PL writes the data at the new index to the register so it can be read by the PS, with ``delay`` cycles delay
+        delay = 2
+        we_pipeline = Signal(delay)
+        module.sync += we_pipeline[0].eq(update_index)
+        module.sync += we_pipeline[1:].eq(we_pipeline[:-1])
+        module.sync += csr_instance.we.eq(we_pipeline[-1])
+        module.comb += csr_instance.dat_w.eq(ps_port.dat_r)
+        if not self.readonly:
+            # write to the memory when new values are sent by the PS, indicated by LSB being low
+            update_value = Signal()
+            module.comb += update_value.eq(
+                csr_instance.re & ~csr_instance.storage[0]
+            )
+            # the index has already been set by the PS at this point, so we only have to update the memory
+            module.sync += ps_port.dat_w.eq(csr_instance.storage[1:])
+            module.sync += ps_port.we.eq(update_value)
+
     name: str = None
     width: int = 1
     default: int = 0
@@ -101,6 +176,8 @@ class _Register(CustomizableMixin):
     reverse: bool = False  # set True to invert the order of Python arrays.
     doc: str = ""
     ram_offset: int = None  # if True, data is read from RAM rather than from FPGA bus
+    ram_packing: int = 1  # number of samples per 64-bit word in RAM
+    memory_mapped: bool = False  # if True, arrays are mapped onto the CSR bus for block transfers
 
     signed: bool = False
 
@@ -110,9 +187,59 @@ class _Register(CustomizableMixin):
         if self.name is None:
             self.name = name
 
-    def _get_full_name(self, instance):
+    def _get_full_name(self, instance, suffix="csr"):
         parents = instance._get_parents()
-        return f"{parents[0]}.{'_'.join(parents[1:] + [self.name])}_csr"
+        return f"{parents[0]}.{'_'.join(parents[1:] + [self.name])}_{suffix}"
+
+    def _make_access_plan(self, instance) -> Optional[_AccessPlan]:
+        """
+        Returns the access plan of the register in ``instance``, or None if it has no address.
+
+        The plan calls the address-based methods of ``instance._interface``
+        directly, such that accessing the register neither builds its name
+        nor looks up its address.
+        """
+        interface = instance._interface
+        name = self._get_full_name(instance, suffix="memory" if self.memory_mapped else "csr")
+        if self.ram_offset is not None:
+            length = -(-self.depth * 2 // self.ram_packing)
+            read = functools.partial(interface.read_from_ram, self.ram_offset, length)
+            return self._instrumented(name, _AccessPlan(read, self._ram_to_python, None, None))
+        address = interface.csrmap.address.get(name)
+        if address is None:
+            return None
+        if self.memory_mapped:
+            page_address = interface._page_address(name)
+            read = functools.partial(
+                interface.read_memory_from_address, address, self.depth, page_address
+            )
+            write = functools.partial(
+                interface.write_memory_to_address, address, page_address=page_address
+            )
+        else:
+            read = functools.partial(interface.read_from_address, address, self.depth)
+            write = functools.partial(interface.write_to_address, address)
+        if self.depth == 1:
+            to_python, from_python = self.to_python, self._value_from_python
+        else:
+            to_python, from_python = self._array_to_python, self._array_from_python
+        if self.readonly:
+            write = from_python = None
+        shadow = getattr(interface, "shadow", None)
+        if shadow is not None:
+            read, write = shadow.wrap(
+                address, read, write, readonly=self.readonly, depth=self.depth
+            )
+        return self._instrumented(name, _AccessPlan(read, to_python, write, from_python))
+
+    @staticmethod
+    def _instrumented(name: str, plan: _AccessPlan) -> _AccessPlan:
+        """Returns ``plan`` with its interface calls recorded if instrumentation is enabled."""
+        if not instrumentation.enabled:
+            return plan
+        read = instrumentation.timed(name, "read", plan.read)
+        write = plan.write and instrumentation.timed(name, "write", plan.write)
+        return plan._replace(read=read, write=write)
 
     def to_python(self, value):
         value -= self.offset_from_python
@@ -120,7 +247,9 @@ class _Register(CustomizableMixin):
 
     def _to_python_array(self, value):
         """Faster version of to_python() for arrays"""
-        return [self.to_python(v) for v in value]
+        value = np.array(value, dtype=np.int64)
+        value -= self.offset_from_python
+        return value
 
     def from_python(self, value):
         value = int(value)
@@ -133,39 +262,84 @@ class _Register(CustomizableMixin):
             logger.warning(f"Positive saturation of register {self.name}")
         return value
 
+    def _from_python_array(self, value):
+        """Faster version of from_python() for arrays"""
+        value = np.asarray(value)
+        if value.dtype.kind not in "iub":
+            # truncate like int()
+            value = np.trunc(value.astype(float))
+        value = value.astype(np.int64) + self.offset_from_python
+        # same bounds as from_python()
+        return _saturate(value, 0, 1 << self.width, self.name)
+
     def before_from_python(self, value):
         return value
 
+    def _before_from_python_array(self, value):
+        """Faster version of before_from_python() for arrays"""
+        return np.asarray(value)
+
+    def _value_from_python(self, value):
+        return self.from_python(self.before_from_python(value))
+
     def __get__(self, instance, owner=None):
-        logger.debug(f"Reading {self.name} with {instance}/{owner}")
         if instance is None:
             return self
+        plan = getattr(instance, "_pypga_access", _NO_ACCESS_PLANS).get(self.name)
+        if plan is not None:
+            return _convert(plan.read(), plan.to_python)
+        logger.debug("Reading %s with %s/%s", self.name, instance, owner)
         if self.depth == 1 and self.ram_offset is None:
             value = instance._interface.read(self._get_full_name(instance))
-            return self.to_python(value)
+            return _convert(value, self.to_python)
         else:
-            if self.ram_offset is None:
+            if self.memory_mapped:
+                value = instance._interface.read_memory(
+                    self._get_full_name(instance, suffix="memory"), length=self.depth
+                )
+                return _convert(value, self._array_to_python)
+            elif self.ram_offset is None:
                 value = instance._interface.read_array(
                     self._get_full_name(instance), length=self.depth
                 )
+                return _convert(value, self._array_to_python)
             else:
-                value = instance._interface.read_from_ram(self.ram_offset, self.depth*2)[::2]
-            if self.reverse:
-                value = reversed(value)
-            return self._to_python_array(value)
+                length = -(-self.depth * 2 // self.ram_packing)
+                value = instance._interface.read_from_ram(self.ram_offset, length)
+                return _convert(value, self._ram_to_python)
+
+    def _ram_to_python(self, value):
+        value = unpack_ram_words(value, self.ram_packing)[: self.depth]
+        return self._array_to_python(value)
+
+    def _array_to_python(self, value):
+        if self.reverse:
+            value = np.asarray(value)[::-1]
+        return self._to_python_array(value)
+
+    def _array_from_python(self, value):
+        value = self._from_python_array(self._before_from_python_array(value))
+        if self.reverse:
+            value = value[::-1]
+        return value
 
     def __set__(self, instance, value):
+        plan = getattr(instance, "_pypga_access", _NO_ACCESS_PLANS).get(self.name)
+        if plan is not None and plan.write is not None:
+            plan.write(plan.from_python(value))
+            return
         if self.readonly or self.ram_offset is not None:
             raise ValueError(
                 f"The register {self.instance.name}.{self.name} is read-only."
             )
         if self.depth == 1:
-            value = self.from_python(self.before_from_python(value))
+            value = self._value_from_python(value)
             instance._interface.write(self._get_full_name(instance), value)
+        elif self.memory_mapped:
+            value = self._array_from_python(value)
+            instance._interface.write_memory(self._get_full_name(instance, suffix="memory"), value)
         else:
-            if self.reverse:
-                value = reversed(value)
-            value = [self.from_python(self.before_from_python(v)) for v in value]
+            value = self._array_from_python(value)
             instance._interface.write_array(self._get_full_name(instance), value)
 
 
@@ -180,12 +354,12 @@ class _BoolRegister(_Register):
             value = not value
         return value
 
-    # optional optimization, untested
-    # def _to_python_array(self, value):
-    #     value = np.asarray(value)
-    #     value -= self.offset_from_python
-    #     value = np.array(((value >> self.bit) & 0x1), dtype=bool)
-    #     return value
+    def _to_python_array(self, value):
+        value = _Register._to_python_array(self, value)
+        value = ((value >> self.bit) & 0x1).astype(bool)
+        if self.invert:
+            value = ~value
+        return value
 
     def from_python(self, value):
         if self.invert:
@@ -194,6 +368,13 @@ class _BoolRegister(_Register):
         value = _Register.from_python(self, value)
         return value
 
+    def _from_python_array(self, value):
+        value = np.asarray(value).astype(bool)
+        if self.invert:
+            value = ~value
+        value = value.astype(np.int64) << self.bit
+        return _Register._from_python_array(self, value)
+
 
 class _TriggerRegister(_Register):
     """A register that returns a function which can be used to send a software trigger."""
@@ -204,6 +385,11 @@ class _TriggerRegister(_Register):
     offset_from_python = 0
 
     def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        plan = getattr(instance, "_pypga_access", _NO_ACCESS_PLANS).get(self.name)
+        if plan is not None:
+            return functools.partial(plan.write, 0)
         send_trigger = functools.partial(
             instance._interface.write, self._get_full_name(instance), 0
         )
@@ -248,8 +434,7 @@ class _NumberRegister(_Register):
         return int(value)
 
     def _to_python_array(self, value):
-        value = np.asarray(value)
-        value -= self.offset_from_python
+        value = _Register._to_python_array(self, value)
         if self.signed:
             value[value >= (1 << (self.width - 1))] -= 1 << self.width
         return value
@@ -263,6 +448,9 @@ class _NumberRegister(_Register):
             logger.warning(f"Negative saturation for {self.name}")
         return value
 
+    def _before_from_python_array(self, value):
+        return _saturate(np.asarray(value), self.min, self.max, self.name)
+
     def from_python(self, value):
         # saturate at the integer level
         if value < self._int_min:
@@ -276,6 +464,15 @@ class _NumberRegister(_Register):
         value = _Register.from_python(self, value)
         return value
 
+    def _from_python_array(self, value):
+        value = np.asarray(value)
+        if value.dtype.kind not in "iub":
+            value = np.trunc(value.astype(float))
+        value = _saturate(value.astype(np.int64), self._int_min, self._int_max, self.name)
+        if self.signed:
+            value[value < 0] += 1 << self.width
+        return _Register._from_python_array(self, value)
+
 
 class _FixedPointRegister(_NumberRegister):
     decimals: int = 0
@@ -297,6 +494,11 @@ class _FixedPointRegister(_NumberRegister):
         value = _NumberRegister.from_python(self, value)
         return value
 
+    def _from_python_array(self, value):
+        value = np.round(np.asarray(value, dtype=float) * (2**self.decimals - 1))
+        value = _NumberRegister._from_python_array(self, value)
+        return value
+
 
 Register = _Register.custom
 BoolRegister = _BoolRegister.custom
@@ -0,0 +1,220 @@
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = "report.json"
+
+# columns of the "Design Timing Summary" table of report_timing_summary
+_TIMING_SUMMARY_COLUMNS = [
+    "wns",
+    "tns",
+    "tns_failing_endpoints",
+    "tns_total_endpoints",
+    "whs",
+    "ths",
+    "ths_failing_endpoints",
+    "ths_total_endpoints",
+    "wpws",
+    "tpws",
+    "tpws_failing_endpoints",
+    "tpws_total_endpoints",
+]
+
+# the site types of report_utilization that are summarized, by their short name
+_RESOURCES = {
+    "lut": ["Slice LUTs", "CLB LUTs"],
+    "ff": ["Slice Registers", "CLB Registers"],
+    "bram": ["Block RAM Tile"],
+    "dsp": ["DSPs"],
+}
+
+
+def _to_number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_timing_summary(text: str) -> dict:
+    """
+    Extracts the design timing summary and the clocks from the output of ``report_timing_summary``.
+
+    Returns:
+        A dict with the slack values of the design timing summary in ns, e.g.
+        ``wns`` and ``whs``, the ``clocks`` with their ``period`` in ns and
+        ``frequency`` in MHz, and ``met``, whether all timing constraints are met.
+    """
+    result = {}
+    lines = text.splitlines()
+    for index, line in enumerate(lines):
+        if line.split()[:2] == ["WNS(ns)", "TNS(ns)"]:
+            values = next(
+                (
+                    line.split()
+                    for line in lines[index + 2 :]
+                    # skip the line underlining the column names
+                    if line.strip() and not set(line.strip()) <= set("- ")
+                ),
+                [],
+            )
+            result.update(
+                {
+                    name: _to_number(value)
+                    for name, value in zip(_TIMING_SUMMARY_COLUMNS, values)
+                    if value != "NA"
+                }
+            )
+            break
+    clocks = {}
+    for index, line in enumerate(lines):
+        if line.split()[:2] == ["Clock", "Waveform(ns)"]:
+            for line in lines[index + 2 :]:
+                match = re.match(r"^\s*(\S+)\s+\{[^}]*\}\s+(\S+)\s+(\S+)\s*$", line)
+                if match is None:
+                    break
+                name, period, frequency = match.groups()
+                clocks[name] = dict(period=_to_number(period), frequency=_to_number(frequency))
+            break
+    result["clocks"] = clocks
+    result["met"] = "All user specified timing constraints are met." in text
+    return result
+
+
+def parse_utilization(text: str) -> dict:
+    """
+    Extracts the resource utilization from the output of ``report_utilization``.
+
+    Returns:
+        A dict with an entry for each site type, such as ``"Slice LUTs"``,
+        containing its ``used`` and ``available`` count and ``util`` in percent,
+        and the entries ``lut``, ``ff``, ``bram`` and ``dsp`` summarizing the
+        most important resources.
+    """
+    sites = {}
+    columns = None
+    for line in text.splitlines():
+        if not line.startswith("|"):
+            continue
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if "Used" in cells and "Util%" in cells:
+            columns = cells
+            continue
+        if columns is None or len(cells) != len(columns):
+            continue
+        row = dict(zip(columns, cells))
+        name = row[columns[0]].rstrip("*").strip()
+        try:
+            sites[name] = dict(
+                used=_to_number(row["Used"]),
+                available=_to_number(row["Available"]),
+                util=_to_number(row["Util%"].lstrip("<")),
+            )
+        except (KeyError, ValueError):
+            continue
+    result = dict(sites=sites)
+    for short_name, names in _RESOURCES.items():
+        for name in names:
+            if name in sites:
+                result[short_name] = sites[name]
+                break
+    return result
+
+
+def fmax(report: dict, clock: str = None) -> Optional[float]:
+    """
+    Returns the estimated maximum frequency in MHz of a clock in a build report.
+
+    The estimate assumes that the worst negative slack of the design applies
+    to ``clock``, by default the clock with the shortest period.
+    """
+    timing = report.get("timing", {})
+    clocks = timing.get("clocks", {})
+    if not clocks or "wns" not in timing:
+        return None
+    if clock is None:
+        clock = min(clocks, key=lambda name: clocks[name]["period"])
+    return 1e3 / (clocks[clock]["period"] - timing["wns"])
+
+
+def make_report(build_path: Path, build_name: str = "top", **extra) -> dict:
+    """Parses the Vivado reports in ``build_path`` into a JSON-serializable build report."""
+    report = dict(extra)
+    timing_report = build_path / f"{build_name}_timing.rpt"
+    if timing_report.is_file():
+        report["timing"] = parse_timing_summary(timing_report.read_text())
+    utilization_report = build_path / f"{build_name}_utilization_place.rpt"
+    if utilization_report.is_file():
+        report["utilization"] = parse_utilization(utilization_report.read_text())
+    report["fmax"] = fmax(report)
+    return report
+
+
+def write_report(path: Path, report: dict):
+    with Path(path).open("w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_reports(
+    board: str = None, module: str = None, cache: ResultCache = None
+) -> List[dict]:
+    """
+    Returns the build reports of all cached builds, least recently used first.
+
+    Each report contains the cache metadata of its build, such as ``key``,
+    ``board``, ``module`` and ``built``, in addition to the parsed reports.
+
+    Args:
+        board: only return reports of builds for this board.
+        module: only return reports of builds of module classes with this name.
+        cache: the result cache to read from, by default the one in ``settings.result_path``.
+    """
+    cache = cache or ResultCache()
+    reports = []
+    for meta in cache.entries():
+        if board is not None and meta.get("board") != board:
+            continue
+        if module is not None and meta.get("module") != module:
+            continue
+        filename = cache.get_path(meta["key"]) / REPORT_FILE
+        if not filename.is_file():
+            continue
+        with filename.open() as f:
+            reports.append(dict(json.load(f), **meta))
+    return reports
+
+
+def summarize(report: dict) -> Dict[str, Optional[float]]:
+    """Returns the key figures of a build report as a flat dict."""
+    timing = report.get("timing", {})
+    utilization = report.get("utilization", {})
+    summary = dict(
+        wns=timing.get("wns"),
+        whs=timing.get("whs"),
+        fmax=report.get("fmax"),
+        duration=report.get("duration"),
+    )
+    for name in _RESOURCES:
+        summary[name] = utilization.get(name, {}).get("used")
+    return summary
+
+
+def compare_reports(old: dict, new: dict) -> Dict[str, Optional[float]]:
+    """
+    Returns the change of the key figures from the build report ``old`` to ``new``.
+
+    A negative change of ``wns`` or ``fmax`` indicates a timing regression,
+    a positive change of ``lut``, ``ff``, ``bram`` or ``dsp`` increased resource usage.
+    Figures that are missing in either report are None.
+    """
+    old, new = summarize(old), summarize(new)
+    return {
+        name: None if old[name] is None or new[name] is None else new[name] - old[name]
+        for name in old
+    }
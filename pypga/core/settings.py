@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 
 from pydantic import BaseSettings
 
@@ -11,6 +12,21 @@ class Settings(BaseSettings):
 
     result_path: Path = ROOT_PATH / "./out"
     build_path: Path = ROOT_PATH / "./build"
+    # limits of the build result cache in ``result_path``, None for no limit
+    cache_max_size: Optional[int] = 10 * 2**30
+    cache_max_entries: Optional[int] = None
+    # store post-route checkpoints and use them for incremental implementation
+    incremental_build: bool = True
+    # overrides the detected Vivado version that is part of the design hash
+    vivado_version: Optional[str] = None
+    # keep the SSH connection and register server of each board open between designs
+    reuse_sessions: bool = True
+    # serve register reads from a local copy where possible, see ``pypga.core.interface.shadow``
+    shadow_registers: bool = False
+    # seconds for which a local copy of a read-only register may be served
+    shadow_max_age: float = 0.0
+    # record counters and latency histograms of register accesses, see ``pypga.core.instrumentation``
+    instrumentation: bool = False
 
 
 settings = Settings()
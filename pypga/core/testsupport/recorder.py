@@ -0,0 +1,159 @@
+"""
+Records signals of a simulated design into numpy arrays.
+
+Instead of checking signals with per-cycle ``yield`` statements, a testbench
+records all signals of interest in a single simulation pass with
+:func:`record`, and then checks the recorded traces with vectorized numpy
+operations and the helpers in this module.
+"""
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+from migen import Signal, run_simulation
+
+
+class Recording:
+    """
+    The values of a set of signals in every clock cycle of a simulation.
+
+    Traces can be accessed by signal or by name, e.g. ``recording[dut.out]`` or
+    ``recording["out"]``, and are numpy arrays with one entry per clock cycle.
+    """
+
+    def __init__(self, signals: List[Signal], values: np.ndarray, clock_period: int = 10):
+        self.signals = list(signals)
+        self.values = values
+        self.clock_period = clock_period
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def __getitem__(self, key: Union[Signal, str]) -> np.ndarray:
+        for index, signal in enumerate(self.signals):
+            if signal is key or _name(signal) == key:
+                return self.values[index]
+        raise KeyError(key)
+
+    def to_vcd(self, filename: str, timescale: str = "1ns"):
+        """Writes the recording to a VCD file, with one clock cycle lasting ``clock_period`` units of ``timescale``."""
+        identifiers = [_vcd_identifier(index) for index in range(len(self.signals))]
+        with open(filename, "w") as f:
+            f.write(f"$timescale {timescale} $end\n$scope module top $end\n")
+            for signal, identifier in zip(self.signals, identifiers):
+                name = _name(signal) or f"signal{signal.duid}"
+                f.write(f"$var wire {len(signal)} {identifier} {name} $end\n")
+            f.write("$upscope $end\n$enddefinitions $end\n")
+            changed = np.ones(self.values.shape, dtype=bool)
+            changed[:, 1:] = self.values[:, 1:] != self.values[:, :-1]
+            for cycle in np.flatnonzero(changed.any(axis=0)):
+                f.write(f"#{cycle * self.clock_period}\n")
+                for index in np.flatnonzero(changed[:, cycle]):
+                    signal = self.signals[index]
+                    value = int(self.values[index, cycle]) & ((1 << len(signal)) - 1)
+                    if len(signal) == 1:
+                        f.write(f"{value}{identifiers[index]}\n")
+                    else:
+                        f.write(f"b{value:b} {identifiers[index]}\n")
+            f.write(f"#{len(self) * self.clock_period}\n")
+
+
+def _name(signal: Signal) -> Optional[str]:
+    return signal.name_override or signal.backtrace[-1][0]
+
+
+def _vcd_identifier(index: int) -> str:
+    """Returns a short VCD identifier made of printable characters."""
+    identifier = ""
+    while True:
+        index, remainder = divmod(index, 94)
+        identifier += chr(33 + remainder)
+        if index == 0:
+            return identifier
+        index -= 1
+
+
+def record(
+    module,
+    signals: Iterable[Signal],
+    cycles: int,
+    stimulus: Optional[Dict[Signal, Iterable[int]]] = None,
+    clock_period: int = 10,
+    vcd_name: str = None,
+    backend: str = "migen",
+) -> Recording:
+    """
+    Simulates ``module`` for ``cycles`` clock cycles and records ``signals``.
+
+    Args:
+        module: the migen module to simulate.
+        signals: the signals to record.
+        cycles: the number of clock cycles to record.
+        stimulus: maps signals to the values to write in each clock cycle. Like
+          all writes in migen testbenches, the value written in cycle ``n``
+          becomes visible in cycle ``n + 1``.
+        clock_period: the period of the ``sys`` clock.
+        vcd_name: the filename of a VCD file to record all signals of the design to.
+        backend: ``"migen"``, or ``"verilator"`` for the compiled simulation of
+          :func:`~pypga.core.interface.local.verilator.run_verilator_simulation`.
+
+    Returns:
+        The recorded traces.
+    """
+    signals = list(signals)
+    stimulus = {signal: np.asarray(values) for signal, values in (stimulus or {}).items()}
+    values = np.zeros((len(signals), cycles), dtype=np.int64)
+
+    def testbench():
+        for cycle in range(cycles):
+            for signal, trace in stimulus.items():
+                if cycle < len(trace):
+                    yield signal.eq(int(trace[cycle]))
+            for index, signal in enumerate(signals):
+                values[index, cycle] = yield signal
+            yield
+
+    if backend == "verilator":
+        from ..interface.local.verilator import run_verilator_simulation
+
+        run_verilator_simulation(
+            module,
+            testbench(),
+            ios=set(signals) | set(stimulus),
+            clocks={"sys": clock_period},
+            vcd_name=vcd_name,
+        )
+    else:
+        run_simulation(module, testbench(), clocks={"sys": clock_period}, vcd_name=vcd_name)
+    return Recording(signals, values, clock_period=clock_period)
+
+
+def rising_edges(trace: np.ndarray) -> np.ndarray:
+    """Returns the indices of the clock cycles in which ``trace`` changes from zero to non-zero."""
+    high = np.asarray(trace) != 0
+    return np.flatnonzero(high[1:] & ~high[:-1]) + 1
+
+
+def count_pulses(trace: np.ndarray) -> int:
+    """Returns the number of pulses in ``trace``, including a pulse that is high in the first cycle."""
+    high = np.asarray(trace) != 0
+    return len(rising_edges(trace)) + int(len(high) > 0 and high[0])
+
+
+def period(trace: np.ndarray) -> Optional[int]:
+    """Returns the period of the pulses in ``trace``, or None if it has fewer than two pulses or is not periodic."""
+    intervals = np.diff(rising_edges(trace))
+    if len(intervals) == 0 or np.any(intervals != intervals[0]):
+        return None
+    return int(intervals[0])
+
+
+def latency(cause: np.ndarray, effect: np.ndarray) -> Optional[int]:
+    """Returns the number of cycles from the first rising edge of ``cause`` to the next one of ``effect``."""
+    causes = rising_edges(cause)
+    if len(causes) == 0:
+        return None
+    effects = rising_edges(effect)
+    effects = effects[effects >= causes[0]]
+    if len(effects) == 0:
+        return None
+    return int(effects[0] - causes[0])
@@ -1,4 +1,5 @@
-from typing import Optional
+import time
+from typing import Iterator, Optional
 
 import numpy as np
 from pypga.core import (
@@ -12,9 +13,9 @@ from pypga.core import (
     Signal,
     logic,
 )
-from pypga.core.register import TriggerRegister
+from pypga.core.register import TriggerRegister, unpack_ram_words
 from pypga.modules.migen.axiwriter import MigenAxiWriter
-from pypga.modules.migen.pulsegen import MigenPulseBurstGen
+from pypga.modules.migen.pulsegen import MigenPulseBurstGen, MigenPulseGen
 
 from migen import Cat, Constant
 
@@ -26,6 +27,7 @@ def DAQ(
     sampling_period_width: int = 32,
     default_sampling_period: int = 10,
     axi_hp_index: Optional[int] = None,
+    samples_per_word: int = 1,
     _ram_start_address: int = 0xa000000,
     _ram_size: int = 0x2000000,
 ):
@@ -37,6 +39,11 @@ def DAQ(
           is used to directly write data to RAM, otherwise data is sent
           to the PS using a register. The value of this number can be one 
           in [0, 1, 2, 3], indicating the index of the AXI HP bus to use.
+        samples_per_word: the number of samples packed into each 64-bit
+          word in RAM, one of [1, 2, 4]. Packing 4 samples of up to 16 bits
+          per word reduces RAM traffic and the amount of data to transfer
+          by a factor of 4. Requires ``axi_hp_index`` and a ``data_depth``
+          that is a multiple of ``samples_per_word``.
 
     Input signals / args:
         on: whether the AWG should go to its next point or pause.
@@ -47,6 +54,22 @@ def DAQ(
     Output signals:
         value: a signal with the ROM value at the current index.
     """
+    if samples_per_word not in (1, 2, 4):
+        raise ValueError(f"samples_per_word must be one of [1, 2, 4], not {samples_per_word}.")
+    if samples_per_word > 1:
+        if axi_hp_index is None:
+            raise ValueError("Packing samples requires writing to RAM with axi_hp_index.")
+        if data_width > 64 // samples_per_word:
+            raise ValueError(
+                f"{samples_per_word} samples of {data_width} bits do not fit into a 64-bit word."
+            )
+        if data_depth % samples_per_word:
+            raise ValueError(
+                f"data_depth={data_depth} must be a multiple of samples_per_word={samples_per_word}."
+            )
+    lane_width = 64 // samples_per_word
+    lane_bits = samples_per_word.bit_length() - 1
+
     class _DAQ(Module):
         sampling_period_cycles: NumberRegister(
             width=sampling_period_width,
@@ -111,6 +134,7 @@ def DAQ(
             signed=True,
             decimals=data_decimals,
             ram_offset=None if axi_hp_index is None else 0,
+            ram_packing=samples_per_word,
         )
 
         if axi_hp_index is None:
@@ -125,7 +149,9 @@ def DAQ(
                     ),
                 ]
         else:
-            # bus_error: BoolRegister(readonly=True)
+            bus_error: BoolRegister(readonly=True)
+            overflow: BoolRegister(readonly=True)
+
             @logic
             def _daq_data(self, platform, soc):
                 if axi_hp_index not in range(4):
@@ -135,16 +161,263 @@ def DAQ(
                 ram_base_address = Constant(_ram_start_address, 32)
                 ram_size = 0x2000000
                 ram_mask = Constant(ram_size-1, 32)
-                self.sync += address.eq(ram_base_address | (ram_mask & Cat(Constant(0, 3), self.pulseburst.count, Constant(0, 32))))
+                if samples_per_word == 1:
+                    data = self.input
+                    we = self.pulseburst.out
+                    self.sync += address.eq(ram_base_address | (ram_mask & Cat(Constant(0, 3), self.pulseburst.count, Constant(0, 32))))
+                else:
+                    # shift samples into a word, the sample with count c ends up in lane c % samples_per_word
+                    packed = Signal(64)
+                    next_packed = Signal(64)
+                    data = Signal(64)
+                    we = Signal()
+                    lane = Signal(lane_width)
+                    self.comb += [
+                        lane.eq(self.input[:data_width]),  # zero-padded rather than sign-extended
+                        next_packed.eq(Cat(lane, packed[:64 - lane_width])),
+                    ]
+                    self.sync += [
+                        we.eq(0),
+                        If(
+                            self.pulseburst.out,
+                            packed.eq(next_packed),
+                            If(
+                                self.pulseburst.count[:lane_bits] == 0,
+                                # the word is complete
+                                data.eq(next_packed),
+                                address.eq(ram_base_address | (ram_mask & Cat(Constant(0, 3), self.pulseburst.count[lane_bits:], Constant(0, 32)))),
+                                we.eq(1),
+                            ),
+                        ),
+                    ]
                 self.submodules.axiwriter = MigenAxiWriter(
                     address=address,
-                    data=self.input,
-                    we=self.pulseburst.out,
+                    data=data,
+                    we=we,
                     reset=self._trigger,
                     axi_hp=hp,
+                    # addresses descend with the burst count, so samples cannot be merged into bursts
+                    burst_length=1,
                 )
+                self.comb += [
+                    self.bus_error.eq(self.axiwriter.error),
+                    self.overflow.eq(self.axiwriter.overflow),
+                ]
 
 
 
         
     return _DAQ
+
+
+def words_to_samples(
+    words: np.ndarray, width: int, decimals: int = 0, samples_per_word: int = 1
+) -> np.ndarray:
+    """
+    Converts uint32 words read from RAM into signed samples.
+
+    Each 64-bit word in RAM, i.e. each pair of uint32 words, contains
+    ``samples_per_word`` samples in its lanes (see ``unpack_ram_words``),
+    each of which holds a sample in its ``width`` LSBs.
+    """
+    values = unpack_ram_words(words, samples_per_word).astype(np.int64) & ((1 << width) - 1)
+    values[values >= (1 << (width - 1))] -= 1 << width
+    if decimals:
+        return values / (2**decimals - 1)
+    return values
+
+
+def StreamingDAQ(
+    ring_depth: int = 2**20,
+    data_width: int = 14,
+    data_decimals: int = 0,
+    sampling_period_width: int = 32,
+    default_sampling_period: int = 10,
+    axi_hp_index: int = 0,
+    burst_length: int = 16,
+    fifo_depth: int = 64,
+    _ram_start_address: int = 0xa000000,
+    _ram_size: int = 0x2000000,
+):
+    """
+    A DAQ module that continuously streams samples into a ring buffer in RAM.
+
+    While ``on`` is high, the FPGA writes one sample every sampling period
+    into a ring buffer of ``ring_depth`` samples and publishes the total
+    number of samples that have arrived in RAM in the register
+    ``sample_count``. The method ``stream()`` returns a generator that
+    only reads the newly written span of the ring in each iteration. Each
+    read covers at most half of the ring, such that the FPGA can keep
+    writing into the other half in the meantime.
+
+    Args:
+        ring_depth: the number of samples in the ring buffer. Must be a
+          power of two, and the ring must fit into the RAM area.
+        axi_hp_index: the index of the AXI HP bus to use, one of [0, 1, 2, 3].
+        burst_length: the number of samples written to RAM per AXI burst, at most 16.
+          ``sample_count`` advances in steps of up to this size. The last
+          incomplete burst is written when ``on`` goes low.
+        fifo_depth: the number of samples buffered while the AXI port is busy.
+          Up to ``fifo_depth + burst_length`` samples may be on their way to
+          RAM without being counted in ``sample_count`` yet.
+
+    Input signals / args:
+        input: the signal to sample.
+
+    Output signals:
+        None.
+    """
+    if ring_depth < 2 or ring_depth & (ring_depth - 1):
+        raise ValueError(f"ring_depth must be a power of two, not {ring_depth}.")
+    if ring_depth * 8 > _ram_size:
+        raise ValueError(
+            f"A ring of {ring_depth} samples does not fit into {_ram_size} bytes of RAM."
+        )
+    if axi_hp_index not in range(4):
+        raise ValueError(f"Only 4 AXI_HP ports are available, the desired index {axi_hp_index} is out of range.")
+    # samples that may already overwrite the ring before they are counted in sample_count
+    in_flight = fifo_depth + burst_length
+    if in_flight >= ring_depth:
+        raise ValueError(
+            f"ring_depth={ring_depth} must exceed fifo_depth + burst_length = {in_flight}."
+        )
+    count_mask = 0xFFFFFFFF
+
+    class _StreamingDAQ(Module):
+        sampling_period_cycles: NumberRegister(
+            width=sampling_period_width,
+            default=default_sampling_period - 2,
+            offset_from_python=-2,
+            min=2,
+        )
+        on: BoolRegister(default=False)
+        reset: TriggerRegister()
+        sample_count: NumberRegister(width=32, readonly=True, signed=False, default=0)
+        bus_error: BoolRegister(readonly=True)
+        overflow: BoolRegister(readonly=True)
+
+        @property
+        def sampling_period(self) -> float:
+            return self.sampling_period_cycles * self._clock_period
+
+        @sampling_period.setter
+        def sampling_period(self, sampling_period: float):
+            self.sampling_period_cycles = sampling_period / self._clock_period
+
+        def _read_ring(self, position: int, length: int) -> np.ndarray:
+            """Reads ``length`` samples starting at the absolute sample count ``position``."""
+            ram_offset = _ram_start_address - self._ram_start
+            start = position % ring_depth
+            first = min(length, ring_depth - start)
+            words = self._interface.read_from_ram(ram_offset + 8 * start, 2 * first)
+            if first < length:
+                wrapped = self._interface.read_from_ram(ram_offset, 2 * (length - first))
+                words = np.concatenate([words, wrapped])
+            return words_to_samples(words, width=data_width, decimals=data_decimals)
+
+        def stream(
+            self, max_chunk: int = None, poll_interval: float = 1e-3
+        ) -> Iterator[np.ndarray]:
+            """
+            Returns a generator of numpy arrays with newly acquired samples.
+
+            Args:
+                max_chunk: the maximum number of samples per array. Defaults to
+                  half of the ring buffer.
+                poll_interval: the time to wait before polling ``sample_count``
+                  again if no new samples are available.
+
+            Raises:
+                OverflowError: if samples were overwritten before they could be read,
+                  or dropped because the AXI port could not keep up.
+                IOError: if the AXI port responded with an error.
+            """
+            if max_chunk is None:
+                max_chunk = ring_depth // 2
+            position = self.sample_count
+            while True:
+                if self.overflow:
+                    raise OverflowError(
+                        "Samples were dropped because the AXI port could not keep up. "
+                        "Increase the sampling period or burst_length."
+                    )
+                if self.bus_error:
+                    raise IOError("The AXI port responded with an error while writing samples to RAM.")
+                available = (self.sample_count - position) & count_mask
+                if available > ring_depth:
+                    raise OverflowError(
+                        f"{available - ring_depth} samples were overwritten before "
+                        f"they could be read. Increase the sampling period or ring_depth."
+                    )
+                if available == 0:
+                    time.sleep(poll_interval)
+                    continue
+                length = min(available, max_chunk)
+                samples = self._read_ring(position, length)
+                # the oldest samples may have been overwritten while reading, also by
+                # samples that are being written but not counted in sample_count yet
+                if ((self.sample_count - position) & count_mask) + in_flight > ring_depth:
+                    raise OverflowError(
+                        "Samples were overwritten while reading them. Increase the "
+                        "sampling period or ring_depth."
+                    )
+                position = (position + length) & count_mask
+                yield samples
+
+        @logic
+        def _stream(self, platform, soc):
+            self.input = Signal(data_width, reset=0)
+            ###
+            self.submodules.pulsegen = MigenPulseGen(
+                period=self.sampling_period_cycles,
+                on=self.on,
+            )
+            # latch sample and ring address such that they are stable while the write is pending
+            sample = Signal(data_width)
+            address = Signal(32)
+            index = Signal(max=ring_depth)
+            next_index = Signal(max=ring_depth)
+            we = Signal()
+            hp = getattr(soc.ps7, f"s_axi_hp{axi_hp_index}")
+            self.submodules.axiwriter = MigenAxiWriter(
+                address=address,
+                data=sample,
+                we=we,
+                reset=self.reset,
+                axi_hp=hp,
+                burst_length=burst_length,
+                fifo_depth=fifo_depth,
+                # write the last incomplete burst once acquisition stops
+                flush=~self.on,
+            )
+            # only samples accepted by the writer occupy a slot of the ring, such
+            # that the ring stays in step with sample_count if samples are dropped
+            self.comb += next_index.eq(index + (we & self.axiwriter.ready))
+            self.sync += [
+                we.eq(self.pulsegen.out),
+                If(
+                    self.reset,
+                    index.eq(0),
+                ).Else(
+                    index.eq(next_index),
+                    If(
+                        self.pulsegen.out,
+                        sample.eq(self.input),
+                        address.eq(Constant(_ram_start_address, 32) | Cat(Constant(0, 3), next_index)),
+                    ),
+                ),
+            ]
+            self.comb += [
+                self.bus_error.eq(self.axiwriter.error),
+                self.overflow.eq(self.axiwriter.overflow),
+            ]
+            # publish the number of samples that have arrived in RAM
+            self.sync += If(
+                self.reset,
+                self.sample_count.eq(0),
+            ).Elif(
+                self.axiwriter.ack,
+                self.sample_count.eq(self.sample_count + self.axiwriter.ack_beats),
+            )
+
+    return _StreamingDAQ
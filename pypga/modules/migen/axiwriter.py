@@ -1,7 +1,8 @@
 from typing import Any, Union
 
-from migen import Cat, ClockDomainsRenamer, Constant, If, Signal
-from migen.genlib.fifo import AsyncFIFOBuffered
+from migen import Cat, Constant, If, ResetInserter, Signal
+from migen.fhdl.structure import wrap
+from migen.genlib.fifo import SyncFIFO
 
 from pypga.core import MigenModule
 
@@ -14,104 +15,207 @@ class MigenAxiWriter(MigenModule):
         we: Signal,
         reset: Union[Signal, Constant, bool],
         axi_hp: Any,  # an AXI_HP instance
+        burst_length: int = 1,
+        fifo_depth: int = 64,
+        flush: Union[Signal, Constant, bool] = False,
     ):
         """
         A Module that writes the data given to it to RAM.
 
+        Samples are buffered in a FIFO and written with AXI bursts of up to
+        ``burst_length`` beats. Consecutive samples are merged into one burst
+        if their addresses are contiguous and do not cross a 4 kB boundary.
+        A burst that is not full yet is only written once the next sample is
+        not contiguous, or when ``flush`` is high.
+
         Args:
             data: Data to write. Must be a 64-bit register.
             address: RAM address to write to. Must be a 32-bit register.
             we: Write enable signal, data is written when high.
+            reset: Clears the ``error`` and ``overflow`` flags when high, and
+              discards all buffered samples that have not been assigned to a
+              burst on the address channel yet. The data of bursts that the
+              AXI slave has already accepted is still written, as required
+              by the AXI protocol, but not acknowledged with ``ack``. No
+              samples are accepted until the buffers are empty.
+            burst_length: the maximum number of 64-bit beats per burst, at most 16.
+            fifo_depth: the number of samples that can be buffered while the
+              AXI port is busy, at least ``burst_length``.
+            flush: when high, an incomplete burst is written without waiting
+              for further samples.
 
         Output signals:
-            ack: .
+            ack: high for one clock cycle whenever a burst has been acknowledged
+              by the AXI slave, i.e. when its data has arrived in RAM.
+            ack_beats: the number of beats of the acknowledged burst.
+            idle: high when no data is buffered or waiting for acknowledgement.
+            ready: high when the FIFO can accept a new sample.
+            overflow: set when a sample was dropped because the FIFO was full.
+            error: set when the AXI slave responded with an error.
         """
+        if burst_length not in range(1, 17):
+            raise ValueError(f"burst_length must be in [1, 16], not {burst_length}.")
+        if fifo_depth < burst_length:
+            # an incomplete burst could otherwise fill the FIFO and never be written
+            raise ValueError(f"fifo_depth must be at least burst_length={burst_length}, not {fifo_depth}.")
         # high-level signals
+        self.ack = Signal()
+        self.ack_beats = Signal(5)
         self.idle = Signal()
         self.error = Signal()
+        self.overflow = Signal()
         # low-level signals
         self.ready = Signal()
-        # obsolete
-        self.aw_valid = Signal()
-        self.w_valid = Signal()
-        self.aw_ready = Signal()
-        self.w_ready = Signal()
 
         ###
-        # fifo = ClockDomainsRenamer({"write": "sys", "read": "sys"})(
-        #     AsyncFIFOBuffered(64, 32)
-        # )  # 64 bits, 32 samples
-        # self.submodules += fifo
-
+        reset = wrap(reset)
         aw = axi_hp.aw
         w = axi_hp.w
         b = axi_hp.b
 
-        aw_valid = Signal()
-        w_valid = Signal()
+        # samples waiting to be written
+        self.submodules.data_fifo = data_fifo = ResetInserter()(SyncFIFO(64, fifo_depth))
+        # start address and number of beats minus one of bursts waiting for the address channel
+        self.submodules.burst_fifo = burst_fifo = ResetInserter()(SyncFIFO(32 + 4, fifo_depth))
+        # number of beats minus one of bursts waiting for the data channel
+        self.submodules.w_fifo = w_fifo = SyncFIFO(4, fifo_depth)
+        # number of beats minus one of bursts waiting for the write response
+        self.submodules.b_fifo = b_fifo = SyncFIFO(4, fifo_depth)
 
-        self.sync += [
-            If((we == 1), aw_valid.eq(1))
-            .Elif(
-                aw.ready,
-                aw_valid.eq(0),
-            )
-            .Else(
-                aw_valid.eq(0),
-            ),
-            If((we == 1), w_valid.eq(1))
-            .Elif(
-                w.ready,
-                w_valid.eq(0),
-            )
-            .Else(
-                w_valid.eq(0),
-            ),
+        # reset part: after a reset, the buffered samples are discarded once the
+        # data of all bursts issued on the address channel has been written
+        discard = Signal()
+        clear = Signal()
+        self.sync += If(reset, discard.eq(1)).Elif(clear, discard.eq(0))
+        self.comb += [
+            clear.eq(discard & ~w_fifo.readable),
+            data_fifo.reset.eq(clear),
+            burst_fifo.reset.eq(clear),
+        ]
+
+        # input part: group contiguous samples into bursts
+        accept = Signal()
+        group_start = Signal(32)
+        group_count = Signal(5)
+        next_address = Signal(32)
+        contiguous = Signal()
+        self.comb += [
+            self.ready.eq(data_fifo.writable & burst_fifo.writable & ~reset & ~discard),
+            accept.eq(we & self.ready),
+            data_fifo.we.eq(accept),
+            data_fifo.din.eq(data),
+            # a sample at the start of a 4 kB page must start a new burst
+            contiguous.eq((address == next_address) & (address[3:12] != 0)),
         ]
+        if burst_length == 1:
+            self.comb += [
+                burst_fifo.we.eq(accept),
+                burst_fifo.din.eq(Cat(address, Constant(0, 4))),
+            ]
+        else:
+            self.sync += [
+                burst_fifo.we.eq(0),
+                If(
+                    accept,
+                    next_address.eq(address + 8),
+                    If(
+                        (group_count != 0) & ~contiguous,
+                        # write the previous burst and start a new one
+                        burst_fifo.we.eq(1),
+                        burst_fifo.din.eq(Cat(group_start, group_count - 1)),
+                        group_start.eq(address),
+                        group_count.eq(1),
+                    )
+                    .Elif(
+                        group_count == burst_length - 1,
+                        burst_fifo.we.eq(1),
+                        burst_fifo.din.eq(Cat(group_start, Constant(burst_length - 1, 4))),
+                        group_count.eq(0),
+                    )
+                    .Elif(
+                        group_count == 0,
+                        group_start.eq(address),
+                        group_count.eq(1),
+                    )
+                    .Else(
+                        group_count.eq(group_count + 1),
+                    ),
+                ).Elif(
+                    flush & (group_count != 0),
+                    burst_fifo.we.eq(1),
+                    burst_fifo.din.eq(Cat(group_start, group_count - 1)),
+                    group_count.eq(0),
+                ),
+                # the samples of an incomplete burst are discarded
+                If(reset, group_count.eq(0), next_address.eq(0), burst_fifo.we.eq(0)),
+            ]
 
         # address part
+        aw_handshake = Signal()
         self.comb += [
             aw.id.eq(0),
-            aw.addr.eq(address),
-            aw.len.eq(
-                0
-            ),  # Number of transfers in burst (0->1 transfer, 1->2 transfers ...)
+            aw.addr.eq(burst_fifo.dout[:32]),
+            aw.len.eq(burst_fifo.dout[32:]),  # Number of transfers in burst (0->1 transfer, 1->2 transfers ...)
             aw.size.eq(3),  # Width of burst: 3 = 8 bytes = 64 bits.
-            aw.burst.eq(0),  # no burst, fixed width
+            aw.burst.eq(1),  # incrementing address
             aw.cache.eq(0b1111),  # bufferable, and cacheable
-            aw.valid.eq(aw_valid),
-            self.aw_valid.eq(aw_valid),
-            self.aw_ready.eq(aw.ready),
+            aw.valid.eq(
+                burst_fifo.readable & w_fifo.writable & b_fifo.writable & ~reset & ~discard
+            ),
+            aw_handshake.eq(aw.valid & aw.ready),
+            burst_fifo.re.eq(aw_handshake),
+            w_fifo.we.eq(aw_handshake),
+            w_fifo.din.eq(burst_fifo.dout[32:]),
+            b_fifo.we.eq(aw_handshake),
+            b_fifo.din.eq(burst_fifo.dout[32:]),
         ]
 
         # data part
+        beat = Signal(4)
+        w_handshake = Signal()
         self.comb += [
             w.id.eq(0),
-            w.data.eq(data),
+            w.data.eq(data_fifo.dout),
             w.strb.eq(0b11111111),
-            w.last.eq(w_valid),
-            w.valid.eq(w_valid),
-            self.w_valid.eq(w_valid),
-            self.w_ready.eq(w.ready),
+            w.valid.eq(data_fifo.readable & w_fifo.readable),
+            w.last.eq(beat == w_fifo.dout),
+            w_handshake.eq(w.valid & w.ready),
+            data_fifo.re.eq(w_handshake),
+            w_fifo.re.eq(w_handshake & w.last),
         ]
-        #         beat_count = Signal(max=AXI_BURST_LEN)
-
-        #         self.sync += [
-        #             If(w.valid & w.ready,
-        #                 w.last.eq(0),
-        #                 If(w.last,
-        #                     beat_count.eq(0)
-        #                 ).Else(
-        #                     If(beat_count == AXI_BURST_LEN-2, w.last.eq(1)),
-        #                     beat_count.eq(beat_count + 1)
-        #                 )
-        #             )
-        #         ]
+        self.sync += If(
+            w_handshake,
+            If(w.last, beat.eq(0)).Else(beat.eq(beat + 1)),
+        )
 
-        #         # status part
-        self.comb += b.ready.eq(1)
-        #         self.sync += [
-        #             If(self.start.re, self.bus_error.status.eq(0)),
-        #             If(b.valid & b.ready & (b.resp != axi.Response.okay),
-        #                 self.bus_error.status.eq(1))
-        #         ]
+        # status part
+        b_handshake = Signal()
+        # number of write responses still expected for bursts issued before the last reset
+        stale = Signal(max=fifo_depth + 1)
+        self.sync += If(
+            reset,
+            stale.eq(b_fifo.level - b_handshake),
+        ).Elif(
+            b_handshake & (stale != 0),
+            stale.eq(stale - 1),
+        )
+        self.comb += [
+            b.ready.eq(1),
+            b_handshake.eq(b.valid & b.ready),
+            b_fifo.re.eq(b_handshake),
+            self.ack.eq(b_handshake & (stale == 0) & ~reset),
+            self.ack_beats.eq(b_fifo.dout + 1),
+            self.idle.eq(
+                ~data_fifo.readable & ~burst_fifo.readable & ~b_fifo.readable & (group_count == 0)
+            ),
+        ]
+        self.sync += [
+            If(
+                reset,
+                self.error.eq(0),
+                self.overflow.eq(0),
+            ),
+            # samples offered while the buffers are discarded are not counted as lost
+            If(we & ~self.ready & ~reset & ~discard, self.overflow.eq(1)),
+            If(b_handshake & (b.resp != 0), self.error.eq(1)),
+        ]
@@ -15,4 +15,5 @@ setup(
         "numpy>=1.21.4",
         "six",
     ),
+    entry_points={"console_scripts": ["pypga=pypga.__main__:main"]},
 )
@@ -0,0 +1,126 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from pypga.core.interface.remote.client import Client
+
+TOKEN = "0123456789abcdef0123456789abcdef"
+
+
+class FakeServer(threading.Thread):
+    """A Python implementation of the register server protocol in ``server.c``."""
+
+    def __init__(self, token=TOKEN):
+        super().__init__(daemon=True)
+        self.token = token
+        self.registers = {}
+        self.arrays = {}
+        # memory-mapped arrays: address -> (array, page register address)
+        self.memories = {}
+        self.ram = np.arange(1 << 16, dtype=np.uint32)
+        # seconds that each request takes
+        self.delay = 0
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        self.port = self._listener.getsockname()[1]
+
+    def _recv(self, connection, length):
+        data = b""
+        while len(data) < length:
+            new = connection.recv(length - len(data))
+            if not new:
+                raise ConnectionError("Client closed the connection.")
+            data += new
+        return data
+
+    def _memory_index(self, address):
+        for base, (memory, page_address) in self.memories.items():
+            if base <= address < base + 0x800:
+                page = 0 if page_address is None else self.registers.get(page_address, 0)
+                return memory, page * 512 + (address - base) // 4
+        raise KeyError(f"No memory at address {address:#x}.")
+
+    def run(self):
+        connection, _ = self._listener.accept()
+        with connection:
+            if self._recv(connection, 32).decode("ascii") != self.token:
+                connection.sendall(self.token.encode("ascii"))
+                return
+            connection.sendall(b"1" * 32)
+            while True:
+                try:
+                    header = self._recv(connection, 8)
+                except ConnectionError:
+                    return
+                time.sleep(self.delay)
+                command = header[:1]
+                length = header[2] + (header[3] << 8)
+                address = int.from_bytes(header[4:], "little")
+                if command in (b"R", b"W"):
+                    start = int.from_bytes(self._recv(connection, 4), "little")
+                else:
+                    start = 0
+                if command in (b"r", b"R") and (length > 1 or command == b"R"):
+                    values = self.arrays[address][start : start + length]
+                    connection.sendall(header + values.tobytes())
+                elif command == b"r":
+                    values = [self.registers.get(address, 0)] * length
+                    connection.sendall(header + np.array(values, dtype=np.uint32).tobytes())
+                elif command in (b"w", b"W"):
+                    values = np.frombuffer(self._recv(connection, 4 * length), dtype=np.uint32)
+                    if length > 1 or command == b"W":
+                        self.arrays[address][start : start + length] = values
+                    else:
+                        self.registers[address] = int(values[0]) if length else 0
+                    connection.sendall(header)
+                elif command in (b"b", b"B"):
+                    memory, index = self._memory_index(address)
+                    if command == b"b":
+                        connection.sendall(header + memory[index : index + length].tobytes())
+                    else:
+                        values = self._recv(connection, 4 * length)
+                        memory[index : index + length] = np.frombuffer(values, dtype=np.uint32)
+                        connection.sendall(header)
+                elif command == b"d":
+                    points = header[1] + (header[2] << 8) + (header[3] << 16)
+                    connection.sendall(header + self.ram[address // 4 : address // 4 + points].tobytes())
+                elif command == b"m":
+                    entries = np.frombuffer(self._recv(connection, 12 * length), dtype=np.uint32)
+                    results = []
+                    for operation, entry_address, value in entries.reshape(-1, 3):
+                        if operation == ord("w"):
+                            self.registers[int(entry_address)] = int(value)
+                        results.append(self.registers.get(int(entry_address), 0))
+                    connection.sendall(header + np.array(results, dtype=np.uint32).tobytes())
+                elif command == b"c":
+                    return
+
+
+@pytest.fixture
+def server():
+    server = FakeServer()
+    server.start()
+    yield server
+
+
+@pytest.fixture
+def start_server():
+    """Returns a function that starts another fake server."""
+
+    def start_server():
+        server = FakeServer()
+        server.start()
+        return server
+
+    return start_server
+
+
+@pytest.fixture
+def client(server):
+    client = Client(token=server.token, port=server.port)
+    yield client
+    client.stop()
@@ -0,0 +1,132 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from pypga.core.interface.remote.async_client import AsyncClient
+
+
+def run_with_client(server, coroutine_function):
+    async def main():
+        client = AsyncClient(token=server.token, port=server.port)
+        await client.start()
+        try:
+            return await coroutine_function(client)
+        finally:
+            client.stop()
+
+    return asyncio.run(main())
+
+
+class TestAsyncClient:
+    def test_pipelined_requests(self, server):
+        async def requests(client):
+            writes = [client.writes(0x80000800 + 4 * i, [i]) for i in range(300)]
+            reads = [client.reads(0x80000800 + 4 * i, 1) for i in range(300)]
+            assert client.outstanding == 600
+            await asyncio.gather(*writes)
+            return await asyncio.gather(*reads)
+
+        results = run_with_client(server, requests)
+        assert [int(r[0]) for r in results] == list(range(300))
+
+    def test_batch_and_ram(self, server):
+        async def requests(client):
+            batch = client.batch([(0x80000800, "w", 5), (0x80000800, "r", 0)])
+            ram = client.read_from_ram(0, 10)
+            return await batch, await ram
+
+        batch, ram = run_with_client(server, requests)
+        assert list(batch) == [5, 5]
+        assert np.array_equal(ram, server.ram[:10])
+
+    def test_drain(self, server):
+        async def requests(client):
+            for i in range(10):
+                client.writes(0x80000800, [i])
+            await client.drain()
+            return client.outstanding
+
+        assert run_with_client(server, requests) == 0
+        assert server.registers[0x80000800] == 9
+
+    def test_array_chunks(self, server):
+        server.arrays[0x80000800] = np.zeros(150000, dtype=np.uint32)
+        values = np.arange(150000, dtype=np.uint32)
+
+        async def requests(client):
+            await client.writes(0x80000800, values)
+            return await client.reads(0x80000800, len(values))
+
+        assert np.array_equal(run_with_client(server, requests), values)
+
+    def test_paged_block(self, server):
+        server.memories[0x80001000] = (np.zeros(2000, dtype=np.uint32), 0x80000800)
+        values = np.arange(2000, dtype=np.uint32)
+
+        async def requests(client):
+            await client.write_block(0x80001000, values, page_address=0x80000800)
+            return await client.read_block(0x80001000, len(values), page_address=0x80000800)
+
+        assert np.array_equal(run_with_client(server, requests), values)
+
+    def test_paged_block_fails_with_page_write(self, server):
+        server.memories[0x80001000] = (np.zeros(2000, dtype=np.uint32), 0x80000800)
+
+        async def requests(client):
+            request = client._request
+
+            def fail_page_writes(header, **kwargs):
+                future = request(header, **kwargs)
+                if header[:1] != b"w":
+                    return future
+                failed = asyncio.get_running_loop().create_future()
+                failed.set_exception(ConnectionError("page write failed"))
+                return failed
+
+            client._request = fail_page_writes
+            with pytest.raises(ConnectionError):
+                await client.read_block(0x80001000, 2000, page_address=0x80000800)
+            await client.drain()
+
+        run_with_client(server, requests)
+
+    def test_timeout(self, server):
+        async def requests(client):
+            client._timeout = 0.1
+            # the server does not answer unknown commands
+            with pytest.raises(asyncio.TimeoutError):
+                await client._request(b"x" + b"\x00" * 7)
+
+        run_with_client(server, requests)
+
+    def test_timeout_starts_at_previous_response(self, server):
+        server.delay = 0.05
+
+        async def requests(client):
+            client._timeout = 0.2
+            # the last reads wait longer than the timeout behind the earlier ones
+            return await asyncio.gather(*[client.reads(0x80000800, 1) for _ in range(10)])
+
+        assert len(run_with_client(server, requests)) == 10
+
+    def test_requests_fail_after_connection_error(self, server):
+        async def requests(client):
+            # make the server close the connection before it answers the read
+            client._writer.write(b"c" + b"\x00" * 7)
+            read = client.reads(0x80000800, 1)
+            with pytest.raises((asyncio.IncompleteReadError, ConnectionError)):
+                await read
+            with pytest.raises((asyncio.IncompleteReadError, ConnectionError)):
+                client.reads(0x80000800, 1)
+
+        run_with_client(server, requests)
+
+    def test_drain_after_stop(self, server):
+        async def requests(client):
+            client.writes(0x80000800, [1])
+            client.stop()
+            await client.drain()
+            return client.outstanding
+
+        assert run_with_client(server, requests) == 0
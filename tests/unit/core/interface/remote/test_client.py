@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+
+class TestClient:
+    def test_write_read(self, client):
+        client.writes(0x80000800, [12345])
+        assert list(client.reads(0x80000800, 1)) == [12345]
+
+    def test_read_from_ram(self, client, server):
+        assert np.array_equal(client.read_from_ram(16, 100), server.ram[4:104])
+
+    def test_batch(self, client, server):
+        server.registers[0x80000804] = 7
+        results = client.batch(
+            [(0x80000800, "w", 3), (0x80000804, "r", 0), (0x80000800, "r", 0)]
+        )
+        assert list(results) == [3, 7, 3]
+        assert server.registers[0x80000800] == 3
+
+    def test_batch_chunks(self, client, server):
+        addresses = [0x80000000 + 4 * i for i in range(client.max_batch_length + 10)]
+        client.batch([(address, "w", i) for i, address in enumerate(addresses)])
+        results = client.batch([(address, "r", 0) for address in addresses])
+        assert np.array_equal(results, np.arange(len(addresses)))
+
+    def test_batch_rejects_unknown_operation(self, client):
+        with pytest.raises(ValueError):
+            client.batch([(0x80000800, "x", 0)])
+
+    def test_read_from_ram_into_out(self, client, server):
+        out = np.zeros(1000, dtype=np.uint32)
+        result = client.read_from_ram(0, 1000, out=out)
+        assert result is out
+        assert np.array_equal(out, server.ram[:1000])
+
+    def test_read_from_ram_rejects_wrong_out(self, client):
+        with pytest.raises(ValueError):
+            client.read_from_ram(0, 10, out=np.zeros(10, dtype=np.int64))
+
+    def test_array_chunks(self, client, server):
+        server.arrays[0x80000800] = np.zeros(200000, dtype=np.uint32)
+        values = np.arange(200000, dtype=np.uint32)
+        client.writes(0x80000800, values)
+        assert np.array_equal(server.arrays[0x80000800], values)
+        assert np.array_equal(client.reads(0x80000800, 200000), values)
+        assert np.array_equal(client.reads(0x80000800, 10, start=1000), values[1000:1010])
+
+    def test_block(self, client, server):
+        server.memories[0x80001000] = (np.zeros(100, dtype=np.uint32), None)
+        client.write_block(0x80001000, np.arange(100))
+        assert np.array_equal(client.read_block(0x80001000, 100), np.arange(100))
+        assert np.array_equal(client.read_block(0x80001000 + 40, 5), np.arange(10, 15))
+
+    def test_paged_block(self, client, server):
+        server.memories[0x80001000] = (np.zeros(2000, dtype=np.uint32), 0x80000800)
+        values = np.arange(2000, dtype=np.uint32)
+        client.write_block(0x80001000, values, page_address=0x80000800)
+        assert np.array_equal(server.memories[0x80001000][0], values)
+        assert np.array_equal(client.read_block(0x80001000, 2000, page_address=0x80000800), values)
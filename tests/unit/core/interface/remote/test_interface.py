@@ -0,0 +1,130 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from pypga.core.interface.csrmap import CsrMap
+from pypga.core.interface.remote import interface as interface_module
+from pypga.core.interface.remote.async_client import AsyncClient
+from pypga.core.interface.remote.client import Client
+from pypga.core.interface.remote.interface import AsyncRemoteInterface, RemoteInterface
+
+
+def write_build_results(path, identifier: str):
+    """Writes the build results of an empty Stemlab SoC, and returns its identifier memory."""
+    soc_module = pytest.importorskip("pypga.boards.stemlab125_14.soc")
+    from pypga.core.migen_axi.platforms import redpitaya
+
+    soc = soc_module.StemlabSoc(platform=redpitaya.Platform(), ident=identifier)
+    soc.finalize()
+    (path / "csr.csv").write_text(soc.get_csr_csv())
+    (path / "identifier.txt").write_text(identifier)
+    (path / "bitstream.bin").write_bytes(identifier.encode())
+    return soc.identifier.mem
+
+
+def fake_session(server):
+    """Returns a session class for a board that runs ``server``."""
+
+    class FakeSession:
+        def __init__(self, host):
+            self.flash_callbacks = []
+            self.server = server
+
+        def load(self, bitstreamfile, force=False):
+            return self.server.token
+
+        def close(self):
+            pass
+
+    return FakeSession
+
+
+def test_csr_csv_contains_identifier(tmp_path):
+    memory = write_build_results(tmp_path, "design")
+    csrmap = CsrMap(tmp_path / "csr.csv")
+    assert csrmap.size["identifier.mem"] == memory.depth
+    assert RemoteInterface._identifier_matches(memory.init, b"design")
+
+
+def test_reflashes_other_design(tmp_path, monkeypatch, start_server):
+    build_memory = write_build_results(tmp_path, "design b")
+    address = CsrMap(tmp_path / "csr.csv").address["identifier.mem"]
+
+    def board_server(identifier: bytes):
+        server = start_server()
+        contents = np.array([len(identifier), *identifier], dtype=np.uint32)
+        server.memories[address] = (contents, None)
+        return server
+
+    class FakeSession:
+        """A board that runs another design although the recorded bitstream hash matches."""
+
+        def __init__(self, host):
+            self.flash_callbacks = []
+            self.loads = []
+            self.server = board_server(b"design a")
+
+        def load(self, bitstreamfile, force=False):
+            self.loads.append(force)
+            if force:
+                self.server = board_server(bytes(build_memory.init[1:]))
+            return self.server.token
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(interface_module, "Session", FakeSession)
+    monkeypatch.setattr(
+        RemoteInterface,
+        "_create_client",
+        lambda self: Client(token=self.server.token, port=self.server.port),
+    )
+    interface = RemoteInterface(result_path=tmp_path, host="board", reuse_session=False)
+    try:
+        assert interface.session.loads == [False, True]
+        identifier = interface.read_memory_from_address(address, build_memory.depth)
+        assert RemoteInterface._identifier_matches(identifier, b"design b")
+    finally:
+        interface.stop()
+
+
+def test_async_read_from_ram_into_array(tmp_path, monkeypatch, server):
+    (tmp_path / "csr.csv").write_text("")
+    monkeypatch.setattr(interface_module, "Session", fake_session(server))
+    monkeypatch.setattr(
+        AsyncRemoteInterface,
+        "_create_client",
+        lambda self: AsyncClient(token=self.server.token, port=self.server.port),
+    )
+
+    async def read():
+        interface = AsyncRemoteInterface(result_path=tmp_path, host="board", reuse_session=False)
+        await interface.start()
+        try:
+            out = np.zeros(10, dtype=np.uint32)
+            assert await interface.read_from_ram(16, 10, out=out) is out
+            return out
+        finally:
+            interface.stop()
+
+    assert np.array_equal(asyncio.run(read()), server.ram[4:14])
+
+
+def test_execute_uses_session(tmp_path, monkeypatch, server):
+    commands = []
+    server.run = lambda command, timeout=None, check=False: commands.append((command, check))
+
+    (tmp_path / "csr.csv").write_text("")
+    monkeypatch.setattr(interface_module, "Session", fake_session(server))
+    monkeypatch.setattr(
+        RemoteInterface,
+        "_create_client",
+        lambda self: Client(token=self.server.token, port=self.server.port),
+    )
+    interface = RemoteInterface(result_path=tmp_path, host="board", reuse_session=False)
+    try:
+        interface.execute("uptime", check=True)
+    finally:
+        interface.stop()
+    assert commands == [("uptime", True)]
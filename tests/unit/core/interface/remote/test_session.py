@@ -0,0 +1,161 @@
+from pathlib import Path
+
+import pytest
+
+from pypga.core.interface.remote import session as session_module
+from pypga.core.interface.remote.server import Server
+from pypga.core.interface.remote.session import SessionPool
+from pypga.core.interface.remote.sshshell import CommandError, CommandResult
+
+
+class FakeTransport:
+    active = True
+
+    def is_active(self):
+        return self.active
+
+
+class FakeBoardServer:
+    """Records what a session asks the board to do."""
+
+    def __init__(self, host, start=True):
+        self.host = host
+        self.token = None
+        self.flashed = []
+        self.starts = 0
+        transport = FakeTransport()
+
+        class Ssh:
+            def get_transport(self):
+                return transport
+
+            def close(self):
+                transport.active = False
+
+        self.shell = type("Shell", (), {"ssh": Ssh()})()
+
+    def flash_bitstream(self, filename, bitstream_hash=None, force=False):
+        self.flashed.append(filename)
+        self.stop()
+        return True
+
+    def start(self):
+        self.starts += 1
+        self.token = "0" * 32
+        return self.token
+
+    def stop(self):
+        self.token = None
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(session_module, "Server", FakeBoardServer)
+    pool = SessionPool()
+    yield pool
+    pool.close()
+
+
+def test_reuses_session(pool, tmp_path):
+    bitstream = tmp_path / "bitstream.bin"
+    bitstream.write_bytes(b"design a")
+    session = pool.get("board")
+    flashes = []
+    session.flash_callbacks.append(lambda: flashes.append(True))
+    assert session.load(bitstream) == "0" * 32
+    assert pool.get("board") is session
+    session.load(bitstream)
+    assert session.server.flashed == [bitstream]
+    assert session.server.starts == 1
+    bitstream.write_bytes(b"design b")
+    session.load(bitstream)
+    assert len(session.server.flashed) == 2
+    assert len(flashes) == 2
+    assert session.server.starts == 2
+    assert pool.get("other") is not session
+
+
+def test_force_flashing(pool, tmp_path):
+    bitstream = tmp_path / "bitstream.bin"
+    bitstream.write_bytes(b"design a")
+    session = pool.get("board")
+    session.load(bitstream)
+    session.load(bitstream, force=True)
+    assert session.server.flashed == [bitstream, bitstream]
+    assert session.server.starts == 2
+
+
+def test_reconnects(pool):
+    session = pool.get("board")
+    session.server.shell.ssh.close()
+    assert pool.get("board") is not session
+
+
+class FakeShell:
+    """Emulates the few shell commands that ``Server.flash_bitstream`` runs."""
+
+    def __init__(self):
+        self.files = {}
+        self.uploads = []
+        self.commands = []
+        self.scp = type("Scp", (), {"put": lambda _, src, dst: self.uploads.append(src)})()
+
+    def execute(self, command, timeout=None, check=False):
+        self.commands.append(command)
+        result = CommandResult(command, 0, "", "")
+        if command.startswith("cat ") and ">" not in command:
+            if command[4:] in self.files:
+                result = CommandResult(command, 0, self.files[command[4:]] + "\n", "")
+            else:
+                result = CommandResult(command, 1, "", "cat: No such file or directory\n")
+        elif command.startswith("echo ") and ">" in command:
+            content, filename = command[5:].split(" > ")
+            self.files[filename] = content
+        elif command.startswith("rm -f "):
+            self.files.pop(command[6:], None)
+        if check:
+            result.check()
+        return result
+
+
+def test_skip_flashing_same_bitstream():
+    server = Server.__new__(Server)
+    server.shell = FakeShell()
+    assert server.loaded_bitstream_hash is None
+    assert server.flash_bitstream("a.bin", bitstream_hash="a" * 64)
+    assert server.loaded_bitstream_hash == "a" * 64
+    assert not server.flash_bitstream("a.bin", bitstream_hash="a" * 64)
+    assert server.shell.uploads == ["a.bin"]
+    assert server.flash_bitstream("b.bin", bitstream_hash="b" * 64)
+    assert server.loaded_bitstream_hash == "b" * 64
+    assert server.shell.uploads == ["a.bin", "b.bin"]
+    assert "cat /root/pypga/bitstream.bin > /dev/xdevcfg" in server.shell.commands
+    assert server.flash_bitstream("b.bin", bitstream_hash="b" * 64, force=True)
+    assert server.shell.uploads == ["a.bin", "b.bin", "b.bin"]
+
+
+def test_command_result():
+    assert CommandResult("true", 0, "", "").check().ok
+    with pytest.raises(CommandError, match="exit status 2"):
+        CommandResult("false", 2, "", "error").check()
+
+
+def test_start_probes_server_binaries(monkeypatch):
+    class ProbingShell(FakeShell):
+        def execute(self, command, timeout=None, check=False):
+            if command == "/root/pypga/server":
+                self.commands.append(command)
+                if self.uploads[-1].name == "server_0.92":
+                    return CommandResult(command, 127, "", "server: not found\n")
+                return CommandResult(command, 1, "", "ERROR, no port provided\n")
+            return super().execute(command, timeout, check)
+
+    server = Server.__new__(Server)
+    server.shell = ProbingShell()
+    server.port = 2222
+    monkeypatch.setattr(Server, "_srcfiles", [Path("server_0.92"), Path("server_0.95")])
+    monkeypatch.setattr(Server, "_wait_for_port", lambda self: True)
+    token = server.start()
+    assert len(token) == 32
+    assert [path.name for path in server.shell.uploads] == ["server_0.92", "server_0.95"]
+    assert server.shell.commands[-1] == f"nohup /root/pypga/server 2222 {token} > /dev/null 2>&1 &"
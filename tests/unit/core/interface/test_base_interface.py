@@ -3,6 +3,7 @@ import inspect
 import pytest
 
 from pypga.core.interface.csrmap import CsrMap
+from pypga.core.interface.interface import BaseInterface
 
 CSR_CSV = inspect.cleandoc(
     """
@@ -36,3 +37,38 @@ class TestNameToAddr:
 
     def test_getitem(self, csrmap):
         assert csrmap["top.led4to7_led1_rate"] == (0x80000820, 32, "rw")
+
+
+class PagedMemoryInterface(BaseInterface):
+    """Emulates a memory with 3 values per page at 0x80001000 and its page register at 0x80000800."""
+
+    memory_page_length = 3
+
+    def __init__(self, result_path):
+        super().__init__(result_path)
+        self.memory = list(range(10))
+        self.page = 0
+
+    def read_from_address(self, address, length=1):
+        return self.memory[self.page * 3 + (address - 0x80001000) // 4]
+
+    def write_to_address(self, address, value):
+        if address == 0x80000800:
+            self.page = value
+        else:
+            self.memory[self.page * 3 + (address - 0x80001000) // 4] = value
+
+
+class TestMemory:
+    @pytest.fixture
+    def interface(self, tmp_path):
+        with (tmp_path / "csr.csv").open("w") as f:
+            f.write("top.data_memory,0x80001000,10,rw\ntop.data_memory_page,0x80000800,1,rw\n")
+        yield PagedMemoryInterface(tmp_path)
+
+    def test_read_memory(self, interface):
+        assert interface.read_memory("top.data_memory", 10) == list(range(10))
+
+    def test_write_memory(self, interface):
+        interface.write_memory("top.data_memory", list(range(10, 20)))
+        assert interface.memory == list(range(10, 20))
@@ -0,0 +1,131 @@
+import time
+
+import numpy as np
+import pytest
+
+from migen import If
+from migen.build.generic_platform import GenericPlatform, Pins
+
+from pypga.core import BoolRegister, Module, NumberRegister, TopModule, logic
+from pypga.core.builder import BaseBuilder
+from pypga.core.interface import LocalInterface
+from pypga.core.register import Register
+
+
+class SimulationPlatform(GenericPlatform):
+    def __init__(self):
+        super().__init__("simulation", [("user_led", 0, Pins("X"))])
+
+
+class SimulationBuilder(BaseBuilder):
+    board = "simulation_test"
+    platform_class = SimulationPlatform
+
+    def _get_hash(self):
+        return self.module_class._hash
+
+    def _build(self):
+        raise NotImplementedError
+
+
+class Counter(Module):
+    on: BoolRegister(default=False)
+    step: NumberRegister(width=8, default=1)
+    count: NumberRegister(width=32, readonly=True)
+
+    @logic
+    def _count(self, platform):
+        self.sync += If(self.on, self.count.eq(self.count + self.step))
+        self.comb += platform.request("user_led").eq(self.count[0])
+
+
+class Design(TopModule):
+    counter: Counter
+    table: Register(width=10, depth=4, default=None)
+    block: Register(width=10, depth=600, default=None, memory_mapped=True)
+    block_readback: Register(width=10, depth=600, default=None, readonly=True, memory_mapped=True)
+    index: NumberRegister(width=10)
+    value_at_index: NumberRegister(width=10, readonly=True)
+
+    @logic
+    def _readback(self):
+        self.comb += [
+            self.table_index.eq(self.index),
+            self.value_at_index.eq(self.table),
+        ]
+
+
+@pytest.fixture
+def dut():
+    dut = Design.run(host=None, board="simulation_test")
+    yield dut
+    dut.stop()
+
+
+def test_registers(dut):
+    assert dut.counter.step == 1
+    dut.counter.step = 3
+    assert dut.counter.step == 3
+    assert dut.counter.count == 0
+    dut.counter.on = True
+    dut._interface.step(100)
+    dut.counter.on = False
+    count = dut.counter.count
+    assert count > 0 and count % 3 == 0
+    dut._interface.step(10)
+    assert dut.counter.count == count
+
+
+def test_array(dut):
+    dut.table = [1, 2, 3, 4]
+    assert list(dut.table) == [1, 2, 3, 4]
+    dut.index = 2
+    assert dut.value_at_index == 3
+
+
+def test_memory_mapped(dut):
+    values = np.arange(600) % 1024
+    dut.block = values
+    assert np.array_equal(dut.block, values)
+
+
+def test_not_free_running(dut):
+    dut.counter.on = True
+    first = dut.counter.count
+    assert dut.counter.count - first < 10
+    dut._interface.step(50)
+    assert dut.counter.count - first >= 50
+
+
+def test_free_running():
+    interface = LocalInterface(Design, board="simulation_test", free_running=True)
+    try:
+        dut = Design(interface=interface)
+        dut.counter.on = True
+        first = dut.counter.count
+        time.sleep(0.2)
+        assert dut.counter.count - first >= 50
+    finally:
+        interface.stop()
+
+
+def test_read_from_ram():
+    pytest.importorskip("migen_axi")
+    from pypga.modules.axiwriter import AXIWriter
+
+    class RamDesign(TopModule):
+        writer: AXIWriter(axi_hp_index=0)
+
+    dut = RamDesign.run(host=None, board="simulation_test")
+    try:
+        for index in range(3):
+            dut.writer.address = 0xA000000 + 8 * index
+            dut.writer.data = 10 + index
+            dut.writer.we()
+        dut._interface.step(50)
+        assert dut.writer.idle
+        assert not dut.writer.error
+        assert list(dut.writer.read_from_ram(0, 6)) == [10, 10, 11, 11, 12, 12]
+        assert list(dut.writer.read_from_ram(4, 2)) == [10, 11]
+    finally:
+        dut.stop()
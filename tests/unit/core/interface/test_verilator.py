@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from migen import Module, Signal, run_simulation
+
+from pypga.core.interface import LocalInterface
+from pypga.core.interface.local.verilator import run_verilator_simulation, verilator_available
+from pypga.core.testsupport.recorder import latency, record
+from pypga.modules.migen.pulsegen import MigenPulseGen
+
+from test_local_interface import Design
+
+pytestmark = pytest.mark.skipif(not verilator_available(), reason="Verilator is not installed.")
+
+
+def _trace(dut, values):
+    def record():
+        for _ in range(100):
+            values.append(((yield dut.out), (yield dut.count)))
+            yield
+
+    return record()
+
+
+def test_same_as_migen():
+    expected, actual = [], []
+    dut = MigenPulseGen(period=8)
+    run_simulation(dut, _trace(dut, expected))
+    dut = MigenPulseGen(period=8)
+    run_verilator_simulation(dut, _trace(dut, actual), ios=[dut.out, dut.count])
+    assert actual == expected
+
+
+class Delay(Module):
+    def __init__(self):
+        self.input = Signal(8)
+        self.output = Signal(8)
+        self.sync += self.output.eq(self.input)
+
+
+def test_inputs_same_as_migen():
+    stimulus = np.arange(40) % 7
+    recordings = []
+    for backend in ["migen", "verilator"]:
+        dut = Delay()
+        recordings.append(
+            record(
+                dut,
+                [dut.input, dut.output],
+                cycles=40,
+                stimulus={dut.input: stimulus},
+                backend=backend,
+            )
+        )
+    expected, actual = recordings
+    assert np.array_equal(actual.values, expected.values)
+    assert latency(actual["input"], actual["output"]) == 1
+
+
+def test_local_interface():
+    interface = LocalInterface(Design, board="simulation_test", backend="verilator")
+    try:
+        dut = Design(interface=interface)
+        dut.counter.step = 3
+        dut.counter.on = True
+        interface.step(100_000)
+        dut.counter.on = False
+        assert dut.counter.count >= 300_000
+        dut.table = [1, 2, 3, 4]
+        assert list(dut.table) == [1, 2, 3, 4]
+    finally:
+        interface.stop()
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from pypga.core import Module, NumberRegister
+from pypga.core.batch import BatchBuilder, parameter_grid
+from pypga.core.builder import BaseBuilder
+from pypga.core.settings import settings
+
+
+class FakeBuilder(BaseBuilder):
+    """Builds a text file describing the design instead of running Vivado."""
+
+    board = "batch_test"
+    _build_results = ["design.txt", "pid.txt"]
+
+    def _get_hash(self):
+        return self.module_class._hash
+
+    def _build(self):
+        if self.module_class.fail:
+            raise ValueError("failed on purpose")
+        (self.build_path / "design.txt").write_text(self.module_class.__name__)
+        (self.build_path / "pid.txt").write_text(str(os.getpid()))
+        self.copy_results()
+
+
+def Design(width=8, fail=False):
+    class _Design(Module):
+        value: NumberRegister(width=width)
+
+    _Design.fail = fail
+    return _Design
+
+
+@pytest.fixture(autouse=True)
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "result_path", tmp_path / "out")
+    monkeypatch.setattr(settings, "build_path", tmp_path / "build")
+
+
+def test_parameter_grid():
+    assert parameter_grid(a=[1, 2], b=["x"]) == [dict(a=1, b="x"), dict(a=2, b="x")]
+    assert parameter_grid() == [{}]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_batch(max_workers):
+    batch = BatchBuilder(board="batch_test", max_workers=max_workers)
+    batch.add_grid(Design, width=[8, 9, 10])
+    batch.add(Design(width=8))
+    batch.add(Design(width=11, fail=True))
+    jobs = batch.run()
+    assert [job.status for job in jobs] == ["built"] * 4 + ["failed"]
+    assert "failed on purpose" in jobs[-1].error
+    assert len({job.hash for job in jobs[:3]}) == 3
+    # identical designs are built once
+    assert jobs[3].hash == jobs[0].hash
+    assert (jobs[0].result_path / "design.txt").read_text() == "_Design"
+    pids = {(job.result_path / "pid.txt").read_text() for job in jobs[:3]}
+    assert (str(os.getpid()) in pids) == (max_workers == 1)
+    rerun = BatchBuilder(board="batch_test", max_workers=max_workers)
+    rerun.add(Design(width=9))
+    assert [job.status for job in rerun.run()] == ["cached"]
+
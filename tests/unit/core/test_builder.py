@@ -0,0 +1,47 @@
+import pytest
+
+from pypga.core import Module, NumberRegister
+from pypga.core.builder import BaseBuilder
+from pypga.core.settings import settings
+
+
+class FakeBuilder(BaseBuilder):
+    """Builds a text file describing the design instead of running Vivado."""
+
+    board = "builder_test"
+    _build_results = ["design.txt"]
+
+    def _get_hash(self):
+        return self.module_class._hash
+
+    def _build(self):
+        (self.build_path / "design.txt").write_text(self.module_class.__name__)
+        self.copy_results()
+
+
+class Design(Module):
+    value: NumberRegister(width=8)
+
+
+@pytest.fixture
+def builder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "result_path", tmp_path / "out")
+    monkeypatch.setattr(settings, "build_path", tmp_path / "build")
+    return FakeBuilder(Design)
+
+
+def test_results_of_failed_timing_are_not_used(builder):
+    builder.build()
+    assert builder.result_exists
+    builder.copy_results(meta=dict(timing_met=False))
+    assert builder.cache.get_meta(builder.hash)["timing_met"] is False
+    assert not builder.result_exists
+
+
+def test_use_results(builder):
+    builder.build()
+    last_used = builder.cache.get_meta(builder.hash)["last_used"]
+    assert builder.result_exists
+    assert builder.cache.get_meta(builder.hash)["last_used"] == last_used
+    builder.use_results()
+    assert builder.cache.get_meta(builder.hash)["last_used"] > last_used
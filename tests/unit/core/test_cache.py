@@ -0,0 +1,118 @@
+import inspect
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pypga.core import Module
+from pypga.core.cache import ResultCache, hash_components, hash_file, hash_source_files
+
+
+@pytest.fixture
+def files(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "bitstream.bin").write_bytes(b"\x00" * 1000)
+    (source / "csr.csv").write_text("top.register,0x80000800,1,rw\n")
+    return [source / "bitstream.bin", source / "csr.csv"]
+
+
+def make_cache(tmp_path, **kwargs):
+    kwargs.setdefault("max_size", 10**9)
+    return ResultCache(tmp_path / "store", **kwargs)
+
+
+def test_hash_source_files(tmp_path, monkeypatch):
+    (tmp_path / "design_helpers.py").write_text("WIDTH = 8\n")
+    (tmp_path / "design_sub.py").write_text(
+        "from pypga.core import Module, NumberRegister\n\n"
+        "class Sub(Module):\n"
+        "    value: NumberRegister(width=8)\n"
+    )
+    (tmp_path / "design_base.py").write_text(
+        "import numpy\n"
+        "import design_helpers\n"
+        "from design_sub import Sub\n"
+        "from pypga.core import Module, NumberRegister\n\n"
+        "class Base(Module):\n"
+        "    sub: Sub\n"
+        "    value: NumberRegister(width=design_helpers.WIDTH)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import design_base
+
+    class Derived(design_base.Base):
+        pass
+
+    hashes = hash_source_files(Derived)
+    for name in ["design_base.py", "design_helpers.py", "design_sub.py"]:
+        assert hash_file((tmp_path / name).resolve()) in hashes
+    assert hash_file(Path(inspect.getsourcefile(Module)).resolve()) in hashes
+    # installed packages do not belong to the design
+    assert hash_file(Path(np.__file__).resolve()) not in hashes
+
+
+def test_hash_components_is_order_independent():
+    assert hash_components(dict(a=1, b=[2, 3])) == hash_components(dict(b=[2, 3], a=1))
+    assert hash_components(dict(a=1)) != hash_components(dict(a=2))
+
+
+def test_store(tmp_path, files):
+    cache = make_cache(tmp_path)
+    assert "abc" not in cache
+    path = cache.store("abc", files, meta=dict(module="Test"))
+    assert "abc" in cache
+    assert path == cache.get_path("abc")
+    assert (path / "csr.csv").read_text() == files[1].read_text()
+    meta = cache.get_meta("abc")
+    assert meta["module"] == "Test"
+    assert meta["size"] == sum(file.stat().st_size for file in files)
+    assert [p.name for p in cache.path.iterdir()] == ["abc"]
+
+
+def test_evict_by_entries(tmp_path, files):
+    cache = make_cache(tmp_path, max_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.store(key, files)
+        time.sleep(0.01)
+    assert [meta["key"] for meta in cache.entries()] == ["b", "c"]
+
+
+def test_evict_least_recently_used(tmp_path, files):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.store("a", files)
+    time.sleep(0.01)
+    cache.store("b", files)
+    time.sleep(0.01)
+    cache.touch("a")
+    cache.store("c", files)
+    assert "a" in cache
+    assert "b" not in cache
+
+
+def test_evict_by_size(tmp_path, files):
+    size = sum(file.stat().st_size for file in files)
+    cache = make_cache(tmp_path, max_size=2 * size)
+    for key in ["a", "b", "c"]:
+        cache.store(key, files)
+        time.sleep(0.01)
+    assert [meta["key"] for meta in cache.entries()] == ["b", "c"]
+
+
+def test_keeps_new_entry_beyond_limit(tmp_path, files):
+    cache = make_cache(tmp_path, max_size=1)
+    cache.store("a", files)
+    assert "a" in cache
+
+
+def test_find_fingerprint(tmp_path, files):
+    cache = make_cache(tmp_path)
+    assert cache.find("fingerprint") is None
+    cache.store("a", files, meta=dict(fingerprints=["fingerprint"]))
+    cache.store("b", files)
+    assert cache.find("fingerprint") == "a"
+    cache.add_fingerprint("b", "other")
+    cache.add_fingerprint("b", "other")
+    assert cache.get_meta("b")["fingerprints"] == ["other"]
+    assert cache.find("other") == "b"
@@ -0,0 +1,75 @@
+import threading
+
+import numpy as np
+import pytest
+
+from pypga.core import Module, NumberRegister, Register
+from pypga.core.fleet import BoardFleet, FleetError
+
+
+class Board:
+    """Emulates the registers of one board, and waits for all boards to be accessed at the same time."""
+
+    def __init__(self, barrier):
+        self.values = {"top.gain_csr": 0, "top.data_csr": [0] * 4}
+        self.barrier = barrier
+
+    def read(self, name):
+        self.barrier.wait()
+        return self.values[name]
+
+    def read_array(self, name, length):
+        self.barrier.wait()
+        return self.values[name][:length]
+
+    def write(self, name, value):
+        self.barrier.wait()
+        self.values[name] = value
+
+
+class Design(Module):
+    gain: NumberRegister(width=8)
+    data: Register(width=8, depth=4, default=None, readonly=True)
+
+    def double(self, factor=2):
+        return self.gain * factor
+
+
+@pytest.fixture
+def fleet():
+    barrier = threading.Barrier(3, timeout=5)
+    designs = {f"rp-{index}": Design(interface=Board(barrier)) for index in range(3)}
+    fleet = BoardFleet(designs)
+    yield fleet
+    fleet._executor.shutdown()
+
+
+def test_write_read(fleet):
+    fleet.write("gain", 5)
+    assert list(fleet.read("gain")) == [5, 5, 5]
+    fleet.write_each("gain", [1, 2, 3])
+    assert list(fleet.read("gain")) == [1, 2, 3]
+    assert fleet.hosts == ["rp-0", "rp-1", "rp-2"]
+    assert fleet.call("double", factor=3) == [3, 6, 9]
+
+
+def test_read_arrays(fleet):
+    for index, design in enumerate(fleet):
+        design._interface.values["top.data_csr"] = [index] * 4
+    data = fleet.read("data")
+    assert data.shape == (3, 4)
+    assert np.array_equal(data[:, 0], [0, 1, 2])
+
+
+def test_errors(fleet):
+    with pytest.raises(ValueError):
+        fleet.write_each("gain", [1, 2])
+    fleet["rp-1"]._interface.values = {}
+    with pytest.raises(FleetError) as excinfo:
+        fleet.read("gain")
+    assert list(excinfo.value.errors) == ["rp-1"]
+
+
+def test_run_without_hosts():
+    with pytest.raises(ValueError):
+        BoardFleet.run(Design, hosts=[])
@@ -0,0 +1,37 @@
+import numpy as np
+
+from pypga.core import Module, NumberRegister, logic
+
+
+def make_module(width=8, offset=0, data=(1, 2, 3), submodule=None):
+    class Sub(Module):
+        value: NumberRegister(width=width)
+
+    class Test(Module):
+        sub: submodule or Sub
+        register: NumberRegister(width=width, default=3)
+
+        @logic
+        def _logic(self):
+            self.table = np.array(data)
+            self.sync += self.register.eq(offset)
+
+    return Test
+
+
+class TestHashModule:
+    def test_deterministic(self):
+        assert make_module()._hash == make_module()._hash
+
+    def test_register_attributes(self):
+        assert make_module()._hash != make_module(width=9)._hash
+
+    def test_closure(self):
+        assert make_module()._hash != make_module(offset=1)._hash
+        assert make_module()._hash != make_module(data=np.array([1, 2, 4]))._hash
+
+    def test_submodules(self):
+        class Other(Module):
+            value: NumberRegister(width=10)
+
+        assert make_module()._hash != make_module(submodule=Other)._hash
@@ -0,0 +1,37 @@
+import numpy as np
+from migen import Module, Signal
+
+from pypga.core.testsupport.recorder import count_pulses, latency, period, record
+
+
+class Delay(Module):
+    def __init__(self):
+        self.input = Signal()
+        self.output = Signal()
+        self.count = Signal(4)
+        self.sync += [self.output.eq(self.input), self.count.eq(self.count + 1)]
+
+
+def test_helpers():
+    trace = np.array([1, 0, 0, 1, 1, 0, 1, 0, 0, 1])
+    assert count_pulses(trace) == 4
+    assert period(trace) == 3
+    assert period([0, 1, 0, 1, 0, 0, 1]) is None
+    assert period([0, 1, 0, 0, 1, 0, 0, 1]) == 3
+    assert period([0, 1, 0]) is None
+    assert latency([0, 1, 0, 0, 0], [1, 0, 0, 1, 0]) == 2
+    assert latency([0, 0, 0], [0, 1, 0]) is None
+
+
+def test_record(tmp_path):
+    dut = Delay()
+    recording = record(
+        dut, [dut.input, dut.output, dut.count], cycles=20, stimulus={dut.input: [0, 0, 1, 0]}
+    )
+    assert len(recording) == 20
+    assert np.array_equal(recording["count"], np.arange(20) % 16)
+    assert latency(recording[dut.input], recording["output"]) == 1
+    recording.to_vcd(tmp_path / "trace.vcd")
+    vcd = (tmp_path / "trace.vcd").read_text()
+    assert "$var wire 4 # count $end" in vcd
+    assert "b1111 #" in vcd
@@ -0,0 +1,235 @@
+import numpy as np
+import pytest
+
+from pypga.core import Module, TriggerRegister
+from pypga.core.instrumentation import instrumentation
+from pypga.core.interface import BaseInterface
+from pypga.core.interface.shadow import ShadowCache
+from pypga.core.register import (
+    BoolRegister,
+    FixedPointRegister,
+    NumberRegister,
+    Register,
+    _FixedPointRegister,
+    _Register,
+)
+
+REGISTERS = [
+    Register(width=8),
+    Register(width=8, offset_from_python=-2),
+    BoolRegister(),
+    BoolRegister(invert=True, bit=3, width=4),
+    NumberRegister(width=14),
+    NumberRegister(width=14, signed=False),
+    NumberRegister(width=32, signed=False, offset_from_python=-2, min=2),
+    NumberRegister(width=14, min=-100, max=1000),
+    FixedPointRegister(width=14, decimals=13),
+    FixedPointRegister(width=16, decimals=10, signed=False, min=0.5),
+]
+
+
+@pytest.fixture(params=REGISTERS)
+def register(request):
+    return request.param()
+
+
+def python_values(register):
+    if isinstance(register, _FixedPointRegister):
+        return np.linspace(-100, 100, 1001)
+    return np.arange(-(2**16) - 5, 2**16 + 5, 7)
+
+
+class TestArrayConversion:
+    def test_from_python(self, register):
+        values = python_values(register)
+        expected = [register.from_python(register.before_from_python(v)) for v in values]
+        result = register._from_python_array(register._before_from_python_array(values))
+        assert list(result) == expected
+
+    def test_to_python(self, register):
+        values = np.arange(0, 1 << register.width, max(1, (1 << register.width) // 1000))
+        expected = [register.to_python(int(v)) for v in values]
+        result = register._to_python_array(values.astype(np.uint32))
+        assert list(result) == expected
+
+    def test_does_not_modify_input(self, register):
+        values = np.arange(10, dtype=np.uint32)
+        register._to_python_array(values)
+        assert list(values) == list(range(10))
+
+
+def test_positive_saturation():
+    register = Register(width=8)()
+    assert register.from_python(1000) == 256
+    assert list(register._from_python_array([255, 256, 1000])) == [255, 256, 256]
+
+
+def test_reverse():
+    register = NumberRegister(width=14, depth=4, reverse=True)()
+    assert list(register._array_from_python([1, 2, 3, -1])) == [2**14 - 1, 3, 2, 1]
+    assert list(register._array_to_python(np.array([2**14 - 1, 3, 2, 1], dtype=np.uint32))) == [1, 2, 3, -1]
+
+
+class MemoryInterface:
+    def __init__(self):
+        self.memories = {}
+
+    def read_memory(self, name, length):
+        return self.memories[name][:length]
+
+    def write_memory(self, name, values):
+        self.memories[name] = np.array(values, dtype=np.uint32)
+
+
+def test_memory_mapped():
+    class Instance:
+        _interface = MemoryInterface()
+
+        def _get_parents(self):
+            return ["top", "sub"]
+
+    register = NumberRegister(width=14, depth=4, memory_mapped=True)()
+    register.__set_name__(Instance, "data")
+    instance = Instance()
+    register.__set__(instance, [1, 2, 3, -1])
+    assert list(instance._interface.memories["top.sub_data_memory"]) == [1, 2, 3, 2**14 - 1]
+    assert list(register.__get__(instance)) == [1, 2, 3, -1]
+
+
+class AddressInterface(BaseInterface):
+    def __init__(self, result_path):
+        super().__init__(result_path)
+        self.values = {}
+
+    def read_from_address(self, address, length=1):
+        if length > 1:
+            return [self.values.get((address, index), 0) for index in range(length)]
+        return self.values.get(address, 0)
+
+    def write_to_address(self, address, value):
+        if np.ndim(value):
+            self.values.update({(address, index): v for index, v in enumerate(value)})
+        else:
+            self.values[address] = value
+
+
+class Child(Module):
+    gain: NumberRegister(width=8)
+    trigger: TriggerRegister()
+
+
+class Parent(Module):
+    child: Child
+    enabled: BoolRegister(invert=True)
+    table: Register(width=8, depth=3, default=None)
+    status: Register(width=8, readonly=True)
+
+
+def test_access_plans(tmp_path, monkeypatch):
+    (tmp_path / "csr.csv").write_text(
+        "top.enabled_csr,0x100,1,rw\n"
+        "top.table_csr,0x104,1,rw\n"
+        "top.status_csr,0x108,1,ro\n"
+        "top.child_gain_csr,0x10c,1,rw\n"
+        "top.child_trigger_csr,0x110,1,rw\n"
+    )
+    interface = AddressInterface(tmp_path)
+    dut = Parent(interface=interface)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The register name was resolved on access.")
+
+    monkeypatch.setattr(_Register, "_get_full_name", fail)
+    dut.enabled = False
+    assert interface.values[0x100] == 1
+    assert dut.enabled is False
+    dut.child.gain = -1
+    assert interface.values[0x10C] == 255
+    assert dut.child.gain == -1
+    dut.table = [1, 2, 3]
+    assert list(dut.table) == [1, 2, 3]
+    interface.values[0x108] = 7
+    assert dut.status == 7
+    dut.child.trigger()
+    assert interface.values[0x110] == 0
+
+
+def test_instrumentation(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrumentation, "stats", {})
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    (tmp_path / "csr.csv").write_text("top.child_gain_csr,0x10c,1,rw\n")
+    dut = Parent(interface=AddressInterface(tmp_path))
+    for value in range(5):
+        dut.child.gain = value
+    assert dut.child.gain == 4
+    summary = {(row["register"], row["operation"]): row for row in instrumentation.summary()}
+    assert summary["top.child_gain_csr", "write"]["count"] == 5
+    assert summary["top.child_gain_csr", "read"]["count"] == 1
+    assert sum(summary["top.child_gain_csr", "read"]["histogram"].values()) == 1
+
+
+class CountingInterface(AddressInterface):
+    def __init__(self, result_path):
+        super().__init__(result_path)
+        self.reads = 0
+
+    def read_from_address(self, address, length=1):
+        self.reads += 1
+        return super().read_from_address(address, length)
+
+
+def test_shadow_cache(tmp_path, monkeypatch):
+    (tmp_path / "csr.csv").write_text(
+        "top.enabled_csr,0x100,1,rw\n"
+        "top.table_csr,0x104,1,rw\n"
+        "top.status_csr,0x108,1,ro\n"
+        "top.child_gain_csr,0x10c,1,rw\n"
+    )
+    interface = CountingInterface(tmp_path)
+    interface.shadow = ShadowCache()
+    dut = Parent(interface=interface)
+    interface.values[0x10C] = 3
+    assert dut.child.gain == 3
+    assert dut.child.gain == 3
+    assert interface.reads == 1
+    dut.child.gain = -2
+    assert interface.values[0x10C] == 254
+    assert dut.child.gain == -2
+    dut.table = [4, 5, 6]
+    assert list(dut.table) == [4, 5, 6]
+    assert interface.reads == 1
+    # read-only registers are always read
+    dut.status
+    dut.status
+    assert interface.reads == 3
+    # e.g. after flashing
+    interface.values[0x10C] = 7
+    interface.invalidate_shadow()
+    assert dut.child.gain == 7
+    assert interface.reads == 4
+
+
+def test_shadow_cache_partial_write():
+    values = iter(range(10))
+    shadow = ShadowCache()
+    read, write = shadow.wrap(0x104, lambda: next(values), lambda value: None, readonly=False, depth=3)
+    write([4, 5, 6])
+    assert read() == [4, 5, 6]
+    # the values after the first two are unknown
+    write([7, 8])
+    assert read() == 0
+    assert read() == 0
+
+
+def test_shadow_cache_max_age(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("pypga.core.interface.shadow.time.monotonic", lambda: now[0])
+    values = iter(range(10))
+    shadow = ShadowCache(max_age=1.0)
+    read, write = shadow.wrap(0x108, lambda: next(values), None, readonly=True)
+    assert write is None
+    assert read() == 0
+    now[0] = 0.5
+    assert read() == 0
+    now[0] = 2.0
+    assert read() == 1
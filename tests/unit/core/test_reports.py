@@ -0,0 +1,138 @@
+import pytest
+
+from pypga.core.cache import ResultCache
+from pypga.core.reports import (
+    REPORT_FILE,
+    compare_reports,
+    load_reports,
+    make_report,
+    parse_timing_summary,
+    parse_utilization,
+    write_report,
+)
+
+TIMING_REPORT = """\
+Timing Report
+
+------------------------------------------------------------------------------------------------
+| Design Timing Summary
+| ---------------------
+------------------------------------------------------------------------------------------------
+
+    WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints      WHS(ns)      THS(ns)  THS Failing Endpoints  THS Total Endpoints     WPWS(ns)     TPWS(ns)  TPWS Failing Endpoints  TPWS Total Endpoints
+    -------      -------  ---------------------  -------------------      -------      -------  ---------------------  -------------------     --------     --------  ----------------------  --------------------
+      0.512        0.000                      0                 8123        0.041        0.000                      0                 8123        3.000        0.000                       0                  3514
+
+
+All user specified timing constraints are met.
+
+
+------------------------------------------------------------------------------------------------
+| Clock Summary
+| -------------
+------------------------------------------------------------------------------------------------
+
+Clock       Waveform(ns)       Period(ns)      Frequency(MHz)
+-----       ------------       ----------      --------------
+clk_fpga_0  {0.000 4.000}      8.000           125.000
+clk_fpga_1  {0.000 10.000}     20.000          50.000
+
+
+------------------------------------------------------------------------------------------------
+"""
+
+UTILIZATION_REPORT = """\
+1. Slice Logic
+--------------
+
++----------------------------+------+-------+-----------+-------+
+|          Site Type         | Used | Fixed | Available | Util% |
++----------------------------+------+-------+-----------+-------+
+| Slice LUTs*                | 4512 |     0 |     17600 | 25.64 |
+|   LUT as Logic             | 4300 |     0 |     17600 | 24.43 |
+| Slice Registers            | 6001 |     0 |     35200 | 17.05 |
++----------------------------+------+-------+-----------+-------+
+
+3. Memory
+---------
+
++-------------------+------+-------+-----------+-------+
+|     Site Type     | Used | Fixed | Available | Util% |
++-------------------+------+-------+-----------+-------+
+| Block RAM Tile    |  2.5 |     0 |        60 |  4.17 |
+|   RAMB18          |    5 |     0 |       120 |  4.17 |
++-------------------+------+-------+-----------+-------+
+
+4. DSP
+------
+
++----------------+------+-------+-----------+-------+
+|    Site Type   | Used | Fixed | Available | Util% |
++----------------+------+-------+-----------+-------+
+| DSPs           |    3 |     0 |        80 |  3.75 |
++----------------+------+-------+-----------+-------+
+"""
+
+
+def test_parse_timing_summary():
+    timing = parse_timing_summary(TIMING_REPORT)
+    assert timing["wns"] == 0.512
+    assert timing["whs"] == 0.041
+    assert timing["tns_total_endpoints"] == 8123
+    assert timing["met"]
+    assert timing["clocks"]["clk_fpga_0"] == dict(period=8.0, frequency=125.0)
+    assert len(timing["clocks"]) == 2
+
+
+def test_parse_timing_summary_violated():
+    timing = parse_timing_summary(
+        TIMING_REPORT.replace("0.512", "-0.250").replace(
+            "All user specified timing constraints are met.",
+            "Timing constraints are not met.",
+        )
+    )
+    assert timing["wns"] == -0.25
+    assert not timing["met"]
+
+
+def test_parse_utilization():
+    utilization = parse_utilization(UTILIZATION_REPORT)
+    assert utilization["lut"] == dict(used=4512, available=17600, util=25.64)
+    assert utilization["ff"]["used"] == 6001
+    assert utilization["bram"]["used"] == 2.5
+    assert utilization["dsp"]["used"] == 3
+    assert utilization["sites"]["LUT as Logic"]["used"] == 4300
+
+
+@pytest.fixture
+def report(tmp_path):
+    (tmp_path / "top_timing.rpt").write_text(TIMING_REPORT)
+    (tmp_path / "top_utilization_place.rpt").write_text(UTILIZATION_REPORT)
+    return make_report(tmp_path, duration=600.0)
+
+
+def test_make_report(report):
+    assert report["duration"] == 600.0
+    assert report["fmax"] == pytest.approx(1e3 / (8 - 0.512))
+    assert report["utilization"]["lut"]["used"] == 4512
+
+
+def test_compare_reports(report):
+    slower = dict(report, fmax=100.0, timing=dict(report["timing"], wns=-0.1))
+    difference = compare_reports(report, slower)
+    assert difference["wns"] == pytest.approx(-0.612)
+    assert difference["fmax"] < 0
+    assert difference["lut"] == 0
+    assert compare_reports(report, {})["lut"] is None
+
+
+def test_load_reports(tmp_path, report):
+    cache = ResultCache(tmp_path / "store")
+    write_report(tmp_path / REPORT_FILE, report)
+    cache.store("a", [tmp_path / REPORT_FILE], meta=dict(board="b", module="A"))
+    cache.store("b", [tmp_path / "top_timing.rpt"], meta=dict(board="b", module="B"))
+    reports = load_reports(cache=cache)
+    assert [r["key"] for r in reports] == ["a"]
+    assert reports[0]["module"] == "A"
+    assert reports[0]["fmax"] == report["fmax"]
+    assert load_reports(module="B", cache=cache) == []
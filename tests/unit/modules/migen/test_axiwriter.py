@@ -0,0 +1,203 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from migen import Record, Signal, run_simulation
+
+from pypga.modules.migen.axiwriter import MigenAxiWriter
+
+
+class FakeAxiHp:
+    """The write channels of an AXI HP port."""
+
+    def __init__(self):
+        self.aw = Record(
+            [
+                ("id", 6),
+                ("addr", 32),
+                ("len", 4),
+                ("size", 3),
+                ("burst", 2),
+                ("cache", 4),
+                ("valid", 1),
+                ("ready", 1),
+            ]
+        )
+        self.w = Record(
+            [("id", 6), ("data", 64), ("strb", 8), ("last", 1), ("valid", 1), ("ready", 1)]
+        )
+        self.b = Record([("id", 6), ("resp", 2), ("valid", 1), ("ready", 1)])
+
+
+class TestMigenAxiWriter:
+    burst_length = 16
+    samples = 40
+    start_address = 0x1000
+    address_step = 8
+    stall_probability = 0.3
+
+    @pytest.fixture
+    def dut(self):
+        hp = FakeAxiHp()
+        inputs = dict(address=Signal(32), data=Signal(64), we=Signal(), flush=Signal())
+        dut = MigenAxiWriter(
+            reset=0,
+            axi_hp=hp,
+            burst_length=self.burst_length,
+            fifo_depth=16,
+            **inputs,
+        )
+        dut.axi_hp = hp
+        dut.inputs = SimpleNamespace(**inputs)
+        return dut
+
+    def simulate(self, dut):
+        hp = dut.axi_hp
+        inputs = dut.inputs
+        rng = random.Random(0)
+        memory = {}
+        bursts = []
+        acknowledged = []
+
+        def source():
+            for i in range(self.samples):
+                yield inputs.address.eq(self.start_address + self.address_step * i)
+                yield inputs.data.eq(i)
+                yield inputs.we.eq(1)
+                yield
+                while not (yield dut.ready):
+                    yield
+            yield inputs.we.eq(0)
+            yield inputs.flush.eq(1)
+
+        def slave():
+            pending = []
+            beats = []
+            respond = False
+            for _ in range(20 * self.samples):
+                yield hp.aw.ready.eq(rng.random() > self.stall_probability)
+                yield hp.w.ready.eq(rng.random() > self.stall_probability)
+                # respond to each completed burst for one clock cycle
+                yield hp.b.valid.eq(respond)
+                respond = False
+                yield
+                if (yield dut.ack):
+                    acknowledged.append((yield dut.ack_beats))
+                if (yield hp.aw.valid) and (yield hp.aw.ready):
+                    pending.append(((yield hp.aw.addr), (yield hp.aw.len) + 1))
+                if (yield hp.w.valid) and (yield hp.w.ready):
+                    beats.append((yield hp.w.data))
+                    if (yield hp.w.last):
+                        address, length = pending.pop(0)
+                        assert len(beats) == length
+                        for k, value in enumerate(beats):
+                            memory[address + 8 * k] = value
+                        bursts.append((address, length))
+                        beats = []
+                        respond = True
+
+        run_simulation(dut, [source(), slave()])
+        return memory, bursts, acknowledged
+
+    def test_write(self, dut):
+        memory, bursts, acknowledged = self.simulate(dut)
+        assert memory == {
+            self.start_address + self.address_step * i: i for i in range(self.samples)
+        }
+        assert acknowledged == [length for _, length in bursts]
+        for address, length in bursts:
+            assert length <= self.burst_length
+            # a burst must not cross a 4 kB boundary
+            assert address // 4096 == (address + 8 * length - 1) // 4096
+
+
+class TestMigenAxiWriterSingleBeat(TestMigenAxiWriter):
+    burst_length = 1
+
+
+class TestMigenAxiWriterShortBursts(TestMigenAxiWriter):
+    burst_length = 4
+
+    def test_burst_count(self, dut):
+        _, bursts, _ = self.simulate(dut)
+        assert len(bursts) == self.samples // self.burst_length
+
+
+class TestMigenAxiWriterDescending(TestMigenAxiWriter):
+    start_address = 0x2000
+    address_step = -8
+
+
+class TestMigenAxiWriterPageBoundary(TestMigenAxiWriter):
+    start_address = 0x1000 - 8 * 20
+
+
+def test_fifo_must_hold_a_burst():
+    with pytest.raises(ValueError):
+        MigenAxiWriter(
+            address=0,
+            data=Signal(64),
+            we=Signal(),
+            reset=0,
+            axi_hp=FakeAxiHp(),
+            burst_length=16,
+            fifo_depth=8,
+        )
+
+
+def test_reset_discards_buffered_samples():
+    hp = FakeAxiHp()
+    address, data, we, reset = Signal(32), Signal(64), Signal(), Signal()
+    dut = MigenAxiWriter(
+        address=address, data=data, we=we, reset=reset, axi_hp=hp, burst_length=4, fifo_depth=16
+    )
+    state = dict(reset=False)
+    written = []
+    acknowledged = []
+
+    def write(values):
+        for i, value in enumerate(values):
+            yield address.eq(0x1000 + 8 * i)
+            yield data.eq(value)
+            yield we.eq(1)
+            yield
+            while not (yield dut.ready):
+                yield
+        yield we.eq(0)
+
+    def source():
+        # one complete burst, one queued burst and an incomplete one
+        yield from write(range(10))
+        yield reset.eq(1)
+        yield
+        yield reset.eq(0)
+        state["reset"] = True
+        yield
+        while not (yield dut.ready):
+            yield
+        yield from write(range(100, 108))
+
+    def slave():
+        issued = 0
+        responses = 0
+        for _ in range(200):
+            # only the first burst is accepted, and no burst is acknowledged, before the reset
+            yield hp.aw.ready.eq(issued == 0 or state["reset"])
+            yield hp.w.ready.eq(1)
+            yield hp.b.valid.eq(responses > 0 and state["reset"])
+            yield
+            if (yield dut.ack):
+                acknowledged.append((yield dut.ack_beats))
+            if (yield hp.b.valid) and (yield hp.b.ready):
+                responses -= 1
+            if (yield hp.aw.valid) and (yield hp.aw.ready):
+                issued += 1
+            if (yield hp.w.valid) and (yield hp.w.ready):
+                written.append((yield hp.w.data))
+                responses += (yield hp.w.last)
+
+    run_simulation(dut, [source(), slave()])
+    # the data of the issued burst is still written, the buffered samples are not
+    assert written == [0, 1, 2, 3] + list(range(100, 108))
+    # only the bursts after the reset are acknowledged
+    assert acknowledged == [4, 4]
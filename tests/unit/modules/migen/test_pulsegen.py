@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 from migen import Constant, Signal, run_simulation
 from migen.fhdl import verilog
 
 from pypga.core import MigenModule
+from pypga.core.testsupport.recorder import count_pulses, period, record
 from pypga.modules.migen.pulsegen import MigenPulseBurstGen, MigenPulseGen
 
 
@@ -29,32 +31,21 @@ class TestMigenPulseGenIntPeriod:
         print(verilog.convert(dut))
 
     def test_out(self, dut):
-        print(f"\n\nStart {self.__class__.__name__}")
-        width = len(dut.count)
-
-        def assertions():
-            for cycle in range(30):
-                expected_out = 0
-                if self.on:
-                    if self.high_after_on:
-                        if (cycle % self.period) == 1:  # there is 1 cycle latency
-                            expected_out = 1
-                    else:
-                        if (cycle % self.period) == 0:
-                            if (
-                                cycle > self.period - 1
-                            ):  # 1 cycle latency causes the 0th clock cycle to have out=0
-                                expected_out = 1
-                print(
-                    f"Cycle {cycle:02d}: count={(yield dut.count):02d} (0b{(yield dut.count):0{width}b}) carry={(yield dut.carry)} out={(yield dut.out)} (expected={expected_out})"
-                )
-                if (
-                    self.first_cycle_period_offset == 0
-                ):  # TODO: extend test to nonzero values
-                    assert (yield dut.out) == expected_out
-                yield
-
-        run_simulation(dut, assertions())
+        recording = record(dut, [dut.out, dut.count, dut.carry], cycles=30)
+        cycle = np.arange(len(recording))
+        if not self.on:
+            expected_out = np.zeros_like(cycle)
+        elif self.high_after_on:
+            expected_out = cycle % self.period == 1  # there is 1 cycle latency
+        else:
+            # 1 cycle latency causes the 0th clock cycle to have out=0
+            expected_out = (cycle % self.period == 0) & (cycle > self.period - 1)
+        if self.first_cycle_period_offset == 0:  # TODO: extend test to nonzero values
+            np.testing.assert_array_equal(recording[dut.out], expected_out)
+        if self.on:
+            assert period(recording[dut.out]) == self.period
+        else:
+            assert count_pulses(recording[dut.out]) == 0
 
 
 class TestMigenPulseGenOff(TestMigenPulseGenIntPeriod):
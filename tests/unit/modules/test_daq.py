@@ -0,0 +1,123 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pypga.modules.daq import DAQ, StreamingDAQ, words_to_samples
+
+
+class RingInterface:
+    """Emulates an FPGA that has written ``written`` samples into a ring of 64-bit words."""
+
+    def __init__(self, ring_depth, sample_counts, flags=()):
+        self.ring_depth = ring_depth
+        self.sample_counts = iter(sample_counts)
+        self.written = 0
+        self.flags = set(flags)
+
+    def read(self, name):
+        for flag in ("overflow", "bus_error"):
+            if name.endswith(f"{flag}_csr"):
+                return int(flag in self.flags)
+        assert name.endswith("sample_count_csr")
+        self.written = next(self.sample_counts)
+        return self.written
+
+    def read_from_ram(self, offset, length):
+        words = np.zeros(length, dtype=np.uint32)
+        for i in range(0, length, 2):
+            index = (offset // 8) + i // 2
+            # the sample at each index is the most recent count that was written there
+            sample = index + self.ring_depth * ((self.written - 1 - index) // self.ring_depth)
+            words[i] = sample & 0x3FFF
+        return words
+
+
+class TestWordsToSamples:
+    def test_signed(self):
+        words = np.array([1, 0, 0x3FFF, 0, 0x2000, 0], dtype=np.uint32)
+        assert list(words_to_samples(words, width=14)) == [1, -1, -(2**13)]
+
+
+    def test_packed(self):
+        samples = np.array([1, -1, -(2**13), 5, 2, 3, 4, -5])
+        lanes = (samples & 0x3FFF).astype(np.uint16)
+        words = lanes.view(np.uint32)
+        assert list(words_to_samples(words, width=14, samples_per_word=4)) == list(samples)
+
+    def test_invalid_packing(self):
+        with pytest.raises(ValueError):
+            words_to_samples(np.zeros(4, dtype=np.uint32), width=14, samples_per_word=3)
+
+
+class RamInterface:
+    def __init__(self, words):
+        self.words = words
+
+    def read_from_ram(self, offset, length):
+        return self.words[offset // 4 : offset // 4 + length]
+
+
+class TestPackedDAQ:
+    def test_data(self):
+        samples = np.arange(-8, 8)
+        words = (samples & 0x3FFF).astype(np.uint16).view(np.uint32)
+        daq_class = DAQ(data_depth=16, data_decimals=13, axi_hp_index=0, samples_per_word=4)
+        daq = daq_class(interface=RamInterface(words))
+        assert np.allclose(daq.data, samples / (2**13 - 1))
+
+    def test_invalid_packing(self):
+        with pytest.raises(ValueError):
+            DAQ(data_width=14, samples_per_word=4)
+        with pytest.raises(ValueError):
+            DAQ(data_width=24, axi_hp_index=0, samples_per_word=4)
+        with pytest.raises(ValueError):
+            DAQ(data_depth=10, axi_hp_index=0, samples_per_word=4)
+
+
+class TestStreamingDAQ:
+    ring_depth = 16
+
+    def create(self, sample_counts, flags=()):
+        daq_class = StreamingDAQ(ring_depth=self.ring_depth, burst_length=1, fifo_depth=1)
+        return daq_class(interface=RingInterface(self.ring_depth, sample_counts, flags))
+
+    def test_stream_wraps_around(self):
+        # every read of sample_count reports 3 more samples
+        daq = self.create(itertools.count(0, 3))
+        stream = daq.stream(poll_interval=0)
+        samples = np.concatenate([next(stream) for _ in range(10)])
+        assert len(samples) > 2 * self.ring_depth
+        assert list(samples) == list(range(len(samples)))
+
+    def test_chunks_are_at_most_half_the_ring(self):
+        daq = self.create([0, 12, 12, 12, 12])
+        stream = daq.stream(poll_interval=0)
+        assert len(next(stream)) == self.ring_depth // 2
+
+    def test_overflow(self):
+        daq = self.create([0, 17])
+        with pytest.raises(OverflowError):
+            next(daq.stream(poll_interval=0))
+
+    def test_overflow_while_reading(self):
+        # the samples on their way to RAM may already have overwritten the oldest ones
+        daq = self.create([0, 12, 15])
+        with pytest.raises(OverflowError):
+            next(daq.stream(poll_interval=0))
+
+    def test_dropped_samples(self):
+        daq = self.create([0, 3, 6], flags=["overflow"])
+        with pytest.raises(OverflowError):
+            next(daq.stream(poll_interval=0))
+
+    def test_bus_error(self):
+        daq = self.create([0, 3, 6], flags=["bus_error"])
+        with pytest.raises(IOError):
+            next(daq.stream(poll_interval=0))
+
+    def test_invalid_ring_depth(self):
+        with pytest.raises(ValueError):
+            StreamingDAQ(ring_depth=1000)
+        with pytest.raises(ValueError):
+            StreamingDAQ(ring_depth=64, burst_length=16, fifo_depth=64)